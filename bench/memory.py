@@ -0,0 +1,87 @@
+# bench/memory.py
+"""
+파싱 → 저장 경로의 레코드 메모리 측정 (tracemalloc)
+- 합성 페이지를 표 추출까지 해 둔 뒤, 레코드 만들기 결과가 들고 있는 메모리만 잼
+- dict: 이전 방식 (행마다 dict, 증권사 문자열도 행마다 따로)
+- record: IPORecord (NamedTuple, status / source / 증권사 문자열 공유)
+
+사용법:
+  python -m bench.memory
+  python -m bench.memory --pages 200 --out memory.json
+"""
+import gc
+import json
+import argparse
+import tracemalloc
+
+from crawler.extract import extract_table
+from crawler.ipo38 import EXTRACT_ENGINE, RECORD_BUILDERS, URLS
+
+from .synth import CHARSET, make_page
+
+
+def _copy(text):
+    """같은 내용의 새 문자열 객체 (이전 방식: 셀마다 따로 만든 문자열)"""
+    return (text + " ")[:-1]
+
+
+def as_dicts(records):
+    """IPORecord 목록 → 이전 방식 dict 목록"""
+    out = []
+    for r in records:
+        d = r._asdict()
+        if d["brokers"]:
+            d["lead_manager"] = d["brokers"] = _copy(d["brokers"])
+        out.append(d)
+    return out
+
+
+def retained_bytes(build):
+    """build()가 돌려준 객체가 들고 있는 메모리 (만드는 중 임시 객체 제외)"""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return size, len(result)
+
+
+def measure(key, pages, rows_per_page):
+    summary = URLS[key]["summary"]
+    rows = []
+    for page in range(1, pages + 1):
+        content = make_page(key, page, rows_per_page)
+        rows += extract_table(content, CHARSET, summary, EXTRACT_ENGINE) or []
+
+    builder = RECORD_BUILDERS[key]
+    builder(rows, keep_past=True)  # 날짜 캐시 / intern은 미리 채워 둠 (양쪽 공통)
+
+    dict_bytes, count = retained_bytes(lambda: as_dicts(builder(rows, keep_past=True)))
+    record_bytes, _ = retained_bytes(lambda: builder(rows, keep_past=True))
+    return {
+        "records": count,
+        "dict_bytes_per_record": round(dict_bytes / count, 1),
+        "record_bytes_per_record": round(record_bytes / count, 1),
+        "saved": round(1 - record_bytes / dict_bytes, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="레코드 메모리 측정 (dict vs IPORecord)")
+    parser.add_argument("--pages", type=int, default=100, help="카테고리별 합성 페이지 수")
+    parser.add_argument("--rows-per-page", type=int, default=20)
+    parser.add_argument("--out", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    report = {key: measure(key, args.pages, args.rows_per_page) for key in URLS}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
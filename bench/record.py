@@ -0,0 +1,82 @@
+# bench/record.py
+"""
+실제 38커뮤니케이션 페이지를 픽스처로 저장
+사용법: python -m bench.record bench/fixtures [--pages N]
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+from crawler import ipo38
+from crawler.decode import header_charset, resolve_charset
+from crawler.fetcher import HttpFetcher
+
+from .synth import make_page
+
+
+def record(out_dir, pages=None, fetcher=None):
+    """
+    카테고리별 1..pages 페이지 원본 bytes 저장 (표가 빈 페이지가 나오면 그 카테고리 종료)
+    - pages가 None이면 MAX_PAGES 사용
+    - 마지막 빈 페이지는 empty.html로 저장
+    """
+    fetcher = fetcher or HttpFetcher()
+    manifest = {
+        "charset": ipo38.SOURCE_ENCODING,
+        "synthetic": False,
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "categories": {},
+    }
+
+    for key, info in ipo38.URLS.items():
+        folder = os.path.join(out_dir, key)
+        os.makedirs(folder, exist_ok=True)
+        limit = pages or ipo38.MAX_PAGES.get(key, 3)
+
+        saved = 0
+        for page in range(1, limit + 1):
+            url = info["base"] + str(page)
+            r = fetcher.get(url, headers=ipo38.HEADERS)
+            r.raise_for_status()
+
+            charset = resolve_charset(r.content, header_charset(r), ipo38.SOURCE_ENCODING)
+            manifest["charset"] = charset
+            rows = ipo38.extract_table(r.content, charset, info["summary"])
+            if not rows:
+                with open(os.path.join(folder, "empty.html"), "wb") as f:
+                    f.write(r.content)
+                break
+
+            with open(os.path.join(folder, f"{page}.html"), "wb") as f:
+                f.write(r.content)
+            saved += 1
+            print(f"  {key} {page}페이지: {len(rows)}행")
+
+        empty = os.path.join(folder, "empty.html")
+        if not os.path.exists(empty):
+            # 끝 페이지까지 안 간 경우: 스텁 서버가 마지막 다음에 줄 빈 표 페이지
+            with open(empty, "wb") as f:
+                f.write(make_page(key, saved + 1, rows_per_page=0))
+
+        manifest["categories"][key] = {"pages": saved}
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="38커뮤니케이션 페이지 픽스처 저장")
+    parser.add_argument("out_dir")
+    parser.add_argument("--pages", type=int, default=None, help="카테고리별 최대 페이지")
+    args = parser.parse_args(argv)
+
+    manifest = record(args.out_dir, args.pages)
+    print(json.dumps(manifest["categories"], ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
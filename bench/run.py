@@ -0,0 +1,249 @@
+# bench/run.py
+"""
+오프라인 크롤링 벤치마크
+- 픽스처(녹화 또는 합성)를 로컬 스텁 서버로 띄우고 crawl_38_all 전체 시간 측정
+- 단계별 시간: fetch(네트워크) / parse(표 추출 + 행 정규화) / db(INSERT + commit)
+  (crawl_38_all의 CrawlMetrics 값 그대로 사용)
+- 결과를 JSON으로 저장해서 두 커밋 비교
+
+사용법:
+  python -m bench.run run --fixtures bench/fixtures --repeat 3 --out before.json
+  python -m bench.run run --synthetic-pages 1000 --db-rows 50000 --latency 0.02
+  python -m bench.run run --synthetic-pages 200 --repeat 1 --profile cpu
+  python -m bench.run compare before.json after.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+
+from crawler import base, ipo38
+from crawler.extract import ENGINES
+from crawler.fetcher import HttpFetcher
+from crawler.metrics import CrawlMetrics
+
+from .stub_server import StubServer, point_crawler_at, restore_crawler
+from .synth import write_fixtures, seed_db
+
+PHASES = ("fetch_ms", "parse_ms", "db_ms")
+
+
+def _phases(metrics):
+    """CrawlMetrics → 벤치마크 단계별 시간"""
+    return {
+        "fetch_ms": metrics.total("fetch_ms"),
+        "parse_ms": metrics.total("extract_ms") + metrics.total("normalize_ms"),
+        "db_ms": metrics.total("db_insert_ms") + metrics.total("db_commit_ms"),
+        "pages": metrics.counters.get("pages", 0),
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def _copy_db(src, dst):
+    """WAL에 남은 내용까지 포함해서 DB 복사 (SQLite backup API)"""
+    if os.path.exists(dst):
+        os.remove(dst)
+    source = sqlite3.connect(src)
+    target = sqlite3.connect(dst)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+def run_once(server, db_template, workdir, engine=None, profile=None):
+    """한 번 크롤링하고 단계별 시간 dict 반환"""
+    db_path = os.path.join(workdir, f"bench_{time.monotonic_ns()}.db")
+    base.close_write_conn()
+    _copy_db(db_template, db_path)
+    base.DB_PATH = db_path
+
+    fetcher = HttpFetcher(backoff_base=0.05, backoff_max=0.5, timeout=30)
+    saved_engine = ipo38.EXTRACT_ENGINE
+    if engine:
+        ipo38.EXTRACT_ENGINE = engine
+
+    saved_metrics_path = ipo38.METRICS_PATH
+    ipo38.METRICS_PATH = None  # 보고서는 벤치마크 결과 JSON에만 남김
+
+    metrics = CrawlMetrics()
+    requests_before = server.requests
+    try:
+        rows = ipo38.crawl_38_all(
+            fetcher=fetcher,
+            cache=False,
+            incremental=False,
+            metrics=metrics,
+            archive=False,  # 스텁 페이지를 실제 보관소에 남기지 않음
+            profile=profile,
+        )
+    finally:
+        ipo38.EXTRACT_ENGINE = saved_engine
+        ipo38.METRICS_PATH = saved_metrics_path
+        base.close_write_conn()
+        fetcher.close()
+
+    result = _phases(metrics)
+    result.update(
+        {
+            "wall_ms": metrics.wall_ms,
+            "rows": rows,
+            "http_requests": server.requests - requests_before,
+            "fetcher": fetcher.snapshot(),
+            "metrics": metrics.to_dict(),
+        }
+    )
+    return result
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="ipo_bench_")
+    fixtures = args.fixtures
+    if args.synthetic_pages:
+        fixtures = os.path.join(workdir, "fixtures")
+        write_fixtures(fixtures, args.synthetic_pages, args.rows_per_page)
+    if not fixtures:
+        print("--fixtures 또는 --synthetic-pages가 필요합니다.")
+        return 2
+
+    # 시작 DB 템플릿 (필요하면 과거 행을 미리 채움)
+    saved_path = base.DB_PATH
+    template = os.path.join(workdir, "template.db")
+    base.close_write_conn()
+    base.DB_PATH = template
+    base.init_db()
+    if args.db_rows:
+        seed_db(args.db_rows)
+    base.close_write_conn()
+
+    server = StubServer(
+        fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    ).start()
+    saved = point_crawler_at(server)
+
+    runs = []
+    try:
+        for i in range(args.repeat):
+            result = run_once(server, template, workdir, args.engine, args.profile)
+            runs.append(result)
+            print(
+                f"[{i + 1}/{args.repeat}] 전체 {result['wall_ms']:.0f}ms"
+                f" | fetch {result['fetch_ms']:.0f}ms"
+                f" / parse {result['parse_ms']:.0f}ms"
+                f" / db {result['db_ms']:.0f}ms"
+                f" | {result['pages']}페이지 {result['rows']}행"
+            )
+    finally:
+        restore_crawler(saved)
+        server.stop()
+        base.DB_PATH = saved_path
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    keys = ("wall_ms",) + PHASES
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "fixtures": args.fixtures,
+                "synthetic_pages": args.synthetic_pages,
+                "rows_per_page": args.rows_per_page,
+                "db_rows": args.db_rows,
+                "latency": args.latency,
+                "jitter": args.jitter,
+                "error_rate": args.error_rate,
+                "engine": args.engine or ipo38.EXTRACT_ENGINE,
+                "repeat": args.repeat,
+                "profile": args.profile,
+            },
+        },
+        "runs": runs,
+        "median": {k: statistics.median(r[k] for r in runs) for k in keys},
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.out}")
+    print(json.dumps(report["median"], indent=2))
+    return 0
+
+
+def compare(args):
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+
+    print(f"{'항목':<10}{'before':>12}{'after':>12}{'배율':>10}")
+    for key in ("wall_ms",) + PHASES:
+        a = before["median"].get(key)
+        b = after["median"].get(key)
+        if a is None or b is None:
+            continue
+        ratio = f"{a / b:.2f}x" if b else "-"
+        print(f"{key:<10}{a:>12.1f}{b:>12.1f}{ratio:>10}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 크롤링 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="벤치마크 실행")
+    p.add_argument("--fixtures", help="픽스처 폴더 (bench.record 결과)")
+    p.add_argument("--synthetic-pages", type=int, default=0, help="카테고리별 합성 페이지 수")
+    p.add_argument("--rows-per-page", type=int, default=20)
+    p.add_argument("--db-rows", type=int, default=0, help="미리 채워둘 과거 행 수")
+    p.add_argument("--latency", type=float, default=0.0, help="요청당 지연(초)")
+    p.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 최대(초)")
+    p.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    p.add_argument("--engine", choices=ENGINES, help="표 추출 엔진")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument(
+        "--profile",
+        choices=("cpu", "memory", "all"),
+        help="cProfile / tracemalloc 결과를 runs[].metrics.profile에 포함",
+    )
+    p.add_argument("--out", help="결과 JSON 경로")
+    p.add_argument("--keep", action="store_true", help="임시 폴더 남기기")
+    p.set_defaults(func=run)
+
+    p = sub.add_parser("compare", help="두 결과 JSON 비교")
+    p.add_argument("before")
+    p.add_argument("after")
+    p.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
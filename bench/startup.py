@@ -0,0 +1,115 @@
+# bench/startup.py
+"""
+GUI 시작 속도 측정 (python -X importtime 기반)
+- 새 파이썬 프로세스에서 gui.app import 시간을 여러 번 재서 중앙값 출력
+- 시작 시 불러오면 안 되는 무거운 모듈(requests, bs4, lxml, openpyxl)이 섞이면 실패
+- --budget-ms를 주면 중앙값이 그보다 느릴 때도 실패 (회귀 방지용)
+
+사용법:
+  python -m bench.startup
+  python -m bench.startup --repeat 10 --budget-ms 150 --out startup.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 크롤링/내보내기 전에는 import되면 안 되는 모듈 (최상위 이름)
+LAZY_MODULES = ("requests", "urllib3", "bs4", "lxml", "openpyxl", "pyarrow")
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력 → [(모듈, 자기 시간 us, 누적 시간 us, 깊이)]
+    깊이 0 = 최상위에서 직접 import한 모듈
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def measure(module="gui.app"):
+    """새 프로세스에서 module import 1회 → (누적 ms, module이 불러온 importtime 항목)"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+
+    entries = parse_importtime(out.stderr)
+
+    # 자식 모듈이 부모보다 먼저 출력됨 → module 줄 직전의 최상위 줄 다음부터가 module 몫
+    end = next(i for i, e in enumerate(entries) if e[0] == module and e[3] == 0)
+    start = end
+    while start > 0 and entries[start - 1][3] > 0:
+        start -= 1
+    return entries[end][2] / 1000, entries[start : end + 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GUI 시작(import) 시간 측정")
+    parser.add_argument("--module", default="gui.app")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="중앙값 허용 한도 (넘으면 실패)")
+    parser.add_argument("--top", type=int, default=10, help="누적 시간 상위 모듈 출력 수")
+    parser.add_argument("--out", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    times = []
+    entries = []
+    for _ in range(args.repeat):
+        ms, entries = measure(args.module)
+        times.append(ms)
+
+    # 마지막 측정 기준: 무거운 모듈 포함 여부 / 가장 느린 모듈
+    loaded = {name.split(".")[0] for name, *_ in entries}
+    eager = sorted(loaded & set(LAZY_MODULES))
+    slowest = sorted(entries, key=lambda e: e[2], reverse=True)[: args.top]
+
+    median = statistics.median(times)
+    print(f"{args.module} import: 중앙값 {median:.1f}ms (최소 {min(times):.1f} / 최대 {max(times):.1f})")
+    for name, _, cumulative_us, _ in slowest:
+        print(f"  {cumulative_us / 1000:8.1f}ms  {name}")
+
+    failed = False
+    if eager:
+        print(f"❌ 시작 시 불러오면 안 되는 모듈: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms and median > args.budget_ms:
+        print(f"❌ 허용 한도 {args.budget_ms:.0f}ms 초과")
+        failed = True
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "module": args.module,
+                    "times_ms": times,
+                    "median_ms": median,
+                    "eager_modules": eager,
+                    "slowest": [
+                        {"module": name, "cumulative_ms": cum / 1000}
+                        for name, _, cum, _ in slowest
+                    ],
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
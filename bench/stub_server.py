@@ -0,0 +1,159 @@
+# bench/stub_server.py
+"""
+38커뮤니케이션 대신 픽스처 페이지를 돌려주는 로컬 HTTP 서버
+- 지연(latency + jitter), 오류(503) 주입 가능
+- point_crawler_at()으로 crawler.ipo38의 URL/최대 페이지를 이 서버로 돌림
+"""
+import os
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from crawler import ipo38
+
+
+def _category_codes():
+    """URLS의 o= 값 → 카테고리 키"""
+    codes = {}
+    for key, info in ipo38.URLS.items():
+        query = parse_qs(urlparse(info["base"]).query)
+        codes[query["o"][0]] = key
+    return codes
+
+
+class StubServer:
+    def __init__(
+        self,
+        fixtures_dir,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        send_charset=True,
+        seed=0,
+    ):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.send_charset = send_charset
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.codes = _category_codes()
+        self.requests = 0
+        self.errors = 0
+
+        with open(os.path.join(fixtures_dir, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def _page_path(self, key, page):
+        path = os.path.join(self.fixtures_dir, key, f"{page}.html")
+        if os.path.exists(path):
+            return path
+        return os.path.join(self.fixtures_dir, key, "empty.html")
+
+    def _roll(self):
+        """요청 1건 집계 + (지연, 오류 여부) 결정"""
+        with self.rng_lock:
+            self.requests += 1
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            fail = self.rng.random() < self.error_rate
+            self.errors += fail
+        return delay, fail
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            disable_nagle_algorithm = True  # 헤더/본문 분리 전송 시 40ms 지연 방지
+
+            def do_GET(self):
+                delay, fail = server._roll()
+                if delay:
+                    time.sleep(delay)
+
+                if fail:
+                    self._send(503, b"injected error", "text/plain")
+                    return
+
+                query = parse_qs(urlparse(self.path).query)
+                key = server.codes.get(query.get("o", [""])[0])
+                if key is None:
+                    self._send(404, b"unknown category", "text/plain")
+                    return
+
+                page = int(query.get("page", ["1"])[0] or 1)
+                path = server._page_path(key, page)
+                if not os.path.exists(path):
+                    self._send(404, b"no fixture", "text/plain")
+                    return
+
+                with open(path, "rb") as f:
+                    body = f.read()
+                content_type = "text/html"
+                if server.send_charset:
+                    content_type += f"; charset={server.manifest.get('charset', 'euc-kr')}"
+                self._send(200, body, content_type)
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def point_crawler_at(server):
+    """
+    ipo38.URLS / MAX_PAGES를 스텁 서버 기준으로 바꾸고 원래 값을 반환
+    - MAX_PAGES는 픽스처 페이지 수 + 1 (빈 페이지에서 멈추는지까지 확인)
+    """
+    saved = ({k: dict(v) for k, v in ipo38.URLS.items()}, dict(ipo38.MAX_PAGES))
+    codes = {key: code for code, key in server.codes.items()}
+    categories = server.manifest.get("categories", {})
+
+    for key, info in ipo38.URLS.items():
+        info["base"] = f"{server.base_url}/html/fund/index.htm?o={codes[key]}&page="
+        if key in categories:
+            ipo38.MAX_PAGES[key] = categories[key]["pages"] + 1
+    return saved
+
+
+def restore_crawler(saved):
+    urls, max_pages = saved
+    for key, info in urls.items():
+        ipo38.URLS[key].update(info)
+    ipo38.MAX_PAGES.clear()
+    ipo38.MAX_PAGES.update(max_pages)
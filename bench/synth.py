@@ -0,0 +1,155 @@
+# bench/synth.py
+"""
+합성 픽스처 / DB 생성기
+- 38커뮤니케이션과 같은 구조(summary 표, 헤더 2줄, EUC-KR)의 페이지를 원하는 만큼 생성
+- ipo_schedules에 과거 일정 행을 대량으로 채워 DB가 커졌을 때의 속도 측정
+"""
+import os
+import json
+import random
+from datetime import date, timedelta
+
+from crawler import base
+from crawler.ipo38 import URLS
+
+CHARSET = "euc-kr"
+
+BROKERS = [
+    "미래에셋증권",
+    "KB증권",
+    "NH투자증권",
+    "한국투자증권",
+    "삼성증권",
+    "신한투자증권",
+    "대신증권",
+    "하나증권",
+    "키움증권",
+    "IBK투자증권",
+]
+
+MARKETS = ["(유가)", "(코스닥)", ""]
+
+
+def _stock_name(key, page, i):
+    return f"합성{key[:2]}{page:05d}{i:02d}"
+
+
+def _cell(text):
+    return f'<td align="center"><font color="#333333">{text}</font></td>'
+
+
+def _row(key, page, i, day, rng):
+    name = _stock_name(key, page, i)
+    brokers = ",".join(rng.sample(BROKERS, rng.randint(1, 3)))
+    offer = f"{rng.randrange(5, 500) * 100:,}"
+    end = day + timedelta(days=1)
+
+    if key == "listing":
+        cells = [
+            f'<a href="/html/fund/?o=v&no={page}{i}">{name}{rng.choice(MARKETS)}</a>',
+            day.strftime("%Y.%m.%d"),
+            f"{rng.randrange(5, 900) * 100:,}",
+            f"{rng.uniform(-30, 30):.2f}%",
+            offer,
+            "-",
+        ]
+    else:
+        cells = [
+            f'<a href="/html/fund/?o=v&no={page}{i}">{name}</a>&nbsp;',
+            f"{day:%Y.%m.%d}~{end:%m.%d}",
+            offer if key == "bidding" else f"{offer}~{offer}",
+            offer,
+            f"{rng.uniform(0, 2000):.2f}:1",
+            brokers,
+        ]
+    return "<tr>" + "".join(_cell(c) for c in cells) + "</tr>"
+
+
+def make_page(key, page, rows_per_page=20, start=None, seed=0):
+    """
+    key 카테고리의 page번째 합성 페이지 (bytes)
+    - 최신 일정이 앞 페이지에 오도록 날짜를 page가 커질수록 과거로
+    - rows_per_page=0이면 마지막 이후(빈 표) 페이지
+    """
+    rng = random.Random(f"{seed}-{key}-{page}")
+    start = start or date.today() + timedelta(days=365 * 50)
+    summary = URLS[key]["summary"]
+
+    rows = []
+    for i in range(rows_per_page):
+        day = start - timedelta(days=(page - 1) * rows_per_page + i)
+        rows.append(_row(key, page, i, day, rng))
+
+    html = (
+        "<html><head>"
+        f'<meta http-equiv="Content-Type" content="text/html; charset={CHARSET}">'
+        "<title>38커뮤니케이션</title>"
+        '<script>var ad = "<table summary=\\"광고\\"></table>";</script>'
+        "</head><body>"
+        '<table width="100%"><tr><td>메뉴</td></tr></table>'
+        f'<table summary="{summary}" width="100%">'
+        "<tr><td>종목명</td><td>일정</td><td>공모가</td>"
+        "<td>희망공모가</td><td>경쟁률</td><td>주간사</td></tr>"
+        '<tr><td colspan="6"></td></tr>'
+        + "".join(rows)
+        + "</table></body></html>"
+    )
+    return html.encode(CHARSET)
+
+
+def write_fixtures(out_dir, pages=50, rows_per_page=20, seed=0):
+    """카테고리별 pages개 합성 페이지 + 빈 페이지를 픽스처 폴더에 저장"""
+    manifest = {"charset": CHARSET, "synthetic": True, "categories": {}}
+    for key in URLS:
+        folder = os.path.join(out_dir, key)
+        os.makedirs(folder, exist_ok=True)
+        for page in range(1, pages + 1):
+            with open(os.path.join(folder, f"{page}.html"), "wb") as f:
+                f.write(make_page(key, page, rows_per_page, seed=seed))
+        with open(os.path.join(folder, "empty.html"), "wb") as f:
+            f.write(make_page(key, pages + 1, 0, seed=seed))
+        manifest["categories"][key] = {"pages": pages}
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def seed_db(rows, batch=1000, seed=0):
+    """
+    현재 base.DB_PATH의 ipo_schedules에 과거 일정 rows건 채우기
+    - 크롤링 대상(미래 일정)과 겹치지 않게 과거 날짜만 사용
+    """
+    rng = random.Random(seed)
+    statuses = [("공모청약", "공모청약일정"), ("수요예측", "수요예측일정"), ("상장", "신규상장종목")]
+    first = date(2000, 1, 1)
+
+    records = []
+    for n in range(rows):
+        status, source = statuses[n % 3]
+        day = (first + timedelta(days=n // 3)).isoformat()
+        brokers = ",".join(rng.sample(BROKERS, rng.randint(1, 3)))
+        records.append(
+            {
+                "stock_name": f"과거종목{n:07d}",
+                "status": status,
+                "lead_manager": brokers.split(",")[0],
+                "brokers": brokers,
+                "offer_price": float(rng.randrange(5, 500) * 100),
+                "sub_start": day if status == "공모청약" else None,
+                "sub_end": day if status == "공모청약" else None,
+                "listing_date": day if status == "상장" else None,
+                "demand_start": day if status == "수요예측" else None,
+                "demand_end": day if status == "수요예측" else None,
+                "refund_date": None,
+                "source": source,
+            }
+        )
+        if len(records) >= batch:
+            base.insert_many(records)
+            records = []
+    base.insert_many(records)
+
+    conn = base.get_write_conn()
+    base.commit_writes()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
@@ -0,0 +1,140 @@
+# crawler/__main__.py
+"""
+헤드리스 실행 (화면 없는 서버용)
+- 로그는 stderr, 실행 요약은 stdout에 JSON 한 줄씩
+
+사용법:
+  python -m crawler                                   # 한 번 크롤링
+  python -m crawler --categories bidding listing      # 일부 카테고리만
+  python -m crawler --schedule                        # 주기 실행 (Ctrl+C로 종료)
+  python -m crawler --schedule --interval bidding=1800 --active-interval bidding=600
+  python -m crawler --backfill                        # 과거 데이터 전체 수집 (중단 후 이어서)
+  python -m crawler --backfill --restart              # 체크포인트 지우고 처음부터
+"""
+import sys
+import json
+import signal
+import argparse
+import threading
+from datetime import datetime
+
+from .base import init_db
+from .ipo38 import URLS
+from .runlock import RunLock
+from .scheduler import JITTER, Scheduler, run_once
+
+
+def _intervals(values):
+    """['bidding=1800', ...] → {'bidding': 1800.0}"""
+    result = {}
+    for value in values or []:
+        key, _, seconds = value.partition("=")
+        if key not in URLS or not seconds:
+            raise argparse.ArgumentTypeError(f"잘못된 주기: {value} (예: bidding=1800)")
+        result[key] = float(seconds)
+    return result
+
+
+def _log(msg):
+    print(f"[{datetime.now():%H:%M:%S}] {msg}", file=sys.stderr, flush=True)
+
+
+def _emit(summary):
+    print(json.dumps(summary, ensure_ascii=False), flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m crawler", description="헤드리스 공모주 크롤링")
+    parser.add_argument("--schedule", action="store_true", help="주기 실행")
+    parser.add_argument("--backfill", action="store_true", help="과거 데이터 전체 페이지 수집")
+    parser.add_argument("--restart", action="store_true", help="--backfill 체크포인트 무시")
+    parser.add_argument("--categories", nargs="+", choices=list(URLS), help="수집할 카테고리")
+    parser.add_argument("--interval", action="append", metavar="KEY=SEC", help="카테고리별 기본 주기")
+    parser.add_argument(
+        "--active-interval",
+        action="append",
+        metavar="KEY=SEC",
+        help="청약/수요예측/상장 당일 주기",
+    )
+    parser.add_argument("--jitter", type=float, default=JITTER, help="주기 무작위 편차 비율")
+    parser.add_argument("--full", action="store_true", help="증분 모드 끄고 전체 재수집")
+    parser.add_argument("--no-cache", action="store_true", help="HTTP 응답 캐시 안 씀")
+    parser.add_argument("--lock", help="잠금 파일 경로")
+    parser.add_argument("--quiet", action="store_true", help="진행 로그 숨김")
+    args = parser.parse_args(argv)
+
+    try:
+        intervals = _intervals(args.interval)
+        active_intervals = _intervals(args.active_interval)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    init_db()
+
+    log_func = None if args.quiet else _log
+    incremental = False if args.full else None
+    cache = False if args.no_cache else None
+    lock = RunLock(args.lock)
+
+    # SIGTERM / Ctrl+C → 진행 중 크롤링도 stop_checker로 정리 후 종료
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        stop.set()
+        if scheduler:
+            scheduler.stop()
+
+    scheduler = None
+    signal.signal(signal.SIGINT, request_stop)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, request_stop)
+
+    if args.backfill:
+        from .backfill import backfill
+
+        if not lock.acquire():
+            _emit({"status": "locked", "holder": lock.holder()})
+            return 3
+        try:
+            summary = backfill(
+                args.categories,
+                log_func=log_func,
+                stop_checker=stop.is_set,
+                restart=args.restart,
+            )
+        finally:
+            lock.release()
+        _emit(summary)
+        return 0
+
+    if not args.schedule:
+        summary = run_once(
+            args.categories,
+            log_func=log_func,
+            stop_checker=stop.is_set,
+            incremental=incremental,
+            cache=cache,
+            lock=lock,
+        )
+        _emit(summary)
+        return {"ok": 0, "stopped": 0, "locked": 3}.get(summary["status"], 1)
+
+    scheduler = Scheduler(
+        intervals=intervals,
+        active_intervals=active_intervals,
+        jitter=args.jitter,
+        categories=args.categories,
+        log_func=log_func,
+        emit=_emit,
+        incremental=incremental,
+        cache=cache,
+        lock=lock,
+    )
+    if stop.is_set():
+        scheduler.stop()
+    scheduler.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
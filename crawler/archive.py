@@ -0,0 +1,407 @@
+# crawler/archive.py
+"""
+받은 페이지 원본 보관소 (압축 + 내용 주소 방식)
+- blobs: 본문 sha256 → 압축 본문 (같은 본문은 한 번만 저장)
+- fetches: URL / 카테고리 / 페이지 / 받은 시각 → 본문 해시
+- 압축: zstandard가 설치돼 있으면 zstd, 없으면 gzip
+- reparse(): 네트워크 없이 보관된 페이지로 ipo_schedules 다시 만들기 (프로세스 풀 파싱)
+
+사용법:
+  python -m crawler.archive stats
+  python -m crawler.archive reparse                   # 보관된 페이지를 받은 순서대로 다시 저장
+  python -m crawler.archive reparse --rebuild         # ipo_schedules를 비우고 처음부터
+"""
+import os
+import sys
+import gzip
+import time
+import hashlib
+import sqlite3
+import argparse
+import threading
+from multiprocessing import Pool
+
+from .base import resource_path
+
+# 🔥 페이지 보관소 경로 (db/page_archive.db)
+ARCHIVE_PATH = resource_path(os.path.join("db", "page_archive.db"))
+
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+
+REPARSE_WORKERS = None  # None이면 CPU 수
+REPARSE_CHUNKSIZE = 8  # 프로세스에 한 번에 넘기는 페이지 수
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+
+def compress(body):
+    """본문 → (codec, 압축 bytes)"""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return "gzip", gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def decompress(codec, data):
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd로 보관된 페이지입니다: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "raw":
+        return data
+    raise ValueError(f"알 수 없는 압축 형식: {codec}")
+
+
+def _open(path, check_same_thread=True):
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+
+class PageArchive:
+    """
+    페이지 원본 보관소 (SQLite 파일 하나)
+    - store(): 압축은 잠금 밖(워커 스레드)에서, 저장만 잠금 안에서
+    - 같은 URL의 직전 본문과 같아도 fetches에는 기록 (받은 시각 이력)
+    - keep_past: 지난 일정까지 저장한 페이지인지 (과거 데이터 수집) → 다시 파싱할 때 같은 기준
+    """
+
+    def __init__(self, path=None):
+        self.path = path or ARCHIVE_PATH
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = _open(self.path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fetches (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                category TEXT,
+                page INTEGER,
+                charset TEXT,
+                hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                keep_past INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        # keep_past 컬럼이 없던 보관소 (모두 평소 크롤링으로 간주)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(fetches)")}
+        if "keep_past" not in columns:
+            self.conn.execute(
+                "ALTER TABLE fetches ADD COLUMN keep_past INTEGER NOT NULL DEFAULT 0"
+            )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_fetches_url ON fetches (url, fetched_at)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_fetches_time ON fetches (fetched_at)"
+        )
+        self.conn.commit()
+
+    def store(self, url, body, charset=None, category=None, page=None, keep_past=False):
+        """본문 보관 후 해시 반환 (이미 있는 본문이면 압축/저장 생략)"""
+        content_hash = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            exists = self.conn.execute(
+                "SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)
+            ).fetchone()
+
+        blob = None if exists else compress(body)
+        with self._lock:
+            if blob is not None:
+                codec, data = blob
+                self.conn.execute(
+                    """
+                    INSERT OR IGNORE INTO blobs (hash, codec, size, stored_size, body)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (content_hash, codec, len(body), len(data), data),
+                )
+            self.conn.execute(
+                """
+                INSERT INTO fetches
+                (url, category, page, charset, hash, fetched_at, keep_past)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, category, page, charset, content_hash, time.time(), int(keep_past)),
+            )
+            self.conn.commit()
+        return content_hash
+
+    def load(self, content_hash):
+        """해시 → 원본 bytes (없으면 None)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT codec, body FROM blobs WHERE hash = ?", (content_hash,)
+            ).fetchone()
+        return decompress(*row) if row else None
+
+    def latest(self, url):
+        """url의 가장 최근 (hash, fetched_at) (없으면 None)"""
+        with self._lock:
+            return self.conn.execute(
+                """
+                SELECT hash, fetched_at FROM fetches
+                WHERE url = ? ORDER BY fetched_at DESC LIMIT 1
+                """,
+                (url,),
+            ).fetchone()
+
+    def replay_list(self, categories=None, since=None):
+        """
+        다시 파싱할 (hash, category, charset, keep_past) 목록 (받은 순서)
+        - 같은 URL에서 직전과 같은 본문(같은 keep_past)은 건너뜀 (결과가 같으므로)
+        """
+        query = """
+            SELECT url, hash, category, charset, keep_past FROM fetches
+            WHERE category IS NOT NULL AND fetched_at >= ?
+            ORDER BY fetched_at, id
+        """
+        with self._lock:
+            rows = self.conn.execute(query, (since or 0,)).fetchall()
+
+        last = {}
+        items = []
+        for url, content_hash, category, charset, keep_past in rows:
+            if categories is not None and category not in categories:
+                continue
+            if last.get(url) == (content_hash, keep_past):
+                continue
+            last[url] = (content_hash, keep_past)
+            items.append((content_hash, category, charset, bool(keep_past)))
+        return items
+
+    def stats(self):
+        with self._lock:
+            blobs, size, stored = self.conn.execute(
+                "SELECT COUNT(*), IFNULL(SUM(size), 0), IFNULL(SUM(stored_size), 0) FROM blobs"
+            ).fetchone()
+            fetches, urls = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT url) FROM fetches"
+            ).fetchone()
+            codecs = dict(
+                self.conn.execute("SELECT codec, COUNT(*) FROM blobs GROUP BY codec")
+            )
+        return {
+            "fetches": fetches,
+            "urls": urls,
+            "blobs": blobs,
+            "bytes": size,
+            "stored_bytes": stored,
+            "codecs": codecs,
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+# 기본 보관소 (크롤링 전체에서 공유)
+_default_archive = None
+_default_lock = threading.Lock()
+
+
+def get_archive():
+    """공유 기본 보관소 반환 (없으면 생성)"""
+    global _default_archive
+    with _default_lock:
+        if _default_archive is None:
+            _default_archive = PageArchive()
+        return _default_archive
+
+
+def set_archive(archive):
+    """기본 보관소 교체 (None이면 다음 get_archive()에서 새로 생성)"""
+    global _default_archive
+    with _default_lock:
+        _default_archive = archive
+
+
+# ---------------------- 다시 파싱 (프로세스 풀) ----------------------
+
+_worker_conn = None
+
+
+def _init_worker(path):
+    """워커 프로세스마다 보관소를 읽기 전용으로 열어둠 (본문은 부모를 거치지 않음)"""
+    global _worker_conn
+    _worker_conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def _parse_archived(item):
+    """워커: (hash, category, charset, keep_past) → 레코드 목록"""
+    from .decode import resolve_charset
+    from .extract import extract_table
+    from .ipo38 import EXTRACT_ENGINE, RECORD_BUILDERS, SOURCE_ENCODING, URLS
+
+    content_hash, category, charset, keep_past = item
+    codec, data = _worker_conn.execute(
+        "SELECT codec, body FROM blobs WHERE hash = ?", (content_hash,)
+    ).fetchone()
+    content = decompress(codec, data)
+
+    charset = resolve_charset(content, charset, SOURCE_ENCODING)
+    rows = extract_table(content, charset, URLS[category]["summary"], EXTRACT_ENGINE)
+    if not rows:
+        return []
+    return RECORD_BUILDERS[category](rows, keep_past=keep_past)
+
+
+class _Stopped(Exception):
+    """reparse 중단 → 다시 만들기 트랜잭션 rollback"""
+
+
+def _replay(items, summary, workers, archive, stop_checker):
+    """프로세스 풀로 파싱한 레코드를 받은 순서대로 저장 (중단되면 False)"""
+    from .base import insert_many
+
+    with Pool(workers or REPARSE_WORKERS, _init_worker, (archive.path,)) as pool:
+        for records in pool.imap(_parse_archived, items, chunksize=REPARSE_CHUNKSIZE):
+            if stop_checker and stop_checker():
+                pool.terminate()
+                return False
+            stats = insert_many(records)
+            for k, v in stats.items():
+                summary[k] += v
+            summary["rows"] += len(records)
+            summary["pages"] += 1
+    return True
+
+
+def reparse(
+    categories=None,
+    rebuild=False,
+    since=None,
+    workers=None,
+    archive=None,
+    log_func=None,
+    stop_checker=None,
+    keep_past=None,
+):
+    """
+    보관된 페이지로 ipo_schedules 다시 만들기 (네트워크 사용 안 함)
+    - 받은 순서대로 저장 → 나중에 받은 값이 앞의 값을 갱신
+    - 지난 일정은 받을 때와 같은 기준: 과거 데이터 수집으로 받은 페이지만 포함
+      (keep_past=True면 모든 페이지에서 포함, 평소 크롤링은 받은 날 기준이 아니라 오늘 기준)
+    - 파싱은 프로세스 풀, 저장은 이 프로세스 한 곳에서만
+    - rebuild: 먼저 ipo_schedules / ipo_changes를 비움 (보관소에 없는 행은 사라짐)
+      파싱 완료 기록(page_marks)도 함께 비움, 전체가 한 트랜잭션 → 중단(stop_checker)이나
+      오류면 rollback
+    - 반환: {"status", "pages", "rows", "inserted", "updated", "unchanged", "wall_ms"}
+    """
+    from .base import commit_writes, merge_ipos, write_transaction
+
+    archive = archive or get_archive()
+    items = archive.replay_list(categories, since)
+    if keep_past:
+        items = [item[:3] + (True,) for item in items]
+    t0 = time.perf_counter()
+    summary = {
+        "status": "ok",
+        "pages": 0,
+        "rows": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    if log_func:
+        log_func(f"▶ 보관된 페이지 {len(items)}개 다시 파싱")
+
+    if rebuild:
+        # 비우기 ~ 다시 저장 ~ 합치기를 한 트랜잭션으로: 중단/오류면 원래 표 그대로
+        try:
+            with write_transaction() as conn:
+                conn.execute("DELETE FROM ipo_schedules")
+                conn.execute("DELETE FROM ipo_changes")  # 지운 일정 id를 가리키는 이력
+                conn.execute("DELETE FROM page_marks")  # 다음 크롤링에서 모든 페이지 다시 저장
+                if not _replay(items, summary, workers, archive, stop_checker):
+                    raise _Stopped
+                merge_ipos()
+        except _Stopped:
+            summary.update(status="stopped", inserted=0, updated=0, unchanged=0)
+            summary["wall_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            if log_func:
+                log_func("⏹ 중단 → 다시 만들기 취소 (기존 데이터 유지)")
+            return summary
+    else:
+        if not _replay(items, summary, workers, archive, stop_checker):
+            summary["status"] = "stopped"
+        merge_ipos()
+        commit_writes()
+
+    summary["wall_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    if log_func:
+        log_func(
+            f"✅ 페이지 {summary['pages']}개 / {summary['rows']}건"
+            f" (신규 {summary['inserted']} / 변경 {summary['updated']}"
+            f" / 동일 {summary['unchanged']})"
+        )
+    return summary
+
+
+def main(argv=None):
+    import json
+
+    from .base import init_db
+    from .runlock import RunLock
+
+    parser = argparse.ArgumentParser(
+        prog="python -m crawler.archive", description="페이지 보관소 / 오프라인 다시 파싱"
+    )
+    parser.add_argument("command", choices=["stats", "reparse"])
+    parser.add_argument("--path", help="보관소 파일 경로")
+    parser.add_argument("--categories", nargs="+", help="다시 파싱할 카테고리")
+    parser.add_argument("--rebuild", action="store_true", help="ipo_schedules를 비우고 다시 만듦")
+    parser.add_argument("--workers", type=int, help="파싱 프로세스 수")
+    parser.add_argument(
+        "--keep-past", action="store_true", help="모든 페이지에서 지난 일정도 저장"
+    )
+    args = parser.parse_args(argv)
+
+    archive = PageArchive(args.path) if args.path else get_archive()
+    if args.command == "stats":
+        print(json.dumps(archive.stats(), ensure_ascii=False))
+        return 0
+
+    init_db()
+    lock = RunLock()
+    if not lock.acquire():
+        print(json.dumps({"status": "locked", "holder": lock.holder()}))
+        return 3
+    try:
+        summary = reparse(
+            args.categories,
+            rebuild=args.rebuild,
+            workers=args.workers,
+            archive=archive,
+            keep_past=args.keep_past or None,
+            log_func=lambda msg: print(msg, file=sys.stderr, flush=True),
+        )
+    finally:
+        lock.release()
+    print(json.dumps(summary, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# crawler/backfill.py
+"""
+과거 데이터 수집 (38커뮤니케이션 카테고리 전체 페이지, 지난 일정 포함)
+- MAX_PAGES / '오늘 이후' 조건 없이 빈 페이지가 나올 때까지
+- 카테고리별 체크포인트(다음 페이지)를 DB(backfill_state)에 저장 → 중단 후 이어서
+- 받기(스레드) / 파싱(프로세스 풀, crawler.pipeline) / 저장(호출 스레드) 분리
+- 메모리: 미리 받아두는 페이지(BACKFILL_PREFETCH) + 파싱 대기열(PARSE_QUEUE)만 들고 있음
+- 쓰기: BACKFILL_COMMIT_PAGES 페이지마다 행 + 체크포인트를 한 트랜잭션으로 commit
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import (
+    insert_many,
+    commit_writes,
+    merge_ipos,
+    get_backfill_state,
+    set_backfill_state,
+    clear_backfill_state,
+)
+from .fetcher import HttpFetcher
+from .ipo38 import (
+    HEADERS,
+    URLS,
+    PER_HOST_LIMIT,
+    PageStream,
+    resolve_archive,
+)
+from .metrics import CrawlMetrics
+from .pipeline import ParsePipeline, parse_executor
+
+BACKFILL_WORKERS = PER_HOST_LIMIT  # 동시 요청 수 (호스트 제한보다 크게 해도 의미 없음)
+BACKFILL_PREFETCH = 6  # 카테고리별로 미리 받아둘 페이지 수
+BACKFILL_RATE = 3.0  # 초당 최대 요청 수 (재시도 포함)
+BACKFILL_COMMIT_PAGES = 20  # 이 페이지 수마다 commit + 체크포인트
+BACKFILL_MAX_PAGES = 10000  # 안전 상한 (빈 페이지가 안 나오는 경우)
+BACKFILL_PARSE_PROCESSES = None  # 파싱 프로세스 수 (None이면 pipeline.PARSE_PROCESSES)
+
+
+def backfill(
+    categories=None,
+    log_func=None,
+    stop_checker=None,
+    fetcher=None,
+    restart=False,
+    max_pages=None,
+    metrics=None,
+    archive=None,
+):
+    """
+    카테고리별 전체 페이지 수집
+    - categories: 카테고리 키 목록 (None이면 전체)
+    - restart: 체크포인트를 지우고 1페이지부터 다시
+    - fetcher: HttpFetcher 주입 (없으면 BACKFILL_RATE 제한 페처)
+    - archive: PageArchive 주입 (없으면 공유 기본 보관소, False면 보관 안 함)
+    - 반환: {"status": ok/stopped, "categories": {key: {...}}, "pages", "rows", "wall_ms"}
+    """
+    metrics = metrics if metrics is not None else CrawlMetrics()
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = HttpFetcher(headers=HEADERS, rate_limit=BACKFILL_RATE)
+
+    archive = resolve_archive(archive)
+    keys = [key for key in URLS if categories is None or key in categories]
+    summary = {"status": "ok", "categories": {}}
+
+    metrics.start()
+    try:
+        with ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as executor, parse_executor(
+            BACKFILL_PARSE_PROCESSES
+        ) as parser:
+            for key in keys:
+                if restart:
+                    clear_backfill_state(key)
+                result = backfill_category(
+                    key,
+                    executor,
+                    parser,
+                    fetcher,
+                    log_func,
+                    stop_checker,
+                    max_pages or BACKFILL_MAX_PAGES,
+                    metrics,
+                    archive,
+                )
+                summary["categories"][key] = result
+                if result["status"] == "stopped":
+                    summary["status"] = "stopped"
+                    break
+
+        with metrics.timer("db_commit_ms"):
+            merge_ipos()
+            commit_writes()
+    finally:
+        metrics.finish()
+        if own_fetcher:
+            fetcher.close()
+
+    summary["pages"] = sum(r["pages"] for r in summary["categories"].values())
+    summary["rows"] = sum(r["rows"] for r in summary["categories"].values())
+    summary["wall_ms"] = round(metrics.wall_ms or 0, 1)
+    return summary
+
+
+def backfill_category(
+    key,
+    executor,
+    parser,
+    fetcher,
+    log_func,
+    stop_checker,
+    max_pages,
+    metrics,
+    archive=None,
+):
+    """
+    한 카테고리를 체크포인트부터 끝까지 수집
+    - executor: 받기 스레드 풀 / parser: 파싱 프로세스 풀
+    - 반환: {"status": ok/stopped/done(이미 완료), "start_page", "next_page", "pages", "rows"}
+    """
+    summary = URLS[key]["summary"]
+    state = get_backfill_state(key) or {"next_page": 1, "done": False, "rows": 0}
+    result = {
+        "status": "ok",
+        "start_page": state["next_page"],
+        "next_page": state["next_page"],
+        "pages": 0,
+        "rows": 0,
+    }
+    if state["done"]:
+        if log_func:
+            log_func(f"▶ {summary}: 이미 완료 (--restart로 다시 수집)")
+        result["status"] = "done"
+        return result
+
+    if log_func:
+        log_func(f"▶ {summary} 과거 데이터 수집 시작 (페이지 {state['next_page']}부터)")
+
+    stream = PageStream(
+        executor,
+        key,
+        prefetch=BACKFILL_PREFETCH,
+        fetcher=fetcher,
+        start_page=state["next_page"],
+        max_page=max_pages,
+        archive=archive,
+        extract=False,
+        keep_past=True,
+    )
+    pipeline = ParsePipeline(
+        stream, parser, key, keep_past=True, stop_checker=stop_checker
+    )
+    total_rows = state["rows"]
+    last_marks = None
+    done = False
+
+    def checkpoint(next_page):
+        set_backfill_state(key, next_page, done, total_rows)
+        with metrics.timer("db_commit_ms"):
+            commit_writes()
+
+    try:
+        for page, fetched, parsed in pipeline:
+            if stop_checker and stop_checker():
+                break
+
+            metrics.inc("pages")
+            metrics.inc("bytes", fetched["bytes"])
+            metrics.observe("fetch_ms", fetched["fetch_ms"])
+            if parsed is None:
+                continue  # 캐시상 지난번과 같은 본문 (과거 수집은 캐시를 안 쓰므로 드묾)
+            metrics.observe("extract_ms", parsed["parse_ms"])
+
+            if not parsed["row_count"]:
+                done = True
+                break
+
+            # 범위를 넘으면 마지막 페이지를 그대로 돌려주는 경우 대비
+            if parsed["marks"] == last_marks:
+                done = True
+                break
+            last_marks = parsed["marks"]
+
+            records = parsed["records"]
+            t0 = time.perf_counter()
+            stats = insert_many(records)
+            metrics.observe("db_insert_ms", (time.perf_counter() - t0) * 1000)
+            metrics.inc("rows_seen", parsed["row_count"])
+            for k, v in stats.items():
+                metrics.inc(f"rows_{k}", v)
+
+            total_rows += len(records)
+            result["rows"] += len(records)
+            result["pages"] += 1
+            result["next_page"] = page + 1
+
+            if result["pages"] % BACKFILL_COMMIT_PAGES == 0:
+                checkpoint(page + 1)
+                if log_func:
+                    log_func(f"  ▶ 페이지 {page}까지 완료 (누적 {total_rows}건)")
+        else:
+            # 파이프라인이 끝까지 돈 경우: 중단 요청이 아니면 안전 상한 도달
+            done = not pipeline.stopped
+    except Exception:
+        # 요청/파싱이 끝내 실패해도 처리한 페이지까지는 남김
+        pipeline.close()
+        checkpoint(result["next_page"])
+        raise
+    pipeline.close()
+    metrics.observe("parse_wait_ms", pipeline.wait_ms)
+
+    if stop_checker and stop_checker() and not done:
+        result["status"] = "stopped"
+        if log_func:
+            log_func("⛔ 사용자 요청으로 수집 중단 (다음 실행에서 이어서)")
+
+    checkpoint(result["next_page"])
+    if log_func:
+        state_text = "완료" if done else f"페이지 {result['next_page']}부터 이어서 가능"
+        log_func(
+            f"  └ {summary} 페이지 {result['pages']}개 / {result['rows']}건 저장 ({state_text})"
+        )
+    return result
@@ -1,8 +1,15 @@
 # crawler/base.py
 import os
 import sys
+import hashlib
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from typing import NamedTuple, Optional
+
+from .merge import merge_pending
 
 
 # -------------------------------
@@ -26,25 +33,204 @@ def resource_path(relative_path: str):
 # 🔥 실제 DB 경로 (db/ipo.db)
 DB_PATH = resource_path(os.path.join("db", "ipo.db"))
 
+# -------------------------------
+# 🔥 커넥션 설정 (WAL + PRAGMA)
+# -------------------------------
+# WAL: 쓰기 트랜잭션 중에도 GUI 조회가 막히지 않음
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # WAL에서는 NORMAL로도 DB가 깨지지 않음
+    "cache_size": -16000,  # 음수 = KB 단위 (약 16MB)
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,  # ms, 잠금 대기
+}
+
+READ_POOL_SIZE = 4  # 재사용할 조회용 커넥션 수
+WRITE_BATCH_SIZE = 50  # 쓰기 커넥션은 이 건수마다 중간 commit (0이면 마지막에만)
+
+
+def _connect(path, check_same_thread=True):
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
 # 크롤링 중에만 쓰는 전역 write connection
 WRITE_CONN = None
+_pending_writes = 0
+_batch_paused = False  # write_transaction() 안에서는 중간 commit 안 함
+
+# 여러 소스가 동시에 크롤링할 때 쓰기 커넥션 사용을 직렬화 (commit 안에서 다시 잡으므로 RLock)
+WRITE_LOCK = threading.RLock()
 
 
 def get_write_conn():
     """크롤링 동안 하나의 쓰기 전용 커넥션만 유지"""
     global WRITE_CONN
-    if WRITE_CONN is None:
-        WRITE_CONN = sqlite3.connect(DB_PATH, check_same_thread=False)
-    return WRITE_CONN
+    with WRITE_LOCK:
+        if WRITE_CONN is None:
+            WRITE_CONN = _connect(DB_PATH, check_same_thread=False)
+        return WRITE_CONN
+
+
+def commit_writes():
+    """쓰기 커넥션 commit (크롤링 끝에서 호출)"""
+    global _pending_writes
+    with WRITE_LOCK:
+        if WRITE_CONN is not None:
+            WRITE_CONN.commit()
+        _pending_writes = 0
+
+
+def close_write_conn():
+    """남은 쓰기 commit 후 쓰기 커넥션 닫기 (DB_PATH를 바꾸기 전 등)"""
+    global WRITE_CONN
+    with WRITE_LOCK:
+        commit_writes()
+        if WRITE_CONN is not None:
+            WRITE_CONN.close()
+            WRITE_CONN = None
+
+
+def _note_writes(n):
+    """쓴 건수가 WRITE_BATCH_SIZE를 넘으면 중간 commit → 크롤링 중에도 GUI에서 조회 가능"""
+    global _pending_writes
+    _pending_writes += n
+    if WRITE_BATCH_SIZE and not _batch_paused and _pending_writes >= WRITE_BATCH_SIZE:
+        commit_writes()
+
+
+@contextmanager
+def write_transaction():
+    """
+    쓰기 커넥션에서 중간 commit 없이 한 트랜잭션으로 실행 (끝날 때까지 WRITE_LOCK 유지)
+    - 블록이 끝나면 commit, 예외(중단 포함)면 rollback → 반쯤 쓴 상태가 남지 않음
+    - 앞서 쌓인 쓰기는 들어가기 전에 따로 commit
+    """
+    global _batch_paused, _pending_writes
+    with WRITE_LOCK:
+        commit_writes()
+        conn = get_write_conn()
+        _batch_paused = True
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            _pending_writes = 0
+            raise
+        finally:
+            _batch_paused = False
+        commit_writes()
+
+
+class _PooledConnection:
+    """close() 하면 실제로 닫지 않고 풀에 돌려주는 커넥션 래퍼"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+
+class ReadPool:
+    """조회용 커넥션 풀 (최대 size개 보관, 모자라면 새로 만들고 남으면 닫음)"""
+
+    def __init__(self, path, size=READ_POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = _connect(self.path, check_same_thread=False)
+        return _PooledConnection(self, conn)
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_read_pool = None
+_read_pool_lock = threading.Lock()
 
 
 def get_connection():
-    """일반 조회용 커넥션 (사용 후 반드시 close)"""
-    return sqlite3.connect(DB_PATH)
+    """일반 조회용 커넥션 (사용 후 반드시 close → 풀에 반납)"""
+    global _read_pool
+    with _read_pool_lock:
+        if _read_pool is None or _read_pool.path != DB_PATH:
+            if _read_pool is not None:
+                _read_pool.close()
+            _read_pool = ReadPool(DB_PATH)
+        pool = _read_pool
+    return pool.acquire()
+
+
+# 중복 판단 기준 (자연키): NULL은 ''로 정규화해서 비교
+NATURAL_KEY_SQL = (
+    "stock_name, status, "
+    "IFNULL(sub_start, ''), IFNULL(demand_start, ''), IFNULL(listing_date, '')"
+)
+
+class IPORecord(NamedTuple):
+    """
+    ipo_schedules 한 행 (필드 순서 = INSERT 컬럼 순서)
+    - 튜플이라 행마다 dict가 없고 executemany에 그대로 바인딩
+    - status / source / 증권사 이름은 intern_text()로 같은 문자열 객체를 공유
+    """
+
+    stock_name: str
+    status: str
+    lead_manager: Optional[str] = None
+    brokers: Optional[str] = None
+    offer_price: Optional[float] = None
+    sub_start: Optional[str] = None
+    sub_end: Optional[str] = None
+    listing_date: Optional[str] = None
+    demand_start: Optional[str] = None
+    demand_end: Optional[str] = None
+    refund_date: Optional[str] = None
+    source: Optional[str] = None
+
+
+IPO_COLUMNS = IPORecord._fields
+
+
+def intern_text(text):
+    """여러 행에 반복되는 문자열(status / source / 증권사) 공유 (None / ''는 그대로)"""
+    return sys.intern(text) if text else text
 
 
 def init_db():
-    """테이블 생성"""
+    """테이블 생성 + 스키마 마이그레이션"""
     conn = get_connection()
     cur = conn.cursor()
 
@@ -68,92 +254,750 @@ def init_db():
         );
         """
     )
-
     conn.commit()
+
+    migrate(conn)
     conn.close()
 
 
-def insert_ipo(data):
-    conn = get_write_conn()
-    cur = conn.cursor()
+# ---------------------- 스키마 마이그레이션 ----------------------
 
-    # 🔥 중복 체크
+
+def _migration_001_natural_key(cur):
+    """자연키 UNIQUE 인덱스 (기존 중복 행은 가장 먼저 들어온 것만 남김)"""
     cur.execute(
+        f"""
+        DELETE FROM ipo_schedules
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM ipo_schedules GROUP BY {NATURAL_KEY_SQL}
+        )
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_ipo_schedules_natural_key
+        ON ipo_schedules ({NATURAL_KEY_SQL})
+        """
+    )
+
+
+def _migration_002_effective_date(cur):
+    """
+    예정 일정 조회용 생성 컬럼 + 커버링 인덱스
+    - effective_date: 정렬 기준 (청약 → 수요예측 → 상장일 중 첫 값)
+    - latest_date: 세 날짜 중 가장 늦은 값 ('오늘 이후' 조건용, 없으면 '')
+    """
+    cur.execute(
+        """
+        ALTER TABLE ipo_schedules ADD COLUMN effective_date TEXT
+        GENERATED ALWAYS AS (COALESCE(sub_start, demand_start, listing_date))
+        VIRTUAL
+        """
+    )
+    cur.execute(
+        """
+        ALTER TABLE ipo_schedules ADD COLUMN latest_date TEXT
+        GENERATED ALWAYS AS (
+            MAX(IFNULL(sub_start, ''), IFNULL(demand_start, ''),
+                IFNULL(listing_date, ''))
+        ) VIRTUAL
+        """
+    )
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_ipo_schedules_upcoming
+        ON ipo_schedules (
+            latest_date, effective_date, stock_name, status,
+            sub_start, sub_end, demand_start, demand_end, listing_date, source
+        )
+        """
+    )
+
+
+def _migration_003_brokers(cur):
+    """
+    증권사 정규화 테이블
+    - brokers: 증권사 이름 (UNIQUE)
+    - ipo_brokers: 공모주 ↔ 증권사 (양방향 인덱스)
+    - ipo_broker_sync: brokers 컬럼이 바뀐 행 대기열 (트리거가 채우고 sync_brokers가 비움)
+    """
+    cur.execute(
+        """
+        CREATE TABLE brokers (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE ipo_brokers (
+            ipo_id INTEGER NOT NULL,
+            broker_id INTEGER NOT NULL,
+            PRIMARY KEY (ipo_id, broker_id)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute(
+        "CREATE INDEX ix_ipo_brokers_broker ON ipo_brokers (broker_id, ipo_id)"
+    )
+    cur.execute("CREATE TABLE ipo_broker_sync (ipo_id INTEGER PRIMARY KEY)")
+
+    _create_broker_triggers(cur)
+
+    # 기존 행 1회 채우기
+    cur.execute("INSERT INTO ipo_broker_sync (ipo_id) SELECT id FROM ipo_schedules")
+    sync_brokers(cur)
+
+
+def _create_broker_triggers(cur):
+    """
+    ipo_broker_sync를 채우는 트리거
+    - UPSERT가 부른 트리거 안에서는 INSERT OR IGNORE가 무시됨 → WHERE NOT EXISTS로
+      (한 배치에 같은 자연키가 brokers만 달리 두 번 나와도 UNIQUE 오류 없음)
+    """
+    cur.execute(
+        """
+        CREATE TRIGGER tr_ipo_schedules_brokers_insert
+        AFTER INSERT ON ipo_schedules
+        BEGIN
+            INSERT INTO ipo_broker_sync (ipo_id)
+            SELECT NEW.id
+            WHERE NOT EXISTS (SELECT 1 FROM ipo_broker_sync WHERE ipo_id = NEW.id);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER tr_ipo_schedules_brokers_update
+        AFTER UPDATE OF brokers ON ipo_schedules
+        BEGIN
+            INSERT INTO ipo_broker_sync (ipo_id)
+            SELECT NEW.id
+            WHERE NOT EXISTS (SELECT 1 FROM ipo_broker_sync WHERE ipo_id = NEW.id);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER tr_ipo_schedules_brokers_delete
+        AFTER DELETE ON ipo_schedules
+        BEGIN
+            DELETE FROM ipo_brokers WHERE ipo_id = OLD.id;
+            DELETE FROM ipo_broker_sync WHERE ipo_id = OLD.id;
+        END
+        """
+    )
+
+
+def _migration_004_crawl_state(cur):
+    """카테고리별 증분 크롤링 기준 행 (지난 실행 1페이지 첫 행)"""
+    cur.execute(
+        """
+        CREATE TABLE crawl_state (
+            category TEXT PRIMARY KEY,
+            mark TEXT,
+            updated_at TEXT
+        )
+        """
+    )
+
+
+def _migration_005_export_state(cur):
+    """형식별 증분 내보내기 기준 (마지막으로 내보낸 id / created_at)"""
+    cur.execute(
+        """
+        CREATE TABLE export_state (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL,
+            last_created_at TEXT,
+            updated_at TEXT
+        )
+        """
+    )
+
+
+def _migration_006_ipos(cur):
+    """
+    회사 단위 통합 테이블 (같은 회사의 수요예측/청약/상장 일정, 여러 소스를 한 행으로)
+    - ipos: 회사 한 행 (canonical_name UNIQUE, 일정 날짜는 각 일정에서 가져옴)
+    - ipo_schedules.ipo_id: 일정(이벤트) → 회사
+    - ipo_merge_queue: 새로 들어오거나 바뀐 일정 대기열 (트리거가 채우고 merge_pending이 비움)
+    - ipo_merge_dirty: 일정이 지워진 회사 (다시 계산, 일정이 없으면 삭제)
+    """
+    cur.execute(
+        """
+        CREATE TABLE ipos (
+            id INTEGER PRIMARY KEY,
+            canonical_name TEXT NOT NULL UNIQUE,
+            stock_name TEXT,
+            market TEXT,
+            stage TEXT,
+            lead_manager TEXT,
+            brokers TEXT,
+            offer_price REAL,
+            demand_start TEXT,
+            demand_end TEXT,
+            sub_start TEXT,
+            sub_end TEXT,
+            refund_date TEXT,
+            listing_date TEXT,
+            sources TEXT,
+            event_count INTEGER,
+            updated_at TEXT,
+            effective_date TEXT GENERATED ALWAYS AS (
+                COALESCE(sub_start, demand_start, listing_date)
+            ) VIRTUAL,
+            latest_date TEXT GENERATED ALWAYS AS (
+                MAX(IFNULL(sub_end, ''), IFNULL(sub_start, ''),
+                    IFNULL(demand_end, ''), IFNULL(demand_start, ''),
+                    IFNULL(listing_date, ''))
+            ) VIRTUAL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX ix_ipos_upcoming ON ipos (latest_date, effective_date)")
+
+    cur.execute("ALTER TABLE ipo_schedules ADD COLUMN ipo_id INTEGER")
+    cur.execute("CREATE INDEX ix_ipo_schedules_ipo ON ipo_schedules (ipo_id)")
+    cur.execute("CREATE TABLE ipo_merge_queue (schedule_id INTEGER PRIMARY KEY)")
+    cur.execute("CREATE TABLE ipo_merge_dirty (ipo_id INTEGER PRIMARY KEY)")
+
+    _create_merge_triggers(cur)
+
+    # 기존 행 1회 합치기
+    cur.execute("INSERT INTO ipo_merge_queue (schedule_id) SELECT id FROM ipo_schedules")
+    merge_pending(cur)
+
+
+def _create_merge_triggers(cur):
+    """
+    ipo_merge_queue / ipo_merge_dirty를 채우는 트리거
+    - UPSERT(INSERT ... ON CONFLICT DO UPDATE)가 부른 트리거 안에서는 INSERT OR IGNORE가
+      무시되고 UNIQUE 오류가 남 → 이미 있으면 넣지 않는 WHERE NOT EXISTS로
+    """
+    cur.execute(
+        """
+        CREATE TRIGGER tr_ipo_schedules_merge_insert
+        AFTER INSERT ON ipo_schedules
+        BEGIN
+            INSERT INTO ipo_merge_queue (schedule_id)
+            SELECT NEW.id
+            WHERE NOT EXISTS (SELECT 1 FROM ipo_merge_queue WHERE schedule_id = NEW.id);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER tr_ipo_schedules_merge_update
+        AFTER UPDATE OF stock_name, status, lead_manager, brokers, offer_price,
+            sub_start, sub_end, listing_date, demand_start, demand_end,
+            refund_date, source
+        ON ipo_schedules
+        BEGIN
+            INSERT INTO ipo_merge_queue (schedule_id)
+            SELECT NEW.id
+            WHERE NOT EXISTS (SELECT 1 FROM ipo_merge_queue WHERE schedule_id = NEW.id);
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER tr_ipo_schedules_merge_delete
+        AFTER DELETE ON ipo_schedules
+        BEGIN
+            DELETE FROM ipo_merge_queue WHERE schedule_id = OLD.id;
+            INSERT INTO ipo_merge_dirty (ipo_id)
+            SELECT OLD.ipo_id
+            WHERE OLD.ipo_id IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM ipo_merge_dirty WHERE ipo_id = OLD.ipo_id);
+        END
+        """
+    )
+
+
+def _migration_007_content_hash(cur):
+    """
+    변경 감지용 내용 해시 + 변경 이력
+    - content_hash: 마지막으로 받은 레코드(IPO_COLUMNS)의 해시 → 같으면 UPSERT가 아무것도 안 함
+    - ipo_changes: 값이 실제로 바뀐 컬럼만 한 줄씩 (트리거가 기록)
+    """
+    cur.execute("ALTER TABLE ipo_schedules ADD COLUMN content_hash INTEGER")
+    cur.execute(
+        """
+        CREATE TABLE ipo_changes (
+            id INTEGER PRIMARY KEY,
+            schedule_id INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            old_value,
+            new_value,
+            changed_at TEXT
+        )
+        """
+    )
+    cur.execute("CREATE INDEX ix_ipo_changes_schedule ON ipo_changes (schedule_id)")
+
+    fields = ", ".join(CHANGE_COLUMNS)
+    # 컬럼마다 (이름, 이전 값, 새 값) 한 행 → 값이 다른 것만 기록
+    diffs = "\n                UNION ALL ".join(
+        f"SELECT '{c}' AS field, OLD.{c} AS old_value, NEW.{c} AS new_value"
+        for c in CHANGE_COLUMNS
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER tr_ipo_schedules_changes
+        AFTER UPDATE OF {fields} ON ipo_schedules
+        BEGIN
+            INSERT INTO ipo_changes (schedule_id, field, old_value, new_value, changed_at)
+            SELECT NEW.id, field, old_value, new_value, datetime('now', 'localtime')
+            FROM (
+                {diffs}
+            )
+            WHERE old_value IS NOT new_value;
+        END
+        """
+    )
+
+    # 기존 행 해시 채우기 (다음 크롤링에서 같은 내용이면 갱신 안 함)
+    cur.execute(f"SELECT id, {', '.join(IPO_COLUMNS)} FROM ipo_schedules")
+    cur.executemany(
+        "UPDATE ipo_schedules SET content_hash = ? WHERE id = ?",
+        [(record_hash(row[1:]), row[0]) for row in cur.fetchall()],
+    )
+
+
+def _migration_008_backfill_state(cur):
+    """카테고리별 과거 데이터 수집 진행 상황 (다음에 받을 페이지, 완료 여부)"""
+    cur.execute(
+        """
+        CREATE TABLE backfill_state (
+            category TEXT PRIMARY KEY,
+            next_page INTEGER NOT NULL,
+            done INTEGER NOT NULL DEFAULT 0,
+            rows INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        )
+        """
+    )
+
+
+def _migration_009_merge_triggers(cur):
+    """합치기 대기열 트리거 다시 만들기 (INSERT OR IGNORE → WHERE NOT EXISTS, UPSERT 중 UNIQUE 오류)"""
+    for name in ("insert", "update", "delete"):
+        cur.execute(f"DROP TRIGGER IF EXISTS tr_ipo_schedules_merge_{name}")
+    _create_merge_triggers(cur)
+
+
+def _migration_010_broker_triggers(cur):
+    """증권사 대기열 트리거 다시 만들기 (INSERT OR IGNORE → WHERE NOT EXISTS, UPSERT 중 UNIQUE 오류)"""
+    for name in ("insert", "update", "delete"):
+        cur.execute(f"DROP TRIGGER IF EXISTS tr_ipo_schedules_brokers_{name}")
+    _create_broker_triggers(cur)
+
+
+def _migration_011_page_marks(cur):
+    """
+    페이지별 '파싱/저장 끝난 본문' 기록 (이전에는 http_cache.db의 parsed_hash)
+    - ipo.db와 같은 파일 → DB를 바꾸거나 다시 만들면 기록도 함께 사라짐
+    """
+    cur.execute(
+        """
+        CREATE TABLE page_marks (
+            url TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        )
         """
-        SELECT id FROM ipo_schedules
-        WHERE stock_name = ?
-        AND status = ?
-        AND IFNULL(sub_start, '') = IFNULL(?, '')
-        AND IFNULL(demand_start, '') = IFNULL(?, '')
-        AND IFNULL(listing_date, '') = IFNULL(?, '')
-        """,
-        (
-            data["stock_name"],
-            data["status"],
-            data["sub_start"],
-            data["demand_start"],
-            data["listing_date"],
-        ),
     )
 
-    exists = cur.fetchone()
-    if exists:
-        return  # 이미 동일 데이터 있음 → INSERT 안 함
 
-    # 중복 없으면 INSERT 수행
+# 순서대로 적용, 적용된 개수는 PRAGMA user_version에 기록 (뒤에만 추가할 것)
+MIGRATIONS = [
+    _migration_001_natural_key,
+    _migration_002_effective_date,
+    _migration_003_brokers,
+    _migration_004_crawl_state,
+    _migration_005_export_state,
+    _migration_006_ipos,
+    _migration_007_content_hash,
+    _migration_008_backfill_state,
+    _migration_009_merge_triggers,
+    _migration_010_broker_triggers,
+    _migration_011_page_marks,
+]
+
+
+def migrate(conn):
+    """아직 적용 안 된 마이그레이션을 하나씩 트랜잭션으로 적용, 적용 후 버전 반환"""
+    cur = conn.cursor()
+    (version,) = cur.execute("PRAGMA user_version").fetchone()
+
+    for number in range(version, len(MIGRATIONS)):
+        try:
+            cur.execute("BEGIN")
+            MIGRATIONS[number](cur)
+            cur.execute(f"PRAGMA user_version = {number + 1}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    return max(version, len(MIGRATIONS))
+
+
+# 자연키가 같아도 값이 바뀔 수 있는 컬럼 (변경 이력 대상)
+CHANGE_COLUMNS = (
+    "lead_manager",
+    "brokers",
+    "offer_price",
+    "sub_end",
+    "demand_end",
+    "refund_date",
+    "source",
+)
+
+
+def record_hash(values):
+    """레코드 값 튜플(IPO_COLUMNS 순서) → 64비트 정수 해시"""
+    digest = hashlib.blake2b(repr(tuple(values)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+# 자연키가 같으면 해시만 비교 → 다를 때만 바뀐 컬럼 갱신 (새 값이 NULL이면 기존 값 유지)
+UPSERT_SQL = f"""
+INSERT INTO ipo_schedules
+(stock_name, status, lead_manager, brokers, offer_price,
+ sub_start, sub_end, listing_date, demand_start, demand_end,
+ refund_date, source, content_hash, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT ({NATURAL_KEY_SQL}) DO UPDATE SET
+    lead_manager = COALESCE(excluded.lead_manager, lead_manager),
+    brokers = COALESCE(excluded.brokers, brokers),
+    offer_price = COALESCE(excluded.offer_price, offer_price),
+    sub_end = COALESCE(excluded.sub_end, sub_end),
+    demand_end = COALESCE(excluded.demand_end, demand_end),
+    refund_date = COALESCE(excluded.refund_date, refund_date),
+    source = COALESCE(excluded.source, source),
+    content_hash = excluded.content_hash
+WHERE excluded.content_hash IS NOT content_hash
+"""
+
+
+def insert_many(records):
+    """
+    여러 건을 한 번에 저장 (자연키 UNIQUE 인덱스 + INSERT ... ON CONFLICT)
+    - 레코드는 IPORecord(또는 IPO_COLUMNS 순서의 튜플) / dict
+    - 같은 자연키가 있으면 내용 해시만 비교, 다르면 바뀐 컬럼만 갱신 (ipo_changes에 이력)
+    - commit은 호출한 쪽 책임 (크롤링 끝에서 한 번)
+    - 반환: {"inserted": n, "updated": n(값이 실제로 바뀐 행), "unchanged": n}
+    """
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if not records:
+        return stats
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # 튜플 레코드는 그대로 + (해시, 시각)만 붙여 바인딩 (중간 목록 없이 generator)
+    params = (
+        (*values, record_hash(values), now)
+        for values in (
+            r if isinstance(r, tuple) else tuple(r[col] for col in IPO_COLUMNS)
+            for r in records
+        )
+    )
+
+    # MAX(id) ~ COUNT 사이에 다른 소스의 INSERT가 끼지 않게
+    with WRITE_LOCK:
+        cur = get_write_conn().cursor()
+
+        cur.execute("SELECT IFNULL(MAX(id), 0) FROM ipo_schedules")
+        (max_id,) = cur.fetchone()
+        cur.execute("SELECT IFNULL(MAX(id), 0) FROM ipo_changes")
+        (max_change_id,) = cur.fetchone()
+
+        cur.executemany(UPSERT_SQL, params)
+
+        cur.execute("SELECT COUNT(*) FROM ipo_schedules WHERE id > ?", (max_id,))
+        (inserted,) = cur.fetchone()
+        # 해시는 달라도 (새 값 NULL 등) 저장된 값이 그대로면 동일로 셈
+        cur.execute(
+            "SELECT COUNT(DISTINCT schedule_id) FROM ipo_changes WHERE id > ?",
+            (max_change_id,),
+        )
+        (updated,) = cur.fetchone()
+
+        # 새로 들어왔거나 brokers가 바뀐 행만 증권사 연결 갱신
+        sync_brokers(cur)
+
+        _note_writes(len(records))
+
+    stats["inserted"] = inserted
+    stats["updated"] = updated
+    stats["unchanged"] = len(records) - inserted - updated
+    return stats
+
+
+def split_brokers(text):
+    """'A증권, B증권,A증권' → ['A증권', 'B증권'] (앞뒤 공백/빈 값/중복 제거)"""
+    if not text:
+        return []
+    names = []
+    for part in text.split(","):
+        part = part.strip()
+        if part and part not in names:
+            names.append(part)
+    return names
+
+
+def sync_brokers(cur):
+    """ipo_broker_sync 대기열에 쌓인 행의 증권사 연결을 다시 만듦"""
     cur.execute(
         """
-        INSERT INTO ipo_schedules
-        (stock_name, status, lead_manager, brokers, offer_price,
-         sub_start, sub_end, listing_date, demand_start, demand_end,
-         refund_date, source)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        SELECT q.ipo_id, s.brokers
+        FROM ipo_broker_sync q
+        JOIN ipo_schedules s ON s.id = q.ipo_id
+        """
+    )
+    pending = cur.fetchall()
+    if not pending:
+        return
+
+    links = []
+    for ipo_id, brokers in pending:
+        for name in split_brokers(brokers):
+            links.append((ipo_id, name))
+
+    cur.executemany(
+        "DELETE FROM ipo_brokers WHERE ipo_id = ?", [(ipo_id,) for ipo_id, _ in pending]
+    )
+    cur.executemany(
+        "INSERT OR IGNORE INTO brokers (name) VALUES (?)",
+        [(name,) for name in {name for _, name in links}],
+    )
+    cur.executemany(
+        """
+        INSERT OR IGNORE INTO ipo_brokers (ipo_id, broker_id)
+        SELECT ?, id FROM brokers WHERE name = ?
         """,
-        (
-            data["stock_name"],
-            data["status"],
-            data["lead_manager"],
-            data["brokers"],
-            data["offer_price"],
-            data["sub_start"],
-            data["sub_end"],
-            data["listing_date"],
-            data["demand_start"],
-            data["demand_end"],
-            data["refund_date"],
-            data["source"],
-        ),
+        links,
     )
+    cur.execute("DELETE FROM ipo_broker_sync")
+
+
+def merge_ipos():
+    """
+    대기열에 쌓인 일정을 회사 단위(ipos)로 합침 (크롤링 끝에서 한 번, commit은 호출한 쪽)
+    - 반환: {"events", "new", "companies"} (crawler.merge.merge_pending)
+    """
+    with WRITE_LOCK:
+        return merge_pending(get_write_conn().cursor())
+
+
+def get_crawl_mark(category):
+    """증분 크롤링 기준 행 조회 (없으면 None)"""
+    with WRITE_LOCK:
+        cur = get_write_conn().cursor()
+        cur.execute("SELECT mark FROM crawl_state WHERE category = ?", (category,))
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def set_crawl_mark(category, mark):
+    """증분 크롤링 기준 행 저장 (commit은 크롤링 끝에서 함께)"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with WRITE_LOCK:
+        get_write_conn().execute(
+            """
+            INSERT INTO crawl_state (category, mark, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(category) DO UPDATE SET
+                mark = excluded.mark,
+                updated_at = excluded.updated_at
+            """,
+            (category, mark, now),
+        )
+
+
+def get_page_marks(prefix):
+    """
+    url이 prefix로 시작하는 페이지의 {url: (content_hash, row_count)}
+    - ipo_schedules가 비어 있으면 빈 dict (DB를 비운 뒤엔 모든 페이지를 다시 저장)
+    """
+    with WRITE_LOCK:
+        cur = get_write_conn().cursor()
+        cur.execute("SELECT EXISTS (SELECT 1 FROM ipo_schedules)")
+        if not cur.fetchone()[0]:
+            return {}
+        cur.execute(
+            "SELECT url, content_hash, row_count FROM page_marks "
+            "WHERE substr(url, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
+        return {url: (content_hash, row_count) for url, content_hash, row_count in cur}
+
+
+def set_page_marks(marks):
+    """(url, content_hash, row_count) 목록 저장 (commit은 크롤링 끝에서 함께)"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with WRITE_LOCK:
+        get_write_conn().executemany(
+            """
+            INSERT INTO page_marks (url, content_hash, row_count, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                row_count = excluded.row_count,
+                updated_at = excluded.updated_at
+            """,
+            [(url, content_hash, row_count, now) for url, content_hash, row_count in marks],
+        )
+
+
+def get_backfill_state(category):
+    """과거 데이터 수집 체크포인트 {"next_page", "done", "rows"} (없으면 None)"""
+    with WRITE_LOCK:
+        cur = get_write_conn().cursor()
+        cur.execute(
+            "SELECT next_page, done, rows FROM backfill_state WHERE category = ?",
+            (category,),
+        )
+        row = cur.fetchone()
+    if row is None:
+        return None
+    return {"next_page": row[0], "done": bool(row[1]), "rows": row[2]}
+
+
+def set_backfill_state(category, next_page, done=False, rows=0):
+    """과거 데이터 수집 체크포인트 저장 (같은 트랜잭션의 행과 함께 commit)"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with WRITE_LOCK:
+        get_write_conn().execute(
+            """
+            INSERT INTO backfill_state (category, next_page, done, rows, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(category) DO UPDATE SET
+                next_page = excluded.next_page,
+                done = excluded.done,
+                rows = excluded.rows,
+                updated_at = excluded.updated_at
+            """,
+            (category, next_page, int(done), rows, now),
+        )
+
+
+def clear_backfill_state(category):
+    """체크포인트 삭제 (처음부터 다시 수집)"""
+    with WRITE_LOCK:
+        get_write_conn().execute(
+            "DELETE FROM backfill_state WHERE category = ?", (category,)
+        )
+
+
+def insert_ipo(data):
+    """한 건 저장 (insert_many 사용)"""
+    return insert_many([data])
+
+
+# 증권사별 예정 일정 조회 컬럼 (ipo_schedules)
+UPCOMING_COLUMNS = """
+    stock_name, status, sub_start, sub_end, demand_start, demand_end, listing_date, source
+"""
+
+# 예정 회사 조회 (ix_ipos_upcoming 범위 검색, tests/test_query_plan.py에서 실행 계획 확인)
+UPCOMING_IPOS_SQL = """
+SELECT stock_name, market, stage, lead_manager,
+       demand_start, demand_end, sub_start, sub_end, listing_date, sources
+FROM ipos
+WHERE latest_date >= ?
+ORDER BY effective_date
+"""
+
+# 증권사별 예정 일정 (이름 → ix_ipo_brokers_broker → 일정 id)
+UPCOMING_BY_BROKER_SQL = f"""
+SELECT {UPCOMING_COLUMNS}
+FROM brokers b
+JOIN ipo_brokers ib ON ib.broker_id = b.id
+JOIN ipo_schedules s ON s.id = ib.ipo_id
+WHERE b.name = ? AND s.latest_date >= ?
+ORDER BY s.effective_date
+"""
+
+
+def get_upcoming_ipos():
+    """
+    오늘 이후 일정이 남은 회사 조회 (회사당 한 행, 진행 중인 청약/수요예측 포함)
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    cur.execute(UPCOMING_IPOS_SQL, (today,))
+    rows = cur.fetchall()
+
+    conn.close()
+    return rows
 
 
 def get_upcoming_by_broker(broker_name: str):
     """
     특정 증권사가 주관하는 '오늘 이후 예정 공모주'만 조회
+    - 증권사 이름이 정확히 같은 것만 (ipo_brokers 인덱스 사용)
     """
     conn = get_connection()
     cur = conn.cursor()
 
     today = datetime.now().strftime("%Y-%m-%d")
 
-    query = """
-    SELECT stock_name, status, sub_start, sub_end, demand_start, demand_end, listing_date, source
-    FROM ipo_schedules
-    WHERE
-        brokers LIKE ? AND (
-            (sub_start IS NOT NULL AND sub_start >= ?) OR
-            (demand_start IS NOT NULL AND demand_start >= ?) OR
-            (listing_date IS NOT NULL AND listing_date >= ?)
-        )
-    ORDER BY
-        CASE
-            WHEN sub_start IS NOT NULL THEN sub_start
-            WHEN demand_start IS NOT NULL THEN demand_start
-            WHEN listing_date IS NOT NULL THEN listing_date
-        END
+    cur.execute(UPCOMING_BY_BROKER_SQL, (broker_name.strip(), today))
+    rows = cur.fetchall()
+
+    conn.close()
+    return rows
+
+
+def get_active_statuses(day=None):
+    """
+    day(기본 오늘)에 진행 중인 일정 종류
+    - '공모청약': 청약 기간 안 / '수요예측': 수요예측 기간 안 / '상장': 상장일
+    - latest_date는 시작일 기준이라 진행 중(시작일 지남) 일정이 빠짐 → 인덱스 없이 조회
     """
+    conn = get_connection()
+    cur = conn.cursor()
 
-    cur.execute(query, (f"%{broker_name}%", today, today, today))
+    day = day or datetime.now().strftime("%Y-%m-%d")
+
+    cur.execute(
+        """
+        SELECT DISTINCT status
+        FROM ipo_schedules
+        WHERE (sub_start <= ? AND IFNULL(sub_end, sub_start) >= ?)
+           OR (demand_start <= ? AND IFNULL(demand_end, demand_start) >= ?)
+           OR listing_date = ?
+        """,
+        (day, day, day, day, day),
+    )
     rows = cur.fetchall()
 
     conn.close()
-    return rows
+    return {status for (status,) in rows}
+
+
+# 증권사 목록에 보여줄 이름 (이 단어가 들어간 것만)
+BROKER_KEYWORDS = ("증권", "투자", "스팩")
+
+
+def get_all_brokers():
+    """공모주에 연결된 증권사 이름 목록 (가나다순)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT name FROM brokers b
+        WHERE EXISTS (SELECT 1 FROM ipo_brokers ib WHERE ib.broker_id = b.id)
+        ORDER BY name
+        """
+    )
+    rows = cur.fetchall()
+    conn.close()
+
+    return [name for (name,) in rows if any(key in name for key in BROKER_KEYWORDS)]
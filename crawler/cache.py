@@ -0,0 +1,229 @@
+# crawler/cache.py
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+
+from .base import resource_path
+from .decode import charset_from_content_type, decode_text
+
+# 🔥 HTTP 응답 캐시 경로 (db/http_cache.db)
+CACHE_PATH = resource_path(os.path.join("db", "http_cache.db"))
+
+DEFAULT_TTL = 300  # 이 시간(초) 안에 받은 페이지는 서버에 다시 묻지 않음
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 본문 합계가 이 크기를 넘으면 LRU 삭제
+
+
+class CachedResponse:
+    """캐시를 거친 응답 (본문 + 본문 해시)"""
+
+    def __init__(self, url, content, charset, content_hash, from_cache):
+        self.url = url
+        self.content = content
+        self.charset = charset  # 헤더에 있던 charset (없으면 None)
+        # 지난 실행에서 저장까지 끝낸 본문인지는 ipo.db의 page_marks와 비교 (base.get_page_marks)
+        self.content_hash = content_hash
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return decode_text(self.content, self.charset)
+
+
+class ResponseCache:
+    """
+    URL별 응답 본문을 SQLite 파일에 저장하는 디스크 캐시
+    - ETag / Last-Modified 저장 → 재검증 시 조건부 GET
+    - TTL 안의 항목은 네트워크 없이 바로 사용
+    - 본문 합계가 max_bytes를 넘으면 오래 안 쓴 항목부터 삭제(LRU)
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or CACHE_PATH
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                body BLOB,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                size INTEGER,
+                fetched_at REAL,
+                accessed_at REAL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_http_cache_accessed "
+            "ON http_cache(accessed_at)"
+        )
+        self.conn.commit()
+
+    # ---------------------- 조회/저장 ----------------------
+
+    def get(self, url):
+        with self._lock:
+            cur = self.conn.execute(
+                """
+                SELECT body, encoding, etag, last_modified, content_hash, fetched_at
+                FROM http_cache WHERE url = ?
+                """,
+                (url,),
+            )
+            row = cur.fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE http_cache SET accessed_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+            self.conn.commit()
+
+        keys = (
+            "body",
+            "encoding",
+            "etag",
+            "last_modified",
+            "content_hash",
+            "fetched_at",
+        )
+        return dict(zip(keys, row))
+
+    def put(self, url, body, encoding, etag=None, last_modified=None):
+        """본문 저장 후 content_hash 반환"""
+        content_hash = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO http_cache
+                (url, body, encoding, etag, last_modified, content_hash,
+                 size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    body = excluded.body,
+                    encoding = excluded.encoding,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    size = excluded.size,
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (url, body, encoding, etag, last_modified, content_hash,
+                 len(body), now, now),
+            )
+            self._evict()
+            self.conn.commit()
+        return content_hash
+
+    def touch(self, url):
+        """304 Not Modified → 받은 시각만 갱신"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            self.conn.commit()
+
+    def _evict(self):
+        """본문 합계가 max_bytes 이하가 될 때까지 LRU 삭제 (lock 안에서 호출)"""
+        (total,) = self.conn.execute(
+            "SELECT IFNULL(SUM(size), 0) FROM http_cache"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        cur = self.conn.execute(
+            "SELECT url, size FROM http_cache ORDER BY accessed_at"
+        )
+        victims = []
+        for url, size in cur:
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            total -= size or 0
+        self.conn.executemany("DELETE FROM http_cache WHERE url = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM http_cache")
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ---------------------- 조건부 GET ----------------------
+
+    def fetch(self, fetcher, url, headers=None):
+        """
+        캐시를 거쳐 url을 가져옴
+        - TTL 안: 캐시 본문 그대로 사용
+        - TTL 지남: If-None-Match / If-Modified-Since로 재검증
+        - 304면 캐시 본문, 200이면 새 본문 저장
+        """
+        entry = self.get(url)
+
+        if entry and self.ttl and time.time() - (entry["fetched_at"] or 0) < self.ttl:
+            return CachedResponse(
+                url, entry["body"], entry["encoding"], entry["content_hash"], True
+            )
+
+        req_headers = dict(headers or {})
+        if entry:
+            if entry["etag"]:
+                req_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                req_headers["If-Modified-Since"] = entry["last_modified"]
+
+        r = fetcher.get(url, headers=req_headers)
+
+        if r.status_code == 304 and entry:
+            self.touch(url)
+            return CachedResponse(
+                url, entry["body"], entry["encoding"], entry["content_hash"], True
+            )
+
+        r.raise_for_status()
+        # r.encoding/r.apparent_encoding은 본문 전체 추측을 돌 수 있어 헤더만 봄
+        charset = charset_from_content_type(r.headers.get("Content-Type"))
+        content_hash = self.put(
+            url,
+            r.content,
+            charset,
+            r.headers.get("ETag"),
+            r.headers.get("Last-Modified"),
+        )
+        return CachedResponse(url, r.content, charset, content_hash, False)
+
+
+# 기본 캐시 (크롤링 전체에서 공유)
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    """공유 기본 캐시 반환 (없으면 생성)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def set_cache(cache):
+    """기본 캐시 교체 (None이면 다음 get_cache()에서 새로 생성)"""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
@@ -0,0 +1,85 @@
+# crawler/decode.py
+import re
+import codecs
+
+# <meta charset="..."> / <meta http-equiv=... content="text/html; charset=...">
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+
+# meta 태그는 문서 앞부분에만 있으므로 이 만큼만 검사
+META_SCAN_BYTES = 4096
+
+# 브라우저처럼 EUC-KR 계열 이름은 상위 집합인 CP949로 디코딩
+# (EUC-KR로 선언하고 똠·햏 같은 CP949 확장 글자를 쓰는 페이지가 많음 → euc_kr 코덱은 표 전체를 놓침)
+_SUPERSET_CODECS = {"euc_kr": "cp949"}
+
+# 파이썬 codecs에 없는 별칭
+_CODEC_ALIASES = {"windows-949": "cp949", "x-windows-949": "cp949"}
+
+
+def _valid_codec(name):
+    """파이썬이 아는 인코딩 이름이면 그대로, 아니면 None"""
+    if not name:
+        return None
+    name = name.strip().strip("\"'")
+    name = _CODEC_ALIASES.get(name.lower(), name)
+    try:
+        codecs.lookup(name)
+    except LookupError:
+        return None
+    return name
+
+
+def superset_codec(name):
+    """EUC-KR 계열(euc-kr, ks_c_5601-1987 등)이면 cp949, 나머지는 그대로"""
+    try:
+        canonical = codecs.lookup(name).name
+    except LookupError:
+        return name
+    return _SUPERSET_CODECS.get(canonical, name)
+
+
+def charset_from_content_type(content_type):
+    """Content-Type 헤더의 charset 값 (없으면 None, ISO-8859-1로 추측하지 않음)"""
+    if not content_type:
+        return None
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.partition("=")
+        if key.strip().lower() == "charset":
+            return _valid_codec(value)
+    return None
+
+
+def charset_from_meta(content):
+    """본문 앞부분의 <meta> 태그에서 charset 추출"""
+    m = _META_CHARSET.search(content[:META_SCAN_BYTES])
+    if not m:
+        return None
+    return _valid_codec(m.group(1).decode("ascii", errors="ignore"))
+
+
+def header_charset(resp):
+    """응답 객체(Response / CachedResponse)의 헤더 charset"""
+    charset = getattr(resp, "charset", None)
+    if charset is None and hasattr(resp, "headers"):
+        charset = charset_from_content_type(resp.headers.get("Content-Type"))
+    return charset
+
+
+def resolve_charset(content, header=None, default="utf-8"):
+    """
+    본문 전체를 검사하는 추측(charset detection) 없이 인코딩 결정
+    - 우선순위: HTTP 헤더 → <meta> → 소스별 기본값
+    - EUC-KR 계열로 선언돼 있으면 cp949 (브라우저와 같음)
+    """
+    return superset_codec(header or charset_from_meta(content) or default)
+
+
+def decode_text(content, header=None, default="utf-8"):
+    return content.decode(resolve_charset(content, header, default), errors="replace")
+
+
+def parse_html(content, charset):
+    """디코딩하지 않은 bytes를 그대로 lxml 파서에 넘김"""
+    from bs4 import BeautifulSoup  # bs4 엔진에서만 필요 → 처음 쓸 때 import
+
+    return BeautifulSoup(content, "lxml", from_encoding=charset)
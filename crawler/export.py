@@ -0,0 +1,407 @@
+# crawler/export.py
+"""
+ipo_schedules 내보내기
+- 커서에서 EXPORT_CHUNK_SIZE건씩 읽어 바로 파일에 씀 → 행 수와 관계없이 메모리 일정
+- 형식: xlsx / csv / jsonl / parquet (parquet은 pyarrow 설치 시에만)
+- 증분 내보내기: 형식별로 마지막에 내보낸 id 이후 새로 들어온 행만
+- progress(done, total) 콜백으로 진행률 전달 (GUI는 메인 스레드 큐로 넘김)
+- stop_checker()가 True면 중간 종료 (파일은 저장하지 않음)
+
+새 형식 추가: Exporter를 상속해 open/write/close 구현 후 EXPORTERS에 등록
+"""
+import os
+import csv
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+
+from .base import (
+    init_db,
+    get_connection,
+    get_write_conn,
+    commit_writes,
+    IPO_COLUMNS,
+    WRITE_LOCK,
+)
+
+EXPORT_CHUNK_SIZE = 1000
+
+# 모든 형식 공통 행 구성 (id 순서 = 저장 순서)
+EXPORT_COLUMNS = ("id",) + IPO_COLUMNS + ("created_at",)
+
+EXPORT_SQL = f"""
+    SELECT {", ".join(EXPORT_COLUMNS)}
+    FROM ipo_schedules
+    WHERE id > ?
+    ORDER BY id
+"""
+
+EXPORT_HEADERS = [
+    "종목명",
+    "상태",
+    "대표주관사",
+    "증권사전체",
+    "공모가",
+    "청약시작일",
+    "청약종료일",
+    "상장일",
+    "수요예측시작",
+    "수요예측종료",
+    "환불일",
+    "출처",
+]
+
+# 엑셀 열 너비 / 공모가 금액 서식
+XLSX_COLUMN_WIDTHS = {"A": 30, "C": 30, "D": 30, "E": 13}
+XLSX_DEFAULT_WIDTH = 15
+XLSX_PRICE_FORMAT = "₩#,##0"
+
+
+def clean_source(source):
+    """출처의 숫자 prefix 제거 (예: '1_공모청약일정' → '공모청약일정')"""
+    return source.split("_", 1)[-1] if source else ""
+
+
+def iter_chunks(conn, sql=EXPORT_SQL, params=(0,), chunk_size=EXPORT_CHUNK_SIZE):
+    """커서에서 chunk_size건씩 꺼내 list로 yield"""
+    cur = conn.execute(sql, params)
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+# ---------------------- 증분 기준 ----------------------
+
+
+def get_export_mark(conn, name):
+    """name 형식으로 마지막에 내보낸 id (없으면 0)"""
+    row = conn.execute(
+        "SELECT last_id FROM export_state WHERE name = ?", (name,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def set_export_mark(name, last_id, last_created_at):
+    """
+    name 형식의 기준 저장 후 commit
+    - 크롤링 중이면 쓰기 커넥션에 열린 트랜잭션이 있으므로 조회용 커넥션이 아니라
+      같은 쓰기 커넥션으로 (WRITE_LOCK) → 'database is locked' 대기 없음
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with WRITE_LOCK:
+        get_write_conn().execute(
+            """
+            INSERT INTO export_state (name, last_id, last_created_at, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                last_id = excluded.last_id,
+                last_created_at = excluded.last_created_at,
+                updated_at = excluded.updated_at
+            """,
+            (name, last_id, last_created_at, now),
+        )
+        commit_writes()
+
+
+# ---------------------- 형식별 Exporter ----------------------
+
+
+class Exporter:
+    """
+    내보내기 형식 기본 클래스
+    - open() → write(rows) 반복 → close() 순서로 호출 (rows: EXPORT_COLUMNS 순서 튜플 list)
+    - 실패/중지 시 close() 대신 abort()
+    """
+
+    name = None
+    extension = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def open(self):
+        raise NotImplementedError
+
+    def write(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    def abort(self):
+        pass
+
+
+class CsvExporter(Exporter):
+    """CSV (엑셀에서 한글이 깨지지 않게 BOM 포함 UTF-8)"""
+
+    name = "csv"
+    extension = ".csv"
+
+    def open(self):
+        self.file = open(self.path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+    def abort(self):
+        self.file.close()
+
+
+class JsonlExporter(Exporter):
+    """JSON Lines (한 줄에 한 행)"""
+
+    name = "jsonl"
+    extension = ".jsonl"
+
+    def open(self):
+        self.file = open(self.path, "w", encoding="utf-8")
+
+    def write(self, rows):
+        self.file.writelines(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+    def abort(self):
+        self.file.close()
+
+
+class ParquetExporter(Exporter):
+    """Parquet (pyarrow 필요, 청크마다 row group 하나)"""
+
+    name = "parquet"
+    extension = ".parquet"
+
+    def open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "parquet 내보내기에는 pyarrow가 필요합니다 (pip install pyarrow)"
+            ) from None
+
+        types = {"id": pa.int64(), "offer_price": pa.float64()}
+        self.pa = pa
+        self.schema = pa.schema(
+            [(col, types.get(col, pa.string())) for col in EXPORT_COLUMNS]
+        )
+        self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self.writer.write_table(
+            self.pa.Table.from_arrays(
+                [
+                    self.pa.array(values, type=field.type)
+                    for values, field in zip(columns, self.schema)
+                ],
+                schema=self.schema,
+            )
+        )
+
+    def close(self):
+        self.writer.close()
+
+    def abort(self):
+        self.writer.close()
+
+
+class XlsxExporter(Exporter):
+    """
+    엑셀 (openpyxl write-only 워크북)
+    - 스타일은 셀 생성 시점에 지정 (저장 후 전체 셀을 다시 돌지 않음)
+    """
+
+    name = "xlsx"
+    extension = ".xlsx"
+
+    def open(self):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        self.cell = WriteOnlyCell
+        self.wb = Workbook(write_only=True)
+        ws = self.ws = self.wb.create_sheet("IPO Data")
+
+        # write-only 시트는 행 추가 전에 열 너비/필터 지정
+        for idx in range(1, len(EXPORT_HEADERS) + 1):
+            letter = get_column_letter(idx)
+            ws.column_dimensions[letter].width = XLSX_COLUMN_WIDTHS.get(
+                letter, XLSX_DEFAULT_WIDTH
+            )
+        ws.auto_filter.ref = f"A1:{get_column_letter(len(EXPORT_HEADERS))}1"
+
+        # 헤더 스타일
+        header_fill = PatternFill(
+            start_color="4F81BD", end_color="4F81BD", fill_type="solid"
+        )
+        header_font = Font(bold=True, color="FFFFFF")
+        header_align = Alignment(horizontal="center", vertical="center")
+
+        header = []
+        for title in EXPORT_HEADERS:
+            cell = WriteOnlyCell(ws, value=title)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_align
+            header.append(cell)
+        ws.append(header)
+
+    def write(self, rows):
+        for row in rows:
+            price = row[5]
+            if isinstance(price, (int, float)):
+                price = self.cell(self.ws, value=price)
+                price.number_format = XLSX_PRICE_FORMAT
+
+            self.ws.append(
+                [
+                    row[1],  # 종목명
+                    row[2],  # 상태
+                    row[3],  # 대표주관사
+                    row[4],  # 증권사전체
+                    price,  # 공모가
+                    row[6],  # 청약시작
+                    row[7],  # 청약종료
+                    row[8],  # 상장일
+                    row[9],  # 수요예측시작
+                    row[10],  # 수요예측종료
+                    row[11],  # 환불일
+                    clean_source(row[12]),  # 🔥 숫자 prefix 제거된 출처
+                ]
+            )
+
+    def close(self):
+        self.wb.save(self.path)
+
+    def abort(self):
+        # 저장 없이 시트 스트림만 정리
+        self.ws.close()
+
+
+EXPORTERS = {
+    cls.name: cls
+    for cls in (XlsxExporter, CsvExporter, JsonlExporter, ParquetExporter)
+}
+
+
+# ---------------------- 실행 ----------------------
+
+
+def export(
+    fmt,
+    path,
+    incremental=False,
+    progress=None,
+    stop_checker=None,
+    chunk_size=EXPORT_CHUNK_SIZE,
+    name=None,
+    log_func=None,
+):
+    """
+    fmt 형식으로 path에 저장
+    - incremental: 같은 name(기본 fmt)으로 지난번 내보낸 이후 새로 들어온 행만
+      (기존 행이 갱신된 것은 포함 안 됨, id 기준)
+    - 저장에 성공하면 name의 기준 id를 마지막 행으로 갱신
+      (다른 프로세스가 DB를 잠가 기준을 못 남겨도 파일은 저장된 것 → log_func로 알리고 계속)
+    - 반환: 저장한 행 수 (대상 행이 없으면 0, 중지하면 None)
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(EXPORTERS)})")
+    name = name or fmt
+
+    conn = get_connection()
+    try:
+        since = get_export_mark(conn, name) if incremental else 0
+        (total,) = conn.execute(
+            "SELECT COUNT(*) FROM ipo_schedules WHERE id > ?", (since,)
+        ).fetchone()
+        if not total:
+            return 0
+
+        # 같은 폴더 임시 파일에 쓰고 교체 → 중간 실패해도 기존 파일 유지
+        tmp_path = path + ".tmp"
+        exporter = EXPORTERS[fmt](tmp_path)
+        done = 0
+        last_id, last_created_at = since, None
+        exporter.open()
+        saved = False
+        try:
+            for rows in iter_chunks(conn, params=(since,), chunk_size=chunk_size):
+                if stop_checker and stop_checker():
+                    return None
+                exporter.write(rows)
+
+                done += len(rows)
+                last_id, last_created_at = rows[-1][0], rows[-1][-1]
+                if progress:
+                    progress(done, total)
+
+            exporter.close()
+            os.replace(tmp_path, path)
+            saved = True
+        finally:
+            if not saved:
+                exporter.abort()
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        try:
+            set_export_mark(name, last_id, last_created_at)
+        except sqlite3.OperationalError as e:
+            if log_func:
+                log_func(f"⚠ 증분 기준 저장 실패 (다음 증분 내보내기에 다시 포함): {e}")
+        return done
+    finally:
+        conn.close()
+
+
+def export_xlsx(
+    path, progress=None, stop_checker=None, chunk_size=EXPORT_CHUNK_SIZE, log_func=None
+):
+    """전체 데이터를 엑셀로 저장 (GUI '엑셀로 내보내기')"""
+    return export(
+        "xlsx",
+        path,
+        progress=progress,
+        stop_checker=stop_checker,
+        chunk_size=chunk_size,
+        log_func=log_func,
+    )
+
+
+if __name__ == "__main__":
+    # 사용법: python -m crawler.export csv out.csv [--incremental]
+    parser = argparse.ArgumentParser(description="ipo_schedules 내보내기")
+    parser.add_argument("format", choices=list(EXPORTERS))
+    parser.add_argument("path")
+    parser.add_argument("--incremental", action="store_true", help="지난번 이후 새 행만")
+    parser.add_argument("--name", help="증분 기준 이름 (기본: 형식 이름)")
+    args = parser.parse_args()
+
+    init_db()  # export_state 테이블 마이그레이션
+    count = export(
+        args.format,
+        args.path,
+        incremental=args.incremental,
+        name=args.name,
+        log_func=lambda msg: print(msg, file=sys.stderr, flush=True),
+    )
+    print(f"{count}건 저장: {args.path}" if count else "내보낼 행이 없습니다.")
+    sys.exit(0)
@@ -0,0 +1,96 @@
+# crawler/extract.py
+import sys
+
+from lxml import etree
+
+from .decode import parse_html, resolve_charset
+
+# 사용할 수 있는 표 추출 엔진
+# - "lxml": BeautifulSoup 트리 없이 lxml XPath로 표만 바로 뽑음 (기본)
+# - "bs4" : 기존 BeautifulSoup 방식 (비교/대체용)
+ENGINES = ("lxml", "bs4")
+
+HEADER_ROWS = 2  # 38커뮤니케이션 표의 헤더 줄 수
+
+_find_table = etree.XPath("(//table[@summary=$summary])[1]")
+
+# bs4 get_text()는 script/style/template 안 문자열을 빼므로 미리 제거
+_NON_TEXT_TAGS = ("script", "style", "template")
+
+
+def cell_text(td):
+    """bs4의 td.get_text(strip=True)와 같은 결과 (주석은 itertext에서 제외됨)"""
+    return "".join(s.strip() for s in td.itertext())
+
+
+def table_rows_lxml(content, charset, summary, skip=HEADER_ROWS):
+    """
+    summary 속성이 일치하는 첫 표의 행을 셀 문자열 튜플로 반환
+    - 표가 없으면 None
+    """
+    parser = etree.HTMLParser(encoding=charset)
+    root = etree.fromstring(content, parser)
+    if root is None:
+        return None
+
+    tables = _find_table(root, summary=summary)
+    if not tables:
+        return None
+
+    table = tables[0]
+    etree.strip_elements(table, *_NON_TEXT_TAGS, with_tail=False)
+
+    rows = list(table.iter("tr"))[skip:]
+    return [tuple(cell_text(td) for td in tr.iter("td")) for tr in rows]
+
+
+def table_rows_bs4(content, charset, summary, skip=HEADER_ROWS):
+    """기존 BeautifulSoup 방식으로 같은 튜플 목록 생성"""
+    soup = parse_html(content, charset)
+    table = soup.find("table", {"summary": summary})
+    if not table:
+        return None
+
+    rows = table.find_all("tr")[skip:]
+    return [tuple(td.get_text(strip=True) for td in tr.find_all("td")) for tr in rows]
+
+
+def extract_table(content, charset, summary, engine="lxml"):
+    if engine == "lxml":
+        return table_rows_lxml(content, charset, summary)
+    if engine == "bs4":
+        return table_rows_bs4(content, charset, summary)
+    raise ValueError(f"알 수 없는 추출 엔진: {engine}")
+
+
+def compare_engines(content, charset, summary):
+    """두 엔진 결과가 다른 행 목록 [(행 번호, lxml 결과, bs4 결과)] 반환"""
+    fast = table_rows_lxml(content, charset, summary)
+    slow = table_rows_bs4(content, charset, summary)
+    if fast is None or slow is None:
+        return [] if fast == slow else [(None, fast, slow)]
+
+    diffs = []
+    for i in range(max(len(fast), len(slow))):
+        a = fast[i] if i < len(fast) else None
+        b = slow[i] if i < len(slow) else None
+        if a != b:
+            diffs.append((i, a, b))
+    return diffs
+
+
+if __name__ == "__main__":
+    # 저장해둔 HTML 파일로 두 엔진 결과 비교
+    # 사용법: python -m crawler.extract <summary> <file.html> [...]
+    summary, paths = sys.argv[1], sys.argv[2:]
+    failed = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+        charset = resolve_charset(content, None, "euc-kr")
+        diffs = compare_engines(content, charset, summary)
+        print(f"{'OK  ' if not diffs else 'DIFF'} {path}")
+        for i, a, b in diffs[:5]:
+            print(f"    행 {i}: lxml={a} bs4={b}")
+        failed += bool(diffs)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,216 @@
+# crawler/fetcher.py
+import time
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+
+# 재시도할 HTTP 상태 코드 (일시적인 서버 오류)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+# ---------------------- 연결 수 집계용 커넥션 풀 ----------------------
+
+
+def _counting_pool(pool_cls, on_new_conn):
+    """새 TCP 연결을 만들 때마다 on_new_conn()을 호출하는 풀 클래스 생성"""
+
+    class CountingPool(pool_cls):
+        def _new_conn(self):
+            on_new_conn()
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    def __init__(self, on_new_conn, **kwargs):
+        self._on_new_conn = on_new_conn
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self._on_new_conn),
+            "https": _counting_pool(HTTPSConnectionPool, self._on_new_conn),
+        }
+
+
+# ---------------------- 요청 속도 제한 ----------------------
+
+
+class RateLimiter:
+    """
+    토큰 버킷: 평균 초당 rate건, 순간적으로는 burst건까지 바로 허용
+    (스레드 간 공유, 토큰이 모자라면 음수로 예약하고 그만큼 대기)
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+# ---------------------- 공용 HTTP 페처 ----------------------
+
+
+class HttpFetcher:
+    """
+    keep-alive 세션을 공유하는 HTTP 페처
+    - 호스트별 커넥션 풀 크기 설정
+    - GET 실패(타임아웃/연결오류/5xx/429) 시 지터를 준 지수 백오프로 재시도
+    - timeout: 요청 1건당 전체 시간 예산(초, 재시도 포함)
+    - 재사용 연결 / 재시도 / 전송 바이트 수 집계
+    - rate_limit: 초당 최대 요청 수 (재시도 포함, None이면 제한 없음)
+    """
+
+    def __init__(
+        self,
+        headers=None,
+        timeout=10,
+        max_retries=3,
+        backoff_base=0.5,
+        backoff_max=8.0,
+        pool_connections=4,
+        pool_maxsize=8,
+        session=None,
+        rate_limit=None,
+    ):
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "new_connections": 0,
+            "retries": 0,
+            "bytes": 0,
+        }
+
+        if session is None:
+            session = requests.Session()
+            adapter = _CountingAdapter(
+                self._count_new_conn,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def _count_new_conn(self):
+        self._add("new_connections")
+
+    def _add(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def snapshot(self):
+        """현재 집계값 (reused_connections 포함) 반환"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["reused_connections"] = max(
+            stats["requests"] - stats["new_connections"], 0
+        )
+        return stats
+
+    def _backoff(self, attempt):
+        """attempt번째 재시도 전 대기 시간 (full jitter)"""
+        cap = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, cap)
+
+    def get(self, url, headers=None, timeout=None):
+        """
+        GET 요청 (재시도 포함), 성공한 Response 반환
+        - 재시도를 다 써도 실패하면 마지막 예외를 그대로 올림
+        """
+        budget = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + budget
+        req_headers = dict(self.headers)
+        if headers:
+            req_headers.update(headers)
+
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout(f"요청 시간 예산({budget}초) 초과: {url}")
+
+            if self.limiter:
+                self.limiter.wait()
+
+            self._add("requests")
+            try:
+                r = self.session.get(url, headers=req_headers, timeout=remaining)
+                if r.status_code in RETRY_STATUS:
+                    r.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                self._add("retries")
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            self._add("bytes", len(r.content))
+            return r
+
+    def close(self):
+        self.session.close()
+
+
+# 기본 페처 (크롤링 전체에서 공유)
+_default_fetcher = None
+_default_lock = threading.Lock()
+_injected = False  # set_fetcher()로 주입됐는지 (run_sources가 소스별 페처 대신 사용)
+
+
+def get_fetcher():
+    """공유 기본 페처 반환 (없으면 생성)"""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = HttpFetcher()
+        return _default_fetcher
+
+
+def set_fetcher(fetcher):
+    """
+    기본 페처 교체 (테스트에서 로컬 스텁 서버용 페처 주입 등)
+    - None이 아니면 run_sources(GUI / CLI / 스케줄러)도 소스별 페처 대신 이 페처 사용
+    """
+    global _default_fetcher, _injected
+    with _default_lock:
+        _default_fetcher = fetcher
+        _injected = fetcher is not None
+
+
+def injected_fetcher():
+    """set_fetcher()로 주입한 페처 (없으면 None)"""
+    with _default_lock:
+        return _default_fetcher if _injected else None
@@ -1,12 +1,41 @@
 # crawler/ipo38.py
 
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-from .base import insert_ipo, get_write_conn
+import os
+import re
+import threading
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from .base import (
+    IPORecord,
+    intern_text,
+    insert_many,
+    commit_writes,
+    get_crawl_mark,
+    set_crawl_mark,
+    get_page_marks,
+    set_page_marks,
+    resource_path,
+)
+from .fetcher import get_fetcher
+from .cache import get_cache
+from .archive import get_archive
+from .decode import header_charset, resolve_charset, parse_html
+from .extract import extract_table
+from .metrics import CrawlMetrics
+from .sources import Source, register_source
 
 HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
 
+# 헤더/<meta>에 charset이 없을 때 쓰는 38커뮤니케이션 기본 인코딩
+SOURCE_ENCODING = "euc-kr"
+
+# 표 추출 엔진 ("lxml": XPath로 표만 추출 / "bs4": 기존 BeautifulSoup 트리)
+EXTRACT_ENGINE = "lxml"
+
 URLS = {
     "bidding": {
         "base": "http://www.38.co.kr/html/fund/index.htm?o=k&page=",
@@ -22,6 +51,13 @@ URLS = {
     },
 }
 
+# 레코드 source 컬럼 값 (소스 태그)
+SOURCE_TAGS = {
+    "bidding": "공모청약일정",
+    "bookbuilding": "수요예측일정",
+    "listing": "신규상장종목",
+}
+
 # 카테고리별 최대 페이지 (핵심 데이터만 크롤링)
 MAX_PAGES = {
     "bidding": 5,  # 공모청약일정: 최근 5페이지
@@ -29,25 +65,197 @@ MAX_PAGES = {
     "listing": 3,  # 신규상장종목: 최근 3페이지
 }
 
+# 동시 요청 설정
+MAX_WORKERS = 6  # 전체 스레드 풀 크기
+PER_HOST_LIMIT = 3  # 같은 호스트로 동시에 보내는 최대 요청 수
+PREFETCH_PAGES = 2  # 카테고리별로 미리 받아둘 페이지 수
+
+# 증분 크롤링: 이미 저장된 행(지난 실행의 최신 행 또는 전부 동일한 페이지)에
+# 닿으면 다음 페이지를 요청하지 않음 (False면 매번 MAX_PAGES까지 전체 재수집)
+INCREMENTAL = True
+
+# 크롤링마다 남기는 지표 JSON (None이면 저장 안 함)
+METRICS_PATH = resource_path(os.path.join("db", "crawl_metrics.json"))
+
+# 프로파일링 기본값: None / "cpu"(cProfile) / "memory"(tracemalloc) / "all"
+PROFILE = None
+
+_last_metrics = None
 
-def crawl_38_all(log_func=None, stop_checker=None):
+# 디스크 응답 캐시 사용 여부 (지난 실행과 본문이 같은 페이지는 파싱/저장 생략)
+USE_CACHE = True
+
+# 받은 페이지 원본 보관 여부 (crawler.archive, 오프라인 다시 파싱용)
+USE_ARCHIVE = True
+
+
+def crawl_38_all(
+    log_func=None,
+    stop_checker=None,
+    max_workers=None,
+    fetcher=None,
+    cache=None,
+    incremental=None,
+    metrics=None,
+    profile=None,
+    categories=None,
+    archive=None,
+):
     """
     38커뮤니케이션 전체 크롤링
     - 카테고리별 페이지 제한 적용
+    - 세 카테고리의 페이지를 스레드 풀에서 동시에 받음
+    - 파싱/INSERT는 호출 스레드에서만 순서대로 처리
     - 오늘 이후 일정만 DB 저장
     - stop_checker()가 True면 중간 종료
+    - fetcher: HttpFetcher 주입 (없으면 공유 기본 페처)
+    - cache: ResponseCache 주입 (없으면 공유 기본 캐시, False면 캐시 안 씀)
+    - incremental: 증분 모드 (None이면 INCREMENTAL, False면 전체 재수집)
+    - metrics: CrawlMetrics 주입 (없으면 새로 만들고 last_metrics()로 조회)
+    - profile: "cpu" / "memory" / "all" (None이면 PROFILE)
+    - categories: 수집할 카테고리 키 목록 (None이면 전체)
+    - archive: PageArchive 주입 (없으면 공유 기본 보관소, False면 보관 안 함)
     """
-    total = 0
+    global _last_metrics
+    metrics = metrics if metrics is not None else CrawlMetrics()
+    profile = PROFILE if profile is None else profile
 
-    total += crawl_category("bidding", log_func, stop_checker)
-    total += crawl_category("bookbuilding", log_func, stop_checker)
-    total += crawl_category("listing", log_func, stop_checker)
-
-    # 🔥 모든 INSERT 끝나고 마지막에 commit 1번만
-    conn = get_write_conn()
-    conn.commit()
+    metrics.start()
+    try:
+        with metrics.profiling(
+            cprofile=profile in ("cpu", "all"),
+            memory=profile in ("memory", "all"),
+        ):
+            return _crawl_38_all(
+                log_func,
+                stop_checker,
+                max_workers,
+                fetcher,
+                cache,
+                incremental,
+                metrics,
+                categories,
+                archive,
+            )
+    finally:
+        metrics.finish()
+        _last_metrics = metrics
+        if METRICS_PATH:
+            try:
+                metrics.save_json(METRICS_PATH)
+            except OSError as e:
+                if log_func:
+                    log_func(f"  └ 지표 저장 실패: {e}")
+
+
+def last_metrics():
+    """마지막 crawl_38_all 실행의 CrawlMetrics (없으면 None)"""
+    return _last_metrics
+
+
+def _crawl_38_all(
+    log_func,
+    stop_checker,
+    max_workers,
+    fetcher,
+    cache,
+    incremental,
+    metrics,
+    categories,
+    archive,
+):
+    total = 0
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    fetcher = fetcher or get_fetcher()
+    cache = _resolve_cache(cache)
+    archive = resolve_archive(archive)
+    before = fetcher.snapshot()
+    keys = [
+        key
+        for key in ("bidding", "bookbuilding", "listing")
+        if categories is None or key in categories
+    ]
+
+    if incremental is None:
+        incremental = INCREMENTAL
+
+    with ThreadPoolExecutor(max_workers=max_workers or MAX_WORKERS) as executor:
+        # 모든 카테고리의 첫 페이지들을 먼저 요청해두고 순서대로 소비
+        streams = {
+            key: PageStream(
+                executor,
+                key,
+                fetcher=fetcher,
+                cache=cache,
+                archive=archive,
+                incremental=incremental,
+                stop_mark=get_crawl_mark(key) if incremental else None,
+            )
+            for key in keys
+        }
+        try:
+            for key in keys:
+                total += crawl_category(
+                    key,
+                    log_func,
+                    stop_checker,
+                    stream=streams[key],
+                    stats=stats,
+                    incremental=incremental,
+                    metrics=metrics,
+                )
+        finally:
+            for stream in streams.values():
+                stream.close()
+
+    # "파싱 완료" 기록은 크롤링이 끝까지 간 경우에만, 남은 INSERT와 같은 commit으로
+    # → 중간 실패 시 다음 실행에서 다시 파싱
+    for stream in streams.values():
+        stream.mark_parsed()
+
+    # 🔥 중간 commit(WRITE_BATCH_SIZE) 후 남은 INSERT 마지막에 commit
+    with metrics.timer("db_commit_ms"):
+        commit_writes()
+
+    unchanged_pages = fetched_pages = skipped_pages = discarded_pages = 0
+    for stream in streams.values():
+        unchanged_pages += stream.unchanged_pages
+        fetched_pages += stream.pages_fetched
+        skipped_pages += stream.pages_skipped
+        discarded_pages += stream.pages_discarded
+
+    after = fetcher.snapshot()
+    metrics.inc("rows_inserted", stats["inserted"])
+    metrics.inc("rows_updated", stats["updated"])
+    metrics.inc("rows_unchanged", stats["unchanged"])
+    metrics.inc("pages_skipped", skipped_pages)
+    metrics.inc("pages_discarded", discarded_pages)
+    for name in ("requests", "retries", "reused_connections", "bytes"):
+        metrics.inc(f"http_{name}", after[name] - before[name])
 
     if log_func:
+        log_func(
+            f"  └ 신규 {stats['inserted']}건 / 변경 {stats['updated']}건"
+            f" / 동일 {stats['unchanged']}건"
+        )
+        log_func(
+            f"  └ 페이지 처리 {fetched_pages}개 / 요청 안 함 {skipped_pages}개"
+            f" / 미리 받고 버림 {discarded_pages}개"
+        )
+        if unchanged_pages:
+            log_func(f"  └ 변경 없는 페이지 {unchanged_pages}개 건너뜀")
+        reused = after["reused_connections"] - before["reused_connections"]
+        retries = after["retries"] - before["retries"]
+        kbytes = (after["bytes"] - before["bytes"]) / 1024
+        log_func(
+            f"  └ 연결 재사용 {reused}회 / 재시도 {retries}회 / 수신 {kbytes:.1f}KB"
+        )
+        log_func(
+            f"  └ 시간(ms): 요청 {metrics.total('fetch_ms'):.0f}"
+            f" / 표 추출 {metrics.total('extract_ms'):.0f}"
+            f" / 정규화 {metrics.total('normalize_ms'):.0f}"
+            f" / DB {metrics.total('db_insert_ms') + metrics.total('db_commit_ms'):.0f}"
+        )
         log_func(f"✅ 38커뮤니케이션 전체 {total}건 저장 완료")
 
     return total
@@ -56,14 +264,56 @@ def crawl_38_all(log_func=None, stop_checker=None):
 # ---------------------- 공통 유틸 ----------------------
 
 
-def get_html(url):
-    r = requests.get(url, headers=HEADERS, timeout=10)
+def _resolve_cache(cache):
+    """cache 인자 해석: None → 기본 캐시(USE_CACHE일 때), False → 사용 안 함"""
+    if cache is None:
+        return get_cache() if USE_CACHE else None
+    return cache or None
+
+
+def resolve_archive(archive):
+    """archive 인자 해석: None → 기본 보관소(USE_ARCHIVE일 때), False → 보관 안 함"""
+    if archive is None:
+        return get_archive() if USE_ARCHIVE else None
+    return archive or None
+
+
+def get_page(url, fetcher=None, cache=None):
+    """
+    페이지 응답 반환 (.text / .content 사용 가능)
+    - cache가 있으면 조건부 GET + 디스크 캐시를 거침
+    """
+    fetcher = fetcher or get_fetcher()
+    if cache:
+        return cache.fetch(fetcher, url, headers=HEADERS)
+
+    r = fetcher.get(url, headers=HEADERS)
     r.raise_for_status()
-    return BeautifulSoup(r.text, "lxml")
+    return r
+
+
+def page_soup(resp):
+    """
+    응답 bytes를 디코딩 없이 바로 lxml로 파싱
+    - 인코딩은 헤더 → <meta> → SOURCE_ENCODING 순으로 결정 (본문 추측 안 함)
+    - (soup, charset, decode_ms, parse_ms) 반환
+    """
+    content = resp.content
 
+    t0 = time.perf_counter()
+    charset = resolve_charset(content, header_charset(resp), SOURCE_ENCODING)
+    t1 = time.perf_counter()
+    soup = parse_html(content, charset)
+    t2 = time.perf_counter()
 
-def get_rows(url, summary):
-    soup = get_html(url)
+    return soup, charset, (t1 - t0) * 1000, (t2 - t1) * 1000
+
+
+def get_html(url, fetcher=None, cache=None):
+    return page_soup(get_page(url, fetcher, cache))[0]
+
+
+def _table_rows(soup, summary):
     table = soup.find("table", {"summary": summary})
     if not table:
         return None, 0
@@ -72,48 +322,398 @@ def get_rows(url, summary):
     return rows, len(rows)
 
 
+def get_rows(url, summary, fetcher=None, cache=None):
+    return _table_rows(get_html(url, fetcher, cache), summary)
+
+
+# ---------------------- 동시 페이지 요청 ----------------------
+
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _host_semaphore(url):
+    """호스트별 동시 요청 수 제한용 세마포어"""
+    host = urlparse(url).netloc
+    with _host_semaphores_lock:
+        sem = _host_semaphores.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(PER_HOST_LIMIT)
+            _host_semaphores[host] = sem
+    return sem
+
+
+def fetch_rows(
+    url,
+    summary,
+    fetcher=None,
+    cache=None,
+    engine=None,
+    archive=None,
+    category=None,
+    page=None,
+    extract=True,
+    keep_past=False,
+    marks=None,
+):
+    """
+    워커 스레드에서 실행: 호스트 제한을 지키며 페이지를 받아 행 추출
+    - 행은 셀 문자열 튜플 목록 (engine: EXTRACT_ENGINE 참고)
+    - 지난 실행에서 이미 처리한 본문과 같으면 파싱하지 않고 unchanged=True
+      (marks: base.get_page_marks()의 {url: (content_hash, row_count)}, 캐시를 거친 응답만)
+    - archive가 있으면 네트워크에서 받은 본문을 보관 (캐시에서 꺼낸 것은 제외,
+      keep_past: 지난 일정까지 저장하는 페이지인지 함께 기록)
+    - extract=False면 추출하지 않고 본문(content)과 헤더 charset만 (파싱은 프로세스 풀에서)
+    """
+    with _host_semaphore(url):
+        t0 = time.perf_counter()
+        resp = get_page(url, fetcher, cache)
+        fetch_ms = (time.perf_counter() - t0) * 1000
+
+    if archive and not getattr(resp, "from_cache", False):
+        archive.store(
+            url, resp.content, header_charset(resp), category, page, keep_past
+        )
+
+    content_hash = getattr(resp, "content_hash", None)
+    mark = marks.get(url) if marks and content_hash else None
+    result = {
+        "url": url,
+        "rows": None,
+        "row_count": 0,
+        "content_hash": content_hash,
+        "unchanged": bool(mark) and mark[0] == content_hash,
+        "charset": None,
+        "fetch_ms": fetch_ms,
+        "bytes": len(resp.content),
+        "decode_ms": 0.0,
+        "parse_ms": 0.0,
+    }
+    if result["unchanged"]:
+        result["row_count"] = mark[1]
+        return result
+
+    if not extract:
+        result["content"] = resp.content
+        result["charset"] = header_charset(resp)
+        return result
+
+    content = resp.content
+    t0 = time.perf_counter()
+    charset = resolve_charset(content, header_charset(resp), SOURCE_ENCODING)
+    t1 = time.perf_counter()
+    rows = extract_table(content, charset, summary, engine or EXTRACT_ENGINE)
+    t2 = time.perf_counter()
+
+    result["rows"] = rows
+    result["row_count"] = len(rows) if rows else 0
+    result["charset"] = charset
+    result["decode_ms"] = (t1 - t0) * 1000
+    result["parse_ms"] = (t2 - t1) * 1000
+    return result
+
+
+class PageStream:
+    """
+    한 카테고리의 페이지를 미리 요청해두고 페이지 순서대로 돌려주는 스트림
+    - 한 페이지를 꺼낼 때마다 다음 페이지를 더 요청 (요청 중 prefetch개 유지)
+    - 증분 크롤링(incremental + 지난 실행 기준 행 stop_mark)이면 1페이지만 먼저 요청하고,
+      받은 페이지를 보고 나서 다음 요청 → 그 페이지에서 끝나면(빈 페이지 / 기준 행 도달) 안 보냄
+      (전체 수집은 결과를 기다리기 전에 요청 → 동시 요청 수 유지)
+    - close() 하면 아직 시작 안 한 요청은 취소
+    - start_page / max_page: 받을 페이지 범위 (기본 1 ~ MAX_PAGES)
+    - extract=False: 본문만 받음 (crawler.pipeline에서 프로세스 풀로 파싱)
+    - keep_past: 보관소에 '지난 일정까지 저장한 페이지'로 기록 (과거 데이터 수집)
+    """
+
+    def __init__(
+        self,
+        executor,
+        key,
+        prefetch=None,
+        fetcher=None,
+        cache=None,
+        start_page=1,
+        max_page=None,
+        archive=None,
+        extract=True,
+        keep_past=False,
+        incremental=False,
+        stop_mark=None,
+    ):
+        self.executor = executor
+        self.extract = extract
+        self.keep_past = keep_past
+        self.key = key
+        self.fetcher = fetcher
+        self.cache = cache
+        self.archive = archive
+        self.base = URLS[key]["base"]
+        self.summary = URLS[key]["summary"]
+        self.max_page = max_page or MAX_PAGES.get(key, 3)
+        self.start_page = start_page
+        self.next_page = start_page
+        self.prefetch = prefetch or PREFETCH_PAGES
+        self.pending = deque()
+        self.closed = False
+        self.parsed = []  # 처리 끝난 페이지 (url, content_hash, row_count)
+        self.unchanged_pages = 0  # 본문이 지난번과 같아 파싱을 건너뛴 페이지 수
+        self.pages_fetched = 0  # 받아서 처리한 페이지 수 (미리 받고 버린 것 제외)
+        self.pages_requested = 0  # 실제로 요청한 페이지 수 (시작 전 취소한 것 제외)
+        self.incremental = incremental
+        self.stop_mark = stop_mark
+        # 지난 실행에서 저장까지 끝낸 본문 (ipo.db page_marks, 캐시를 쓸 때만 비교 가능)
+        self.marks = get_page_marks(self.base) if cache else {}
+
+        self._fill(1 if self._waits_first() else self.prefetch)
+
+    def _submit_next(self):
+        if self.closed or self.next_page > self.max_page:
+            return
+        page = self.next_page
+        url = self.base + str(page)
+        future = self.executor.submit(
+            fetch_rows,
+            url,
+            self.summary,
+            self.fetcher,
+            self.cache,
+            archive=self.archive,
+            category=self.key,
+            page=page,
+            extract=self.extract,
+            keep_past=self.keep_past,
+            marks=self.marks,
+        )
+        self.pending.append((page, future))
+        self.pages_requested += 1
+        self.next_page += 1
+
+    def _fill(self, limit=None):
+        while len(self.pending) < (limit or self.prefetch) and not self.closed:
+            if self.next_page > self.max_page:
+                return
+            self._submit_next()
+
+    def next(self):
+        """다음 페이지의 (page, fetch_rows 결과) 반환, 없으면 None"""
+        if not self.pending:
+            return None
+        page, future = self.pending.popleft()
+        wait_first = self._waits_first()
+        if not wait_first:
+            self._fill()
+        result = future.result()
+        self.pages_fetched += 1
+        if wait_first and not self._ends_at(result):
+            self._fill()
+        return page, result
+
+    def _waits_first(self):
+        """받은 페이지를 보고 나서 다음 페이지를 요청할지 (증분 크롤링 + 기준 행 있음)"""
+        return bool(self.incremental and self.stop_mark)
+
+    def _ends_at(self, result):
+        """이 페이지에서 크롤링이 끝나는지 (crawl_category의 종료 조건과 같게)"""
+        if not self.extract:
+            return False  # 본문만 받는 경우 (파싱 쪽에서 판단)
+        if result["unchanged"]:
+            return self.incremental or not result["row_count"]
+        if not result["row_count"]:
+            return True
+        return bool(self.stop_mark) and any(
+            row_mark(tr) == self.stop_mark for tr in result["rows"]
+        )
+
+    @property
+    def pages_skipped(self):
+        """최대 페이지 중 요청하지 않은 페이지 수"""
+        return self.max_page - self.start_page + 1 - self.pages_requested
+
+    @property
+    def pages_discarded(self):
+        """미리 요청했지만 처리하지 않고 버린 페이지 수 (조기 종료 비용)"""
+        return self.pages_requested - self.pages_fetched
+
+    def done(self, result):
+        """페이지 처리 완료 기록 (끝에서 mark_parsed()로 page_marks에 반영)"""
+        if result["content_hash"]:
+            self.parsed.append(
+                (result["url"], result["content_hash"], result["row_count"])
+            )
+
+    def mark_parsed(self):
+        """처리 끝난 페이지를 page_marks에 기록 (commit은 호출한 쪽에서 행과 함께)"""
+        if self.parsed:
+            set_page_marks(self.parsed)
+        self.parsed = []
+
+    def close(self):
+        self.closed = True
+        while self.pending:
+            _, future = self.pending.popleft()
+            if future.cancel():
+                self.pages_requested -= 1  # 시작 전 취소 → 요청 안 함
+
+
 # ---------------------- 카테고리 반복 ----------------------
 
 
-def crawl_category(key, log_func=None, stop_checker=None):
-    base = URLS[key]["base"]
+def crawl_category(
+    key,
+    log_func=None,
+    stop_checker=None,
+    stream=None,
+    fetcher=None,
+    cache=False,
+    stats=None,
+    incremental=None,
+    metrics=None,
+):
+    """
+    한 카테고리 크롤링
+    - stream(PageStream)을 넘기면 공유 스레드 풀에서 미리 받은 페이지 사용
+    - 없으면 이 카테고리 전용 풀을 만들어 사용
+    - commit은 호출한 쪽 책임이라 단독 호출 시 기본으로 캐시를 쓰지 않음
+    - stats(dict)를 넘기면 신규/변경/동일 건수를 누적
+    - incremental: 이미 아는 행에 닿으면 중단 (None이면 INCREMENTAL)
+    - metrics(CrawlMetrics)를 넘기면 페이지/행 단위 지표 기록
+    """
+    if incremental is None:
+        incremental = INCREMENTAL
+    if metrics is None:
+        metrics = CrawlMetrics()
+    if stream is None:
+        with ThreadPoolExecutor(max_workers=PER_HOST_LIMIT) as executor:
+            stream = PageStream(
+                executor,
+                key,
+                fetcher=fetcher,
+                cache=_resolve_cache(cache),
+                incremental=incremental,
+                stop_mark=get_crawl_mark(key) if incremental else None,
+            )
+            try:
+                return crawl_category(
+                    key,
+                    log_func,
+                    stop_checker,
+                    stream,
+                    stats=stats,
+                    incremental=incremental,
+                    metrics=metrics,
+                )
+            finally:
+                stream.close()
+
     summary = URLS[key]["summary"]
     max_page = MAX_PAGES.get(key, 3)
 
     if log_func:
         log_func(f"▶ {summary} 전체 크롤링 시작... (최대 {max_page} 페이지)")
 
-    page = 1
     count_total = 0
+    # 지난 실행 때 1페이지 첫 행 (이 행이 보이면 그 뒤는 이미 아는 구간)
+    mark = get_crawl_mark(key) if incremental else None
+    new_mark = None
+    finished = False
 
-    while page <= max_page:
+    while True:
         # 중지 요청이면 바로 종료
         if stop_checker and stop_checker():
             if log_func:
                 log_func("⛔ 사용자 요청으로 크롤링 중단")
             break
 
-        url = base + str(page)
+        try:
+            result = stream.next()
+        except Exception:
+            stream.close()
+            raise
+        if result is None:
+            finished = True
+            break
+
+        page, result = result
+        metrics.inc("pages")
+        metrics.inc("bytes", result["bytes"])
+        metrics.observe("fetch_ms", result["fetch_ms"])
+        if not result["unchanged"]:
+            metrics.observe("extract_ms", result["decode_ms"] + result["parse_ms"])
         if log_func:
-            log_func(f"  ▶ 페이지 {page} 크롤링...")
+            if result["charset"]:
+                log_func(
+                    f"  ▶ 페이지 {page} 크롤링... "
+                    f"({result['charset']}, 인코딩 판별 {result['decode_ms']:.1f}ms"
+                    f" / 파싱 {result['parse_ms']:.1f}ms)"
+                )
+            else:
+                log_func(f"  ▶ 페이지 {page} 크롤링...")
+
+        if result["unchanged"]:
+            # 지난 실행과 본문이 같음 → 파싱/저장 생략
+            if result["row_count"] == 0:
+                finished = True
+                break
+            stream.unchanged_pages += 1
+            metrics.inc("pages_unchanged")
+            if log_func:
+                log_func("    └ 변경 없음, 건너뜀")
+            if incremental:
+                finished = True
+                break
+            continue
 
-        rows, row_count = get_rows(url, summary)
+        rows = result["rows"]
+        if rows is None or result["row_count"] == 0:
+            # 더 이상 데이터 없으면 남은 요청 취소 후 종료
+            stream.done(result)
+            finished = True
+            break
 
-        if rows is None or row_count == 0:
-            # 더 이상 데이터 없으면 종료
+        marks = [row_mark(tr) for tr in rows]
+        if page == 1:
+            new_mark = marks[0]
+
+        page_stats = {}
+        t0 = time.perf_counter()
+        records = RECORD_BUILDERS[key](rows)
+        t1 = time.perf_counter()
+        count_total += _save_page(records, page_stats)
+        t2 = time.perf_counter()
+
+        normalize_ms = (t1 - t0) * 1000
+        extract_ms = result["decode_ms"] + result["parse_ms"]
+        metrics.observe("normalize_ms", normalize_ms)
+        metrics.observe("db_insert_ms", (t2 - t1) * 1000)
+        metrics.observe("parse_ms_per_row", (extract_ms + normalize_ms) / len(rows))
+        metrics.inc("rows_seen", len(rows))
+        metrics.inc("rows_saved", len(records))
+
+        stream.done(result)
+        if stats is not None:
+            for k, v in page_stats.items():
+                stats[k] = stats.get(k, 0) + v
+
+        if incremental and _reached_known(mark, marks, page_stats):
+            if log_func:
+                log_func("    └ 이미 저장된 구간 도달, 다음 페이지 생략")
+            finished = True
             break
 
-        if key == "bidding":
-            count_total += parse_bidding(rows)
-        elif key == "bookbuilding":
-            count_total += parse_bookbuilding(rows)
-        else:
-            count_total += parse_listing(rows)
+    stream.close()
 
-        page += 1
+    # 끝까지(또는 아는 구간까지) 다 본 경우에만 기준 행 갱신 → 중단 시 빈 구간 방지
+    if finished and new_mark:
+        set_crawl_mark(key, new_mark)
 
     if log_func:
         log_func(f"  └ {summary} {count_total}건 저장")
+        log_func(
+            f"  └ 페이지 처리 {stream.pages_fetched}개"
+            f" / 요청 안 함 {stream.pages_skipped}개"
+            f" / 미리 받고 버림 {stream.pages_discarded}개"
+        )
 
     return count_total
 
@@ -121,158 +721,244 @@ def crawl_category(key, log_func=None, stop_checker=None):
 # ---------------------- 파싱 함수 ----------------------
 
 
-def parse_bidding(rows):
-    """공모주 청약일정"""
-    count = 0
-    today = datetime.now().strftime("%Y-%m-%d")
+def _save_page(records, stats=None):
+    """한 페이지 분량을 insert_many로 한 번에 저장, 저장 대상 건수 반환"""
+    result = insert_many(records)
+    if stats is not None:
+        for k, v in result.items():
+            stats[k] = stats.get(k, 0) + v
+    return len(records)
 
-    for tr in rows:
-        tds = tr.find_all("td")
-        if len(tds) < 6:
-            continue
 
-        cols = [td.get_text(strip=True) for td in tds]
-
-        stock = cols[0]
-        date_range = cols[1]
-        offer = cols[2]
-        broker = cols[5]
-
-        start, end = parse_range(date_range)
-
-        # ✅ 오늘 이후 일정만 저장 (청약 종료일 기준)
-        if end:
-            if end < today:
-                continue
-        elif start:
-            if start < today:
-                continue
-
-        insert_ipo(
-            {
-                "stock_name": stock,
-                "status": "공모청약",
-                "lead_manager": broker,
-                "brokers": broker,
-                "offer_price": to_float(offer),
-                "sub_start": start,
-                "sub_end": end,
-                "listing_date": None,
-                "demand_start": None,
-                "demand_end": None,
-                "refund_date": None,
-                "source": "공모청약일정",
-            }
-        )
-        count += 1
-    return count
+def row_mark(tr):
+    """행 식별값 (종목명 + 날짜 칸), 증분 크롤링 기준 행 비교용"""
+    cols = row_cells(tr)
+    return "|".join(cols[:2])
 
 
-def parse_bookbuilding(rows):
-    """수요예측일정"""
-    count = 0
-    today = datetime.now().strftime("%Y-%m-%d")
+def _reached_known(mark, marks, page_stats):
+    """
+    이미 아는 구간인지
+    - 지난 실행의 기준 행이 이 페이지에 있거나
+    - 저장 대상 행이 모두 DB와 같음(신규/변경 0건)
+    """
+    if mark and mark in marks:
+        return True
+    saved = sum(page_stats.values())
+    return saved > 0 and page_stats.get("unchanged", 0) == saved
 
-    for tr in rows:
-        tds = tr.find_all("td")
-        if len(tds) < 5:
-            continue
 
-        cols = [td.get_text(strip=True) for td in tds]
-
-        stock = cols[0]
-        date_range = cols[1]
-        offer = cols[3] if len(cols) > 3 else None
-        broker = cols[5] if len(cols) > 5 else ""
-
-        start, end = parse_range(date_range)
-
-        # ✅ 오늘 이후 일정만 저장 (수요예측 종료일 기준)
-        if end:
-            if end < today:
-                continue
-        elif start:
-            if start < today:
-                continue
-
-        insert_ipo(
-            {
-                "stock_name": stock,
-                "status": "수요예측",
-                "lead_manager": broker,
-                "brokers": broker,
-                "offer_price": to_float(offer),
-                "sub_start": None,
-                "sub_end": None,
-                "listing_date": None,
-                "demand_start": start,
-                "demand_end": end,
-                "refund_date": None,
-                "source": "수요예측일정",
-            }
+def row_cells(tr):
+    """행 → 셀 문자열 목록 (추출 엔진 튜플 / BeautifulSoup tr 모두 허용)"""
+    if isinstance(tr, (tuple, list)):
+        return tr
+    return [td.get_text(strip=True) for td in tr.find_all("td")]
+
+
+def bidding_records(rows, keep_past=False):
+    """공모주 청약일정 행 → 저장할 IPORecord 목록 (keep_past: 지난 일정도 포함, 과거 데이터 수집용)"""
+    today = _today()
+    status, source = intern_text("공모청약"), intern_text(SOURCE_TAGS["bidding"])
+    rows = [cols for cols in map(row_cells, rows) if len(cols) >= 6]
+
+    # ✅ 오늘 이후 일정만 저장 (청약 종료일 기준)
+    kept = []
+    for cols, (start, end) in zip(rows, parse_ranges([cols[1] for cols in rows])):
+        if not keep_past and (end or start or today) < today:
+            continue
+        kept.append((cols, start, end))
+
+    offers = to_floats([cols[2] for cols, _, _ in kept])
+    records = []
+    for (cols, start, end), offer in zip(kept, offers):
+        broker = intern_text(cols[5])
+        records.append(
+            IPORecord(
+                stock_name=cols[0],
+                status=status,
+                lead_manager=broker,
+                brokers=broker,
+                offer_price=offer,
+                sub_start=start,
+                sub_end=end,
+                source=source,
+            )
         )
-        count += 1
-    return count
+    return records
 
 
-def parse_listing(rows):
-    """신규상장종목"""
-    count = 0
-    today = datetime.now().strftime("%Y-%m-%d")
+def bookbuilding_records(rows, keep_past=False):
+    """수요예측일정 행 → 저장할 IPORecord 목록 (keep_past: 지난 일정도 포함, 과거 데이터 수집용)"""
+    today = _today()
+    status, source = intern_text("수요예측"), intern_text(SOURCE_TAGS["bookbuilding"])
+    rows = [cols for cols in map(row_cells, rows) if len(cols) >= 5]
 
-    for tr in rows:
-        tds = tr.find_all("td")
-        if len(tds) < 2:
+    # ✅ 오늘 이후 일정만 저장 (수요예측 종료일 기준)
+    kept = []
+    for cols, (start, end) in zip(rows, parse_ranges([cols[1] for cols in rows])):
+        if not keep_past and (end or start or today) < today:
             continue
+        kept.append((cols, start, end))
+
+    offers = to_floats([cols[3] for cols, _, _ in kept])
+    records = []
+    for (cols, start, end), offer in zip(kept, offers):
+        broker = intern_text(cols[5]) if len(cols) > 5 else ""
+        records.append(
+            IPORecord(
+                stock_name=cols[0],
+                status=status,
+                lead_manager=broker,
+                brokers=broker,
+                offer_price=offer,
+                demand_start=start,
+                demand_end=end,
+                source=source,
+            )
+        )
+    return records
 
-        cols = [td.get_text(strip=True) for td in tds]
-        stock = cols[0]
-        listing_raw = cols[1]
 
-        offer = cols[4] if len(cols) >= 5 else None
-        listing_date = normalize_date(listing_raw)
+def listing_records(rows, keep_past=False):
+    """신규상장종목 행 → 저장할 IPORecord 목록 (keep_past: 지난 일정도 포함, 과거 데이터 수집용)"""
+    today = _today()
+    status, source = intern_text("상장"), intern_text(SOURCE_TAGS["listing"])
+    rows = [cols for cols in map(row_cells, rows) if len(cols) >= 2]
 
-        # ✅ 오늘 이후 상장 예정만 저장
-        if listing_date and listing_date < today:
+    # ✅ 오늘 이후 상장 예정만 저장
+    kept = []
+    for cols, listing_date in zip(rows, normalize_dates([cols[1] for cols in rows])):
+        if not keep_past and listing_date and listing_date < today:
             continue
+        kept.append((cols, listing_date))
+
+    offers = to_floats([cols[4] if len(cols) >= 5 else None for cols, _ in kept])
+    return [
+        IPORecord(
+            stock_name=cols[0],
+            status=status,
+            offer_price=offer,
+            listing_date=listing_date,
+            source=source,
+        )
+        for (cols, listing_date), offer in zip(kept, offers)
+    ]
+
+
+def parse_bidding(rows, stats=None):
+    """공모주 청약일정"""
+    return _save_page(bidding_records(rows), stats)
+
+
+def parse_bookbuilding(rows, stats=None):
+    """수요예측일정"""
+    return _save_page(bookbuilding_records(rows), stats)
+
+
+def parse_listing(rows, stats=None):
+    """신규상장종목"""
+    return _save_page(listing_records(rows), stats)
+
+
+RECORD_BUILDERS = {
+    "bidding": bidding_records,
+    "bookbuilding": bookbuilding_records,
+    "listing": listing_records,
+}
+
 
-        insert_ipo(
-            {
-                "stock_name": stock,
-                "status": "상장",
-                "lead_manager": None,
-                "brokers": None,
-                "offer_price": to_float(offer),
-                "sub_start": None,
-                "sub_end": None,
-                "listing_date": listing_date,
-                "demand_start": None,
-                "demand_end": None,
-                "refund_date": None,
-                "source": "신규상장종목",
-            }
+# ---------------------- 소스 플러그인 ----------------------
+
+
+class Ipo38Source(Source):
+    """38커뮤니케이션 (crawl_38_all 동시 요청/증분/캐시 파이프라인 사용)"""
+
+    name = "38"
+    label = "38커뮤니케이션"
+    categories = tuple(URLS)
+    max_pages = MAX_PAGES
+    headers = HEADERS
+    encoding = SOURCE_ENCODING
+    rate_limit = 10.0  # 호스트 동시 요청 제한(PER_HOST_LIMIT)과 별도로 초당 상한
+
+    def page_url(self, key, page):
+        return URLS[key]["base"] + str(page)
+
+    def extract(self, key, content, charset):
+        return extract_table(content, charset, URLS[key]["summary"], EXTRACT_ENGINE)
+
+    def records(self, key, rows):
+        return RECORD_BUILDERS[key](rows)
+
+    def source_tag(self, key):
+        return SOURCE_TAGS[key]
+
+    def crawl(
+        self,
+        log_func=None,
+        stop_checker=None,
+        fetcher=None,
+        metrics=None,
+        categories=None,
+        incremental=None,
+        cache=None,
+    ):
+        return crawl_38_all(
+            log_func,
+            stop_checker,
+            fetcher=fetcher,
+            cache=cache,
+            incremental=incremental,
+            metrics=metrics,
+            categories=categories,
         )
 
-        count += 1
-    return count
+
+register_source(Ipo38Source())
 
 
 # ---------------------- 날짜/숫자 유틸 ----------------------
+# 과거 데이터 수집 때 행마다 호출되므로
+# - 같은 문자열(날짜는 페이지마다 반복됨)은 결과를 기억해 두고
+# - 흔한 형식(2024.01.05 / 15,000원)은 미리 컴파일한 정규식 / translate로 처리
+# - 그 밖의 입력은 원래 방식(strptime / isdigit) 그대로 → 결과가 항상 같음
 
+DATE_CACHE_SIZE = 8192
 
-def normalize_date(text):
-    if not text:
-        return None
+_DATE_RE = re.compile(r"(\d{4})\.(\d{1,2})\.(\d{1,2})", re.ASCII)
+_PRICE_DROP = str.maketrans("", "", ",원")
+
+
+def _today():
+    """오늘 날짜 'YYYY-MM-DD'"""
+    return date.today().isoformat()
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _normalize_date(text):
+    stripped = text.strip()
+    m = _DATE_RE.fullmatch(stripped)
+    if m and m.group(1) >= "1000":
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3))).isoformat()
+        except ValueError:
+            return None
     try:
-        dt = datetime.strptime(text.strip(), "%Y.%m.%d")
+        dt = datetime.strptime(stripped, "%Y.%m.%d")
         return dt.strftime("%Y-%m-%d")
     except Exception:
         return None
 
 
-def parse_range(text):
+def normalize_date(text):
+    """'2024.01.05' → '2024-01-05' (형식이 다르거나 없는 날짜면 None)"""
     if not text:
-        return None, None
+        return None
+    return _normalize_date(text)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_range(text):
     text = text.replace(" ", "")
 
     if "~" not in text:
@@ -287,8 +973,34 @@ def parse_range(text):
     return normalize_date(start_raw), normalize_date(end_raw)
 
 
+def parse_range(text):
+    """'2024.01.05~01.08' → ('2024-01-05', '2024-01-08') (끝 날짜에 연도가 없으면 시작 연도)"""
+    if not text:
+        return None, None
+    return _parse_range(text)
+
+
 def to_float(v):
+    """'15,000원' → 15000.0 (숫자가 아니면 None)"""
     if not v:
         return None
-    v = v.replace(",", "").replace("원", "").strip()
+    v = v.translate(_PRICE_DROP).strip()
     return float(v) if v.isdigit() else None
+
+
+# ---------------------- 열 단위 정규화 ----------------------
+
+
+def normalize_dates(values):
+    """날짜 문자열 열 → normalize_date 결과 목록"""
+    return [_normalize_date(v) if v else None for v in values]
+
+
+def parse_ranges(values):
+    """기간 문자열 열 → parse_range 결과 (start, end) 목록"""
+    return [_parse_range(v) if v else (None, None) for v in values]
+
+
+def to_floats(values):
+    """가격 문자열 열 → to_float 결과 목록"""
+    return [to_float(v) for v in values]
@@ -0,0 +1,268 @@
+# crawler/merge.py
+"""
+같은 회사의 일정(수요예측/청약/상장, 여러 소스)을 회사 한 행으로 합치기
+- canonical_name: 공백·시장 표시((유가)/(코스닥) 등)·회사 형태((주) 등)를 뺀 비교용 이름
+- consolidate: 한 회사의 일정 행 목록 → ipos 한 행
+- merge_pending: ipo_merge_queue에 쌓인 일정만 한 번에 처리 (canonical → ipo id 메모리 색인)
+"""
+import re
+from datetime import datetime
+
+# 괄호 안 시장 표시 → 시장 이름
+MARKETS = {
+    "유가": "유가증권",
+    "유가증권": "유가증권",
+    "코스피": "유가증권",
+    "kospi": "유가증권",
+    "코스닥": "코스닥",
+    "kosdaq": "코스닥",
+    "코넥스": "코넥스",
+    "konex": "코넥스",
+}
+
+# 이름에서 뺄 회사 형태 표기
+CORP_FORMS = ("주식회사", "(주)", "㈜")
+
+_PAREN = re.compile(r"\s*[(\[（]\s*([^)\]）]*?)\s*[)\]）]\s*")
+_SPACE = re.compile(r"\s+")
+
+# 항목별로 어느 일정 값을 우선할지 (앞일수록 우선)
+FIELD_PRIORITY = {
+    "stock_name": ("공모청약", "수요예측", "상장"),
+    "lead_manager": ("공모청약", "수요예측", "상장"),
+    "brokers": ("공모청약", "수요예측", "상장"),
+    "offer_price": ("공모청약", "상장", "수요예측"),  # 청약/상장 공모가 = 확정 공모가
+    "refund_date": ("공모청약", "수요예측", "상장"),
+}
+
+# 진행 단계 (뒤일수록 나중 단계)
+STAGES = ("수요예측", "공모청약", "상장")
+
+# 일정 종류 → 그 일정이 채우는 날짜 컬럼과 대표 날짜
+STATUS_DATES = {
+    "수요예측": (("demand_start", "demand_end"), "demand_start"),
+    "공모청약": (("sub_start", "sub_end"), "sub_start"),
+    "상장": (("listing_date",), "listing_date"),
+}
+
+IPOS_COLUMNS = (
+    "stock_name",
+    "market",
+    "stage",
+    "lead_manager",
+    "brokers",
+    "offer_price",
+    "demand_start",
+    "demand_end",
+    "sub_start",
+    "sub_end",
+    "refund_date",
+    "listing_date",
+    "sources",
+    "event_count",
+)
+
+# 대기열을 한 번에 읽는 일정 수
+MERGE_CHUNK_SIZE = 2000
+
+# 합치기에 쓰는 일정 컬럼 (ipo_schedules)
+EVENT_COLUMNS = (
+    "id",
+    "stock_name",
+    "status",
+    "lead_manager",
+    "brokers",
+    "offer_price",
+    "sub_start",
+    "sub_end",
+    "listing_date",
+    "demand_start",
+    "demand_end",
+    "refund_date",
+    "source",
+)
+
+
+def _strip_markers(name):
+    """(시장 표시/회사 형태를 뺀 이름, 시장)"""
+    market = None
+
+    def drop(match):
+        nonlocal market
+        inner = match.group(1).strip().lower()
+        if inner in MARKETS:
+            market = market or MARKETS[inner]
+            return " "
+        if inner in ("주",):
+            return " "
+        return match.group(0)
+
+    text = _PAREN.sub(drop, name)
+    for form in CORP_FORMS:
+        text = text.replace(form, " ")
+    return _SPACE.sub(" ", text).strip(), market
+
+
+def display_name(name):
+    """화면 표시용 이름 (시장 표시/회사 형태 제거, 공백 정리)"""
+    return _strip_markers(name or "")[0]
+
+
+def market_of(name):
+    """이름의 시장 표시 → 시장 이름 (없으면 None)"""
+    return _strip_markers(name or "")[1]
+
+
+def canonical_name(name):
+    """회사 비교용 이름: 표시용 이름에서 공백까지 모두 빼고 소문자로"""
+    return _SPACE.sub("", display_name(name)).lower()
+
+
+def consolidate(events):
+    """
+    한 회사의 일정 dict 목록 (EVENT_COLUMNS) → ipos 한 행 dict (IPOS_COLUMNS)
+    - 같은 종류 일정이 여러 개면 날짜가 가장 늦은 것 사용
+    - 항목별로 FIELD_PRIORITY 순서의 첫 번째 비어있지 않은 값
+    """
+    latest = {}
+    for event in events:
+        status = event["status"]
+        if status not in STATUS_DATES:
+            continue
+        key = STATUS_DATES[status][1]
+        current = latest.get(status)
+        if current is None or (event[key] or "") >= (current[key] or ""):
+            latest[status] = event
+
+    record = dict.fromkeys(IPOS_COLUMNS)
+    for field, order in FIELD_PRIORITY.items():
+        for status in order:
+            event = latest.get(status)
+            if event is not None and event[field] not in (None, ""):
+                record[field] = event[field]
+                break
+
+    for status, (columns, _) in STATUS_DATES.items():
+        event = latest.get(status)
+        if event is not None:
+            for column in columns:
+                record[column] = event[column]
+
+    record["stock_name"] = display_name(record["stock_name"] or events[0]["stock_name"])
+    record["market"] = next(
+        (m for m in (market_of(e["stock_name"]) for e in events) if m), None
+    )
+    record["stage"] = next((s for s in reversed(STAGES) if s in latest), None)
+    record["sources"] = ",".join(sorted({e["source"] for e in events if e["source"]}))
+    record["event_count"] = len(events)
+    return record
+
+
+def merge_pending(cur, chunk_size=None):
+    """
+    ipo_merge_queue(새로 들어오거나 바뀐 일정) / ipo_merge_dirty(일정이 지워진 회사)를 비우며
+    해당 회사의 ipos 행만 다시 계산
+    - 대기열은 chunk_size(기본 MERGE_CHUNK_SIZE)건씩 처리 (과거 데이터 수집 뒤에도 메모리 일정)
+    - 반환: {"events": 처리한 일정 수, "new": 새 회사 수, "companies": 다시 계산한 회사 수}
+    """
+    chunk_size = chunk_size or MERGE_CHUNK_SIZE
+    stats = {"events": 0, "new": 0, "companies": 0}
+
+    cur.execute("SELECT ipo_id FROM ipo_merge_dirty")
+    affected = {ipo_id for (ipo_id,) in cur.fetchall()}
+    cur.execute("SELECT 1 FROM ipo_merge_queue LIMIT 1")
+    if cur.fetchone() is None and not affected:
+        return stats
+
+    # 회사 색인: 한 번만 읽어서 메모리에서 찾음
+    cur.execute("SELECT canonical_name, id FROM ipos")
+    index = dict(cur.fetchall())
+
+    last_id = 0
+    while True:
+        done, last_id = _merge_chunk(cur, index, affected, stats, last_id, chunk_size)
+        affected = set()
+        if done:
+            break
+
+    cur.execute("DELETE FROM ipo_merge_queue")
+    cur.execute("DELETE FROM ipo_merge_dirty")
+    cur.execute("DELETE FROM merge_affected")
+    return stats
+
+
+def _merge_chunk(cur, index, affected, stats, last_id, chunk_size):
+    """대기열에서 last_id 다음 chunk_size건 처리 → (대기열 끝인지, 마지막 일정 id)"""
+    columns = ", ".join(f"s.{c}" for c in EVENT_COLUMNS)
+    cur.execute(
+        f"""
+        SELECT {columns}, s.ipo_id
+        FROM ipo_merge_queue q
+        JOIN ipo_schedules s ON s.id = q.schedule_id
+        WHERE q.schedule_id > ?
+        ORDER BY q.schedule_id
+        LIMIT ?
+        """,
+        (last_id, chunk_size),
+    )
+    pending = cur.fetchall()
+    stats["events"] += len(pending)
+    done = len(pending) < chunk_size
+    if pending:
+        last_id = pending[-1][0]
+
+    assign = []
+    for row in pending:
+        schedule_id, stock_name, old_ipo_id = row[0], row[1], row[-1]
+        key = canonical_name(stock_name)
+        ipo_id = index.get(key)
+        if ipo_id is None:
+            cur.execute(
+                "INSERT INTO ipos (canonical_name, stock_name) VALUES (?, ?)",
+                (key, display_name(stock_name)),
+            )
+            ipo_id = index[key] = cur.lastrowid
+            stats["new"] += 1
+        if old_ipo_id is not None and old_ipo_id != ipo_id:
+            affected.add(old_ipo_id)  # 이전 회사에서 빠진 일정
+        affected.add(ipo_id)
+        if old_ipo_id != ipo_id:
+            assign.append((ipo_id, schedule_id))
+
+    cur.executemany("UPDATE ipo_schedules SET ipo_id = ? WHERE id = ?", assign)
+
+    # 영향받은 회사의 일정 전체를 한 번에 읽어 회사별로 모음
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS merge_affected (ipo_id INTEGER PRIMARY KEY)")
+    cur.execute("DELETE FROM merge_affected")
+    cur.executemany(
+        "INSERT INTO merge_affected (ipo_id) VALUES (?)", [(i,) for i in affected]
+    )
+    cur.execute(
+        f"""
+        SELECT {columns}, s.ipo_id
+        FROM merge_affected a
+        JOIN ipo_schedules s ON s.ipo_id = a.ipo_id
+        """
+    )
+    grouped = {ipo_id: [] for ipo_id in affected}
+    for row in cur.fetchall():
+        grouped[row[-1]].append(dict(zip(EVENT_COLUMNS, row)))
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    updates = []
+    removed = []
+    for ipo_id, events in grouped.items():
+        if not events:
+            removed.append((ipo_id,))
+            continue
+        record = consolidate(events)
+        updates.append(tuple(record[c] for c in IPOS_COLUMNS) + (now, ipo_id))
+
+    assignments = ", ".join(f"{c} = ?" for c in IPOS_COLUMNS)
+    cur.executemany(
+        f"UPDATE ipos SET {assignments}, updated_at = ? WHERE id = ?", updates
+    )
+    cur.executemany("DELETE FROM ipos WHERE id = ?", removed)
+
+    stats["companies"] += len(updates)
+    return done, last_id
@@ -0,0 +1,163 @@
+# crawler/metrics.py
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# 지연 시간 히스토그램 구간 (ms, 이하)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """값 분포 (구간별 개수 + 백분위수)"""
+
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸 = 최대 구간 초과
+        self.values = []
+
+    def observe(self, value):
+        self.values.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def _percentile(self, ordered, p):
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self):
+        ordered = sorted(self.values)
+        total = sum(ordered)
+        labels = [f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": len(ordered),
+            "sum": total,
+            "min": ordered[0] if ordered else None,
+            "max": ordered[-1] if ordered else None,
+            "mean": total / len(ordered) if ordered else None,
+            "p50": self._percentile(ordered, 50),
+            "p90": self._percentile(ordered, 90),
+            "p99": self._percentile(ordered, 99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class CrawlMetrics:
+    """
+    크롤링 1회의 단계별 지표
+    - counters: 페이지/바이트/행(신규·변경·동일) 수
+    - histograms: fetch / 표 추출 / 행 정규화 / DB INSERT / commit 시간(ms), 행당 파싱 시간
+    - profile: cProfile / tracemalloc 결과 (켠 경우만)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.profile = {}
+        self.started_at = None
+        self.finished_at = None
+        self.wall_ms = None
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, name):
+        """with 블록 시간을 name 히스토그램(ms)에 기록"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - t0) * 1000)
+
+    def total(self, name):
+        """히스토그램 값 합계 (없으면 0)"""
+        with self._lock:
+            hist = self.histograms.get(name)
+            return sum(hist.values) if hist else 0.0
+
+    def start(self):
+        self.started_at = datetime.now()
+        self._t0 = time.perf_counter()
+
+    def finish(self):
+        self.finished_at = datetime.now()
+        self.wall_ms = (time.perf_counter() - self._t0) * 1000
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds")
+                if self.started_at
+                else None,
+                "finished_at": self.finished_at.isoformat(timespec="seconds")
+                if self.finished_at
+                else None,
+                "wall_ms": self.wall_ms,
+                "counters": dict(self.counters),
+                "histograms": {k: h.to_dict() for k, h in self.histograms.items()},
+                "profile": dict(self.profile),
+            }
+
+    def save_json(self, path):
+        """JSON 보고서 저장 (히스토그램 원본 값은 제외)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    # ---------------------- 프로파일링 (선택) ----------------------
+
+    @contextmanager
+    def profiling(self, cprofile=False, memory=False, top=25, prof_path=None):
+        """
+        크롤링 전체를 감싸는 선택적 프로파일러
+        - cprofile: 누적 시간 상위 top개 함수 (prof_path가 있으면 .prof 파일도 저장)
+        - memory: tracemalloc 최대 사용량 + 할당 위치 상위 top개
+        """
+        profiler = cProfile.Profile() if cprofile else None
+        started_tracemalloc = memory and not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                buf = io.StringIO()
+                pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(top)
+                self.profile["cprofile"] = buf.getvalue()
+                if prof_path:
+                    profiler.dump_stats(prof_path)
+                    self.profile["cprofile_path"] = prof_path
+            if memory:
+                current, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                self.profile["tracemalloc"] = {
+                    "current_bytes": current,
+                    "peak_bytes": peak,
+                    "top": [str(s) for s in snapshot.statistics("lineno")[:top]],
+                }
+                if started_tracemalloc:
+                    tracemalloc.stop()
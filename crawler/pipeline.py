@@ -0,0 +1,120 @@
+# crawler/pipeline.py
+"""
+받기(스레드) → 파싱(프로세스) → 저장(호출 스레드 하나) 파이프라인
+- PageStream(extract=False)이 본문 bytes만 받아옴 (네트워크 대기는 스레드)
+- ProcessPoolExecutor가 인코딩 판별 + 표 추출 + 레코드 변환 (GIL 밖, CPU 여러 개)
+- 호출 스레드가 페이지 순서대로 결과를 받아 저장 (쓰기 커넥션은 한 곳에서만)
+- 파싱 대기열이 queue_size만큼 차면 다음 페이지를 꺼내지 않음
+  → PageStream도 새 요청을 안 보냄 (백프레셔, 받은 본문이 메모리에 쌓이지 않음)
+"""
+import os
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+PARSE_PROCESSES = min(4, os.cpu_count() or 1)  # 파싱 프로세스 수
+PARSE_QUEUE = 8  # 파싱 중/대기 페이지 최대 수
+
+
+def parse_page(key, content, charset, keep_past=False):
+    """
+    프로세스 풀 워커: 본문 bytes → IPORecord 목록
+    - 반환: {"row_count", "marks", "records", "parse_ms"} (모두 pickle 가능)
+    """
+    from .decode import resolve_charset
+    from .extract import extract_table
+    from .ipo38 import EXTRACT_ENGINE, RECORD_BUILDERS, SOURCE_ENCODING, URLS, row_mark
+
+    t0 = time.perf_counter()
+    charset = resolve_charset(content, charset, SOURCE_ENCODING)
+    rows = extract_table(content, charset, URLS[key]["summary"], EXTRACT_ENGINE) or []
+    records = RECORD_BUILDERS[key](rows, keep_past=keep_past) if rows else []
+
+    return {
+        "row_count": len(rows),
+        "marks": [row_mark(tr) for tr in rows],
+        "records": records,
+        "parse_ms": (time.perf_counter() - t0) * 1000,
+    }
+
+
+def parse_executor(workers=None):
+    """
+    파싱용 프로세스 풀
+    - spawn: 받기 스레드가 도는 중에 fork하지 않음 (Windows / EXE와도 같은 방식)
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or PARSE_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+class ParsePipeline:
+    """
+    PageStream(extract=False) + 파싱 프로세스 풀을 묶어 페이지 순서대로 돌려줌
+    - for page, fetched, parsed in pipeline: ... (저장은 호출한 쪽)
+      parsed: parse_page 결과, 본문이 지난번과 같아 받지 않았으면 None
+    - stop_checker()가 True면 다음 페이지를 꺼내지 않고 끝냄 (stopped = True)
+    - close(): 대기 중인 파싱/요청 취소
+    """
+
+    def __init__(
+        self,
+        stream,
+        executor,
+        key,
+        keep_past=False,
+        queue_size=None,
+        stop_checker=None,
+    ):
+        self.stream = stream
+        self.executor = executor
+        self.key = key
+        self.keep_past = keep_past
+        self.queue_size = queue_size or PARSE_QUEUE
+        self.stop_checker = stop_checker
+        self.pending = deque()
+        self.exhausted = False
+        self.stopped = False
+        self.wait_ms = 0.0  # 저장 쪽이 파싱 결과를 기다린 시간 (크면 파싱이 병목)
+
+    def _fill(self):
+        """대기열이 찰 때까지 받은 페이지를 파싱에 넘김"""
+        while not self.exhausted and len(self.pending) < self.queue_size:
+            if self.stop_checker and self.stop_checker():
+                self.stopped = True
+                self.exhausted = True
+                return
+            item = self.stream.next()
+            if item is None:
+                self.exhausted = True
+                return
+            page, fetched = item
+            content = fetched.pop("content", None)
+            if content is None:
+                # 본문 없음 (캐시상 지난번과 같음) → parsed=None으로 순서만 유지
+                self.pending.append((page, fetched, None))
+                continue
+            future = self.executor.submit(
+                parse_page, self.key, content, fetched["charset"], self.keep_past
+            )
+            self.pending.append((page, fetched, future))
+
+    def __iter__(self):
+        while True:
+            self._fill()
+            if not self.pending:
+                return
+            page, fetched, future = self.pending.popleft()
+            t0 = time.perf_counter()
+            parsed = future.result() if future is not None else None
+            self.wait_ms += (time.perf_counter() - t0) * 1000
+            yield page, fetched, parsed
+
+    def close(self):
+        self.stream.close()
+        while self.pending:
+            _, _, future = self.pending.popleft()
+            if future is not None:
+                future.cancel()
@@ -0,0 +1,76 @@
+# crawler/runlock.py
+"""
+크롤링 중복 실행 방지 잠금 파일
+- OS 파일 잠금 사용 → 프로세스가 비정상 종료돼도 잠금이 자동으로 풀림
+- GUI와 헤드리스 스케줄러가 같은 DB에 동시에 크롤링하지 않도록 함
+"""
+import os
+
+from .base import resource_path
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+LOCK_PATH = resource_path(os.path.join("db", "crawl.lock"))
+
+
+class RunLock:
+    def __init__(self, path=None):
+        self.path = path or LOCK_PATH
+        self.file = None
+
+    def acquire(self):
+        """잠금 시도 (기다리지 않음), 성공하면 True"""
+        if self.file is not None:
+            return True
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        f = open(self.path, "a+")
+        try:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+
+        # 누가 잡고 있는지 확인용 (잠금 자체와는 무관)
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self.file = f
+        return True
+
+    def release(self):
+        if self.file is None:
+            return
+        try:
+            if os.name == "nt":
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.file.close()
+            self.file = None
+
+    def holder(self):
+        """잠금을 잡은 프로세스 pid (알 수 없으면 None)"""
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise RuntimeError(f"다른 크롤링이 실행 중입니다 (pid {self.holder()})")
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,258 @@
+# crawler/scheduler.py
+"""
+헤드리스 크롤링 (한 번 실행 / 주기 실행)
+- 카테고리별 주기, 청약·수요예측·상장 당일에는 해당 카테고리를 더 자주
+- 주기마다 ±jitter 비율만큼 무작위 편차 (매번 같은 시각에 요청하지 않게)
+- RunLock으로 GUI / 다른 프로세스의 크롤링과 겹치지 않게
+- 실행마다 요약 dict를 emit (CLI에서는 JSON 한 줄)
+"""
+import time
+import random
+import threading
+from datetime import datetime
+
+from .base import get_active_statuses
+from .runlock import RunLock
+from .sources import run_sources
+
+# 카테고리별 기본 주기 (초)
+CATEGORY_INTERVALS = {
+    "bidding": 3 * 3600,
+    "bookbuilding": 3 * 3600,
+    "listing": 12 * 3600,
+}
+
+# 해당 일정이 진행 중인 날의 주기 (초)
+ACTIVE_DAY_INTERVALS = {
+    "bidding": 30 * 60,
+    "bookbuilding": 60 * 60,
+    "listing": 3 * 3600,
+}
+
+# 진행 중 일정 종류(status) → 더 자주 돌릴 카테고리
+STATUS_CATEGORY = {
+    "공모청약": "bidding",
+    "수요예측": "bookbuilding",
+    "상장": "listing",
+}
+
+JITTER = 0.1  # 주기 ±10%
+LOCK_RETRY = 60  # 다른 크롤링이 잠금을 잡고 있으면 이 초 뒤 다시 시도
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def run_once(
+    categories=None,
+    log_func=None,
+    stop_checker=None,
+    incremental=None,
+    cache=None,
+    lock=None,
+    sources=None,
+):
+    """
+    등록된 소스 크롤링 1회 실행 후 요약 dict 반환
+    - status: ok / partial(일부 소스 실패) / stopped / error / locked (다른 크롤링 실행 중)
+    - categories: 카테고리 키 목록 (해당 키가 있는 소스만 그 카테고리 수집)
+    - sources: 소스 이름 목록 (None이면 전체)
+    """
+    t0 = time.perf_counter()
+    summary = {
+        "started_at": _now(),
+        "categories": list(categories or CATEGORY_INTERVALS),
+    }
+
+    lock = lock or RunLock()
+    if not lock.acquire():
+        summary.update(status="locked", holder=lock.holder(), finished_at=_now())
+        return summary
+
+    try:
+        results = run_sources(
+            sources,
+            log_func,
+            stop_checker,
+            categories=categories,
+            incremental=incremental,
+            cache=cache,
+        )
+    except Exception as e:
+        results = []
+        summary["status"] = "error"
+        summary["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        lock.release()
+
+    # 소스별 결과 + 전체 합계
+    keys = {
+        "pages": "pages",
+        "pages_skipped": "pages_skipped",
+        "pages_discarded": "pages_discarded",
+        "inserted": "rows_inserted",
+        "updated": "rows_updated",
+        "unchanged": "rows_unchanged",
+        "http_requests": "http_requests",
+        "http_retries": "http_retries",
+    }
+    totals = dict.fromkeys(keys, 0)
+    summary["sources"] = {}
+    for result in results:
+        counters = result["metrics"].counters
+        for name, counter in keys.items():
+            totals[name] += counters.get(counter, 0)
+        summary["sources"][result["source"]] = {
+            "status": result["status"],
+            "rows": result["rows"],
+            "wall_ms": round(result["metrics"].wall_ms or 0, 1),
+            **({"error": result["error"]} if "error" in result else {}),
+        }
+
+    if "status" not in summary:
+        statuses = {r["status"] for r in results}
+        if stop_checker and stop_checker():
+            summary["status"] = "stopped"
+        elif statuses == {"error"}:
+            summary["status"] = "error"
+        elif "error" in statuses:
+            summary["status"] = "partial"
+        else:
+            summary["status"] = "ok"
+
+    summary.update(
+        {
+            "finished_at": _now(),
+            "wall_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "rows": sum(r["rows"] for r in results),
+            **totals,
+        }
+    )
+    return summary
+
+
+class Scheduler:
+    """
+    카테고리별 다음 실행 시각을 관리하며 run_once 반복
+    - 시작하자마자 모든 카테고리 1회 실행
+    - 같은 시각에 만기된 카테고리는 한 번의 run_once로 묶어서 실행
+    - stop() 호출(또는 시그널) 시 진행 중 크롤링도 stop_checker로 중단
+    """
+
+    def __init__(
+        self,
+        intervals=None,
+        active_intervals=None,
+        jitter=JITTER,
+        categories=None,
+        log_func=None,
+        emit=None,
+        incremental=None,
+        cache=None,
+        lock=None,
+        seed=None,
+    ):
+        self.intervals = dict(CATEGORY_INTERVALS)
+        self.intervals.update(intervals or {})
+        self.active_intervals = dict(ACTIVE_DAY_INTERVALS)
+        self.active_intervals.update(active_intervals or {})
+        self.jitter = jitter
+        self.categories = list(categories or self.intervals)
+        self.log_func = log_func
+        self.emit = emit
+        self.incremental = incremental
+        self.cache = cache
+        self.lock = lock or RunLock()
+        self.rng = random.Random(seed)
+
+        self._stop = threading.Event()
+        self.last_run = {key: None for key in self.categories}
+        self.factor = {key: 1.0 for key in self.categories}
+        self.retry_at = {}
+        self.active = set()
+        self.active_day = None
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def _refresh_active(self):
+        """날짜가 바뀌었거나 크롤링 직후 → 오늘 진행 중인 카테고리 다시 계산"""
+        self.active_day = datetime.now().strftime("%Y-%m-%d")
+        try:
+            statuses = get_active_statuses(self.active_day)
+        except Exception as e:
+            if self.log_func:
+                self.log_func(f"⚠️ 진행 중 일정 조회 실패: {e}")
+            statuses = set()
+        self.active = {STATUS_CATEGORY[s] for s in statuses if s in STATUS_CATEGORY}
+
+    def interval(self, key):
+        """key의 현재 주기 (초, jitter 적용 전)"""
+        if key in self.active and key in self.active_intervals:
+            return self.active_intervals[key]
+        return self.intervals[key]
+
+    def due_at(self, key):
+        """key의 다음 실행 시각 (time.monotonic 기준)"""
+        if key in self.retry_at:
+            return self.retry_at[key]
+        last = self.last_run[key]
+        if last is None:
+            return 0.0
+        return last + self.interval(key) * self.factor[key]
+
+    def tick(self):
+        """만기된 카테고리 실행, 실행했으면 요약 반환"""
+        if datetime.now().strftime("%Y-%m-%d") != self.active_day:
+            self._refresh_active()
+
+        now = time.monotonic()
+        due = [key for key in self.categories if self.due_at(key) <= now]
+        if not due:
+            return None
+
+        summary = run_once(
+            due,
+            log_func=self.log_func,
+            stop_checker=self._stop.is_set,
+            incremental=self.incremental,
+            cache=self.cache,
+            lock=self.lock,
+        )
+
+        finished = time.monotonic()
+        for key in due:
+            if summary["status"] == "locked":
+                self.retry_at[key] = finished + LOCK_RETRY
+                continue
+            self.retry_at.pop(key, None)
+            self.last_run[key] = finished
+            self.factor[key] = 1 + self.rng.uniform(-self.jitter, self.jitter)
+
+        if summary["status"] != "locked":
+            self._refresh_active()
+
+        wall_now = time.time()
+        summary["next_runs"] = {
+            key: datetime.fromtimestamp(wall_now + self.due_at(key) - finished).isoformat(
+                timespec="seconds"
+            )
+            for key in self.categories
+        }
+        if self.emit:
+            self.emit(summary)
+        return summary
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            self.tick()
+            if self._stop.is_set():
+                break
+            wait = min(self.due_at(key) for key in self.categories) - time.monotonic()
+            # 자정(날짜 변경) 확인을 위해 최대 10분마다 깨어남
+            self._stop.wait(min(max(wait, 1.0), 600))
@@ -0,0 +1,255 @@
+# crawler/sources.py
+"""
+크롤링 소스 플러그인
+- Source: 사이트 하나 (URL 생성 / 표 추출 / 레코드 정규화 / source 태그)
+- SOURCE_MODULES에 모듈 경로를 추가하면 load_sources()가 import
+  → 모듈 끝에서 register_source(...)로 등록
+- run_sources(): 등록된 소스를 동시에 실행
+  - 소스마다 별도 페처(요청 속도 제한) + 별도 CrawlMetrics
+    (fetcher_factory를 넘기거나 fetcher.set_fetcher()로 주입했으면 그 페처)
+  - 한 소스가 실패해도 다른 소스는 계속 (결과에 error로 기록)
+"""
+import time
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import insert_many, commit_writes, merge_ipos
+from .decode import header_charset, resolve_charset
+from .fetcher import HttpFetcher, injected_fetcher
+from .metrics import CrawlMetrics
+
+# 소스 플러그인 모듈 (순서 = 기본 실행/표시 순서)
+SOURCE_MODULES = ["crawler.ipo38"]
+
+_sources = {}
+
+
+class Source:
+    """
+    소스 플러그인 기본 클래스
+    - 필수: name, categories, page_url, extract, records
+    - crawl()은 기본 구현(카테고리별 1페이지부터 빈 페이지까지 순서대로)을 쓰거나
+      더 빠른 자체 파이프라인이 있으면 재정의
+    """
+
+    name = None  # 레지스트리 키 (예: "38")
+    label = None  # 로그 표시 이름
+    categories = ()  # 카테고리 키 목록
+    max_pages = {}  # 카테고리별 최대 페이지 (없으면 DEFAULT_MAX_PAGES)
+    headers = None  # 요청 헤더 (None이면 페처 기본값)
+    encoding = "utf-8"  # 헤더/<meta>에 charset이 없을 때
+    rate_limit = 2.0  # 초당 최대 요청 수 (None이면 제한 없음)
+
+    DEFAULT_MAX_PAGES = 3
+
+    def page_url(self, key, page):
+        """key 카테고리 page번째 페이지 URL"""
+        raise NotImplementedError
+
+    def extract(self, key, content, charset):
+        """응답 bytes → 셀 문자열 튜플 목록 (표가 없으면 None)"""
+        raise NotImplementedError
+
+    def records(self, key, rows):
+        """행 → base.IPORecord(또는 dict) 목록 (source 컬럼 = source_tag(key))"""
+        raise NotImplementedError
+
+    def source_tag(self, key):
+        """레코드 source 컬럼에 넣을 값"""
+        return f"{self.name}_{key}"
+
+    def crawl(
+        self,
+        log_func=None,
+        stop_checker=None,
+        fetcher=None,
+        metrics=None,
+        categories=None,
+        incremental=None,
+        cache=None,
+    ):
+        """
+        기본 크롤링: 카테고리마다 페이지를 순서대로 받아 저장, 저장 건수 반환
+        - incremental / cache는 자체 파이프라인이 있는 소스용 (기본 구현은 무시)
+        """
+        metrics = metrics if metrics is not None else CrawlMetrics()
+        total = 0
+
+        for key in self.categories:
+            if categories is not None and key not in categories:
+                continue
+
+            for page in range(1, self.max_pages.get(key, self.DEFAULT_MAX_PAGES) + 1):
+                if stop_checker and stop_checker():
+                    if log_func:
+                        log_func("⛔ 사용자 요청으로 크롤링 중단")
+                    return total
+
+                url = self.page_url(key, page)
+                t0 = time.perf_counter()
+                resp = fetcher.get(url, headers=self.headers)
+                resp.raise_for_status()
+                t1 = time.perf_counter()
+
+                charset = resolve_charset(resp.content, header_charset(resp), self.encoding)
+                rows = self.extract(key, resp.content, charset)
+                t2 = time.perf_counter()
+
+                metrics.inc("pages")
+                metrics.inc("bytes", len(resp.content))
+                metrics.observe("fetch_ms", (t1 - t0) * 1000)
+                metrics.observe("extract_ms", (t2 - t1) * 1000)
+                if not rows:
+                    break
+
+                records = self.records(key, rows)
+                t3 = time.perf_counter()
+                stats = insert_many(records)
+                t4 = time.perf_counter()
+
+                metrics.observe("normalize_ms", (t3 - t2) * 1000)
+                metrics.observe("db_insert_ms", (t4 - t3) * 1000)
+                metrics.inc("rows_seen", len(rows))
+                metrics.inc("rows_saved", len(records))
+                for k, v in stats.items():
+                    metrics.inc(f"rows_{k}", v)
+                total += len(records)
+
+                if log_func:
+                    log_func(f"  ▶ {key} 페이지 {page}: {len(records)}건")
+
+        with metrics.timer("db_commit_ms"):
+            commit_writes()
+        return total
+
+
+# ---------------------- 레지스트리 ----------------------
+
+
+def register_source(source):
+    """소스 등록 (같은 name이면 교체)"""
+    if not source.name:
+        raise ValueError("Source.name이 필요합니다")
+    _sources[source.name] = source
+    return source
+
+
+def load_sources():
+    """SOURCE_MODULES import (각 모듈이 register_source 호출) 후 등록 순서대로 반환"""
+    for module in SOURCE_MODULES:
+        importlib.import_module(module)
+    return list(_sources.values())
+
+
+def get_source(name):
+    load_sources()
+    return _sources[name]
+
+
+# ---------------------- 동시 실행 ----------------------
+
+
+def _source_fetcher(source, fetcher_factory):
+    """소스용 페처와 다 쓴 뒤 닫을지 여부 (주입한 공유 페처는 닫지 않음)"""
+    if fetcher_factory is not None:
+        return fetcher_factory(source), True
+    fetcher = injected_fetcher()
+    if fetcher is not None:
+        return fetcher, False
+    return HttpFetcher(headers=source.headers, rate_limit=source.rate_limit), True
+
+
+def _run_source(source, log_func, stop_checker, prefix, options, fetcher_factory=None):
+    """소스 하나 실행 (예외는 결과 dict로)"""
+    label = source.label or source.name
+    source_log = None
+    if log_func:
+        source_log = (lambda msg: log_func(f"[{label}] {msg}")) if prefix else log_func
+
+    fetcher, own_fetcher = _source_fetcher(source, fetcher_factory)
+    metrics = CrawlMetrics()
+    result = {"source": source.name, "status": "ok", "rows": 0, "metrics": metrics}
+    try:
+        result["rows"] = source.crawl(
+            source_log,
+            stop_checker,
+            fetcher=fetcher,
+            metrics=metrics,
+            **options,
+        )
+        if stop_checker and stop_checker():
+            result["status"] = "stopped"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        if log_func:
+            log_func(f"❌ [{label}] 크롤링 실패: {e}")
+    finally:
+        if own_fetcher:
+            fetcher.close()
+    return result
+
+
+def run_sources(
+    names=None,
+    log_func=None,
+    stop_checker=None,
+    categories=None,
+    incremental=None,
+    cache=None,
+    fetcher_factory=None,
+):
+    """
+    등록된 소스(names가 있으면 그것만)를 동시에 실행
+    - categories / incremental / cache는 각 소스의 crawl()에 그대로 전달
+    - fetcher_factory(source) → 소스용 페처 (없으면 set_fetcher()로 주입한 페처,
+      그것도 없으면 소스별 요청 속도 제한 HttpFetcher)
+    - 소스별 결과 {"source", "status"(ok/stopped/error), "rows", "error", "metrics"} 목록 반환
+    - 모든 소스가 끝난 뒤 회사 단위 합치기(merge_ipos) 한 번 + 남은 쓰기 commit
+    """
+    sources = load_sources()
+    if names is not None:
+        unknown = set(names) - {s.name for s in sources}
+        if unknown:
+            raise ValueError(f"등록되지 않은 소스: {', '.join(sorted(unknown))}")
+        sources = [s for s in sources if s.name in names]
+    if not sources:
+        return []
+
+    options = {"categories": categories, "incremental": incremental, "cache": cache}
+    prefix = len(sources) > 1
+    if len(sources) == 1:
+        results = [
+            _run_source(
+                sources[0], log_func, stop_checker, prefix, options, fetcher_factory
+            )
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = [
+                executor.submit(
+                    _run_source,
+                    source,
+                    log_func,
+                    stop_checker,
+                    prefix,
+                    options,
+                    fetcher_factory,
+                )
+                for source in sources
+            ]
+            results = [future.result() for future in futures]
+
+    # 소스 여러 곳의 일정을 회사 단위로 (크롤링당 한 번)
+    try:
+        stats = merge_ipos()
+        if log_func and stats["events"]:
+            log_func(
+                f"🔗 회사 단위 합치기: 일정 {stats['events']}건 → "
+                f"회사 {stats['companies']}곳 갱신 (신규 {stats['new']})"
+            )
+    except Exception as e:
+        if log_func:
+            log_func(f"⚠️ 회사 단위 합치기 실패: {e}")
+    commit_writes()
+    return results
@@ -1,13 +1,27 @@
 # gui/app.py
 import os
 import csv
+import queue
 import threading
 import ctypes
 import tkinter as tk
 from datetime import datetime
 
-from crawler.base import init_db, get_upcoming_by_broker, get_connection
-from crawler.ipo38 import crawl_38_all
+from crawler.base import (
+    init_db,
+    get_upcoming_ipos,
+    get_upcoming_by_broker,
+    get_all_brokers,
+)
+from crawler.export import export_xlsx
+from crawler.runlock import RunLock
+
+# 로그 큐 비우는 주기(ms) / 한 번에 넣는 최대 줄 수
+LOG_FLUSH_MS = 100
+LOG_BATCH_MAX = 500
+
+# 로그 창에 남겨둘 최대 줄 수 (넘으면 오래된 줄부터 삭제)
+LOG_MAX_LINES = 5000
 
 
 class IPOApp:
@@ -30,10 +44,18 @@ class IPOApp:
         self.stop_flag = False
         self.spinner_running = False
 
-        # DB 초기화
-        init_db()
+        # 🔥 크롤링 스레드 → UI 전달용 큐 (Tk 위젯은 메인 스레드에서만 건드림)
+        self.log_queue = queue.SimpleQueue()
+        self.ui_queue = queue.SimpleQueue()
+
+        # DB 초기화/마이그레이션은 창을 먼저 띄운 뒤 백그라운드에서
+        self.db_error = None
+        self.db_thread = threading.Thread(target=self._init_db_background)
+        self.db_thread.daemon = True
+        self.db_thread.start()
 
         self._build_ui()
+        self.root.after(LOG_FLUSH_MS, self._drain_queues)
 
     # ----------------------- UI 구성 -----------------------
 
@@ -73,13 +95,13 @@ class IPOApp:
         self.btn_stop.grid(row=1, column=0, padx=10, pady=5)
 
         # 엑셀 내보내기
-        btn_export = tk.Button(
+        self.btn_export = tk.Button(
             btn_frame,
             text="엑셀로 내보내기",
             width=20,
             command=self.export_to_excel,
         )
-        btn_export.grid(row=0, column=1, padx=10, pady=5)
+        self.btn_export.grid(row=0, column=1, padx=10, pady=5)
 
         # 오늘 이후 예정 공모주
         btn_upcoming_all = tk.Button(
@@ -120,11 +142,66 @@ class IPOApp:
         self.text.config(yscrollcommand=scroll.set)
         scroll.config(command=self.text.yview)
 
+    # ----------------------- DB 준비 -----------------------
+
+    def _init_db_background(self):
+        try:
+            init_db()
+        except Exception as e:
+            self.db_error = e
+            self.log(f"❌ DB 초기화 실패: {e}")
+
+    def _ensure_db(self) -> bool:
+        """DB 초기화가 끝날 때까지 기다림 (보통 이미 끝나 있음), 실패했으면 False"""
+        self.db_thread.join()
+        return self.db_error is None
+
     # ----------------------- 로그 유틸 -----------------------
 
     def log(self, msg: str):
-        self.text.insert(tk.END, msg + "\n")
-        self.text.see(tk.END)
+        """어느 스레드에서든 호출 가능 → 큐에 넣고 _drain_queues가 모아서 출력"""
+        self.log_queue.put(msg)
+
+    def call_in_ui(self, func, *args, **kwargs):
+        """백그라운드 스레드에서 위젯 변경이 필요할 때 (메인 스레드에서 실행)"""
+        self.ui_queue.put((func, args, kwargs))
+
+    def _drain_queues(self):
+        """root.after 주기마다 큐에 쌓인 로그/UI 작업을 한꺼번에 처리"""
+        try:
+            while True:
+                func, args, kwargs = self.ui_queue.get_nowait()
+                func(*args, **kwargs)
+        except queue.Empty:
+            pass
+
+        lines = []
+        try:
+            while len(lines) < LOG_BATCH_MAX:
+                lines.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if lines:
+            self._append_log(lines)
+
+        # 남은 로그가 있으면 바로 다음 배치, 없으면 주기대로
+        delay = 1 if not self.log_queue.empty() else LOG_FLUSH_MS
+        self.root.after(delay, self._drain_queues)
+
+    def _append_log(self, lines):
+        # 사용자가 위로 스크롤해서 보고 있으면 자동 스크롤 안 함
+        at_bottom = self.text.yview()[1] >= 0.999
+
+        self.text.insert(tk.END, "\n".join(lines) + "\n")
+
+        # 스크롤백 제한: 오래된 줄 삭제
+        line_count = int(self.text.index("end-1c").split(".")[0]) - 1
+        if line_count > LOG_MAX_LINES:
+            self.text.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+
+        if at_bottom:
+            self.text.see(tk.END)
 
     # ----------------------- 크롤링 스레드/컨트롤 -----------------------
 
@@ -147,14 +224,17 @@ class IPOApp:
         try:
             self.collect_data()
             if not self.stop_flag:
-                self.loading_label.config(text="✅ 데이터 수집 완료!")
+                status = "✅ 데이터 수집 완료!"
             else:
-                self.loading_label.config(text="⛔ 크롤링이 중간에 중지되었습니다.")
+                status = "⛔ 크롤링이 중간에 중지되었습니다."
         except Exception as e:
-            self.loading_label.config(text=f"❌ 오류 발생: {e}")
-        finally:
-            self.spinner_running = False
-            self.btn_collect.config(state="normal")
+            status = f"❌ 오류 발생: {e}"
+        self.call_in_ui(self._collect_done, status)
+
+    def _collect_done(self, status: str):
+        self.spinner_running = False
+        self.loading_label.config(text=status)
+        self.btn_collect.config(state="normal")
 
     def animate_spinner(self):
         if not self.spinner_running:
@@ -183,166 +263,82 @@ class IPOApp:
     # ----------------------- 기능 1: 데이터 수집 -----------------------
 
     def collect_data(self):
-        self.log("=== 38커뮤니케이션 크롤링 시작 ===")
+        if not self._ensure_db():
+            return
+
+        # requests / lxml 등 크롤러 의존성은 첫 크롤링 때 로드 (프로그램 시작 속도)
+        from crawler.sources import run_sources
+
+        # 헤드리스 스케줄러(python -m crawler)와 동시에 돌지 않게
+        lock = RunLock()
+        if not lock.acquire():
+            self.log(f"⚠️ 다른 크롤링이 실행 중입니다 (pid {lock.holder()})")
+            return
+
+        self.log("=== 공모주 크롤링 시작 ===")
         try:
-            total = crawl_38_all(
+            # 등록된 소스(38커뮤니케이션 등)를 동시에 실행, 실패한 소스는 로그만 남김
+            results = run_sources(
                 log_func=self.log,
                 stop_checker=lambda: self.stop_flag,
             )
+            total = sum(r["rows"] for r in results)
             if not self.stop_flag:
                 self.log(f"✅ 전체 {total}건 저장 완료")
         except Exception as e:
             self.log(f"❌ 오류 발생: {e}")
+        finally:
+            lock.release()
 
     # ----------------------- 기능 2: 엑셀(xlsx) 내보내기 -----------------------
 
     def export_to_excel(self):
-        """SQLite 전체 데이터를 .xlsx(스타일 가능)로 저장"""
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        from openpyxl.utils import get_column_letter
-
-        conn = get_connection()
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            SELECT stock_name, status, lead_manager, brokers, offer_price,
-                sub_start, sub_end, listing_date, demand_start, demand_end,
-                refund_date, source
-            FROM ipo_schedules
-            ORDER BY id
-            """
-        )
-        rows = cur.fetchall()
-        conn.close()
-
-        if not rows:
-            self.log("내보낼 데이터가 없습니다.")
-            return
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "IPO Data"
-
-        headers = [
-            "종목명",
-            "상태",
-            "대표주관사",
-            "증권사전체",
-            "공모가",
-            "청약시작일",
-            "청약종료일",
-            "상장일",
-            "수요예측시작",
-            "수요예측종료",
-            "환불일",
-            "출처",
-        ]
-
-        ws.append(headers)
-
-        # 헤더 스타일
-        header_fill = PatternFill(
-            start_color="4F81BD", end_color="4F81BD", fill_type="solid"
-        )
-        header_font = Font(bold=True, color="FFFFFF")
-        header_align = Alignment(horizontal="center", vertical="center")
-
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_idx)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_align
-
-        # 데이터 입력
-        for row in rows:
-            clean_source = row[11].split("_", 1)[-1] if row[11] else ""
-
-            ws.append(
-                [
-                    row[0],  # 종목명
-                    row[1],  # 상태
-                    row[2],  # 대표주관사
-                    row[3],  # 증권사전체
-                    row[4],  # 공모가
-                    row[5],  # 청약시작
-                    row[6],  # 청약종료
-                    row[7],  # 상장일
-                    row[8],  # 수요예측시작
-                    row[9],  # 수요예측종료
-                    row[10],  # 환불일
-                    clean_source,  # 🔥 숫자 prefix 제거된 출처
-                ]
-            )
-
-        # 열 너비 조정
-        ws.column_dimensions["A"].width = 30
-        ws.column_dimensions["C"].width = 30
-        ws.column_dimensions["D"].width = 30
-        ws.column_dimensions["E"].width = 13
-
-        for col in ["F", "G", "H", "I", "J", "K", "L"]:
-            ws.column_dimensions[col].width = 15
-
-        # 공모가(E열) 금액 서식
-        for row in ws.iter_rows(min_row=2, min_col=5, max_col=5):
-            cell = row[0]
-            if isinstance(cell.value, (int, float)):
-                cell.number_format = "₩#,##0"
-
-        # 필터
-        ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}1"
-
+        """SQLite 전체 데이터를 .xlsx로 저장 (별도 스레드, 진행률 표시)"""
         # 🔥 바탕화면 경로 생성
         desktop = r"C:\Users\rhkdd\OneDrive\Desktop"
         self.log(f"[DEBUG] 실제 바탕화면 경로: {desktop}")
         path = os.path.join(desktop, "크롤링데이터.xlsx")
+
+        self.btn_export.config(state="disabled")
+        self.loading_label.config(text="📤 엑셀 내보내는 중…")
+
+        th = threading.Thread(target=self._export_wrapper, args=(path,))
+        th.daemon = True
+        th.start()
+
+    def _export_wrapper(self, path: str):
         try:
-            wb.save(path)
-            self.log(f"✅ 저장 성공: {path}")
+            if not self._ensure_db():
+                raise RuntimeError(f"DB 초기화 실패: {self.db_error}")
+            count = export_xlsx(path, progress=self._export_progress, log_func=self.log)
+            if count:
+                self.log(f"✅ 엑셀(xlsx) 파일 저장 완료: {path} ({count}건)")
+                status = "✅ 엑셀 내보내기 완료!"
+            else:
+                self.log("내보낼 데이터가 없습니다.")
+                status = ""
         except Exception as e:
             self.log(f"❌ 저장 실패: {e}")
-        # # Windows 실제 바탕화면 폴더 반환 (OneDrive도 자동 처리)
-        # CSIDL_DESKTOP = 0x0000
-        # SHGFP_TYPE_CURRENT = 0
-        # buf = ctypes.create_unicode_buffer(260)
-        # ctypes.windll.shell32.SHGetFolderPathW(None, CSIDL_DESKTOP, None, SHGFP_TYPE_CURRENT, buf)
-        # desktop = buf.value
+            status = f"❌ 엑셀 저장 실패: {e}"
+        self.call_in_ui(self._export_done, status)
 
-        # path = os.path.join(desktop, "크롤링데이터.xlsx")
+    def _export_progress(self, done: int, total: int):
+        text = f"📤 엑셀 내보내는 중… {done * 100 // total}% ({done}/{total})"
+        self.call_in_ui(self.loading_label.config, text=text)
 
-        self.log(f"✅ 엑셀(xlsx) 파일 저장 완료: {path}")
+    def _export_done(self, status: str):
+        self.loading_label.config(text=status)
+        self.btn_export.config(state="normal")
 
     # ----------------------- 기능 3: 전체 예정 공모주 -----------------------
 
     def show_upcoming_all(self):
         """오늘 기준 이후의 모든 예정 공모주 출력"""
-        conn = get_connection()
-        cur = conn.cursor()
-
+        if not self._ensure_db():
+            return
+        rows = get_upcoming_ipos()
         today = datetime.now().strftime("%Y-%m-%d")
 
-        query = """
-        SELECT stock_name, status, sub_start, sub_end,
-               demand_start, demand_end, listing_date, source
-        FROM ipo_schedules
-        WHERE
-            (sub_start IS NOT NULL AND sub_start >= ?) OR
-            (demand_start IS NOT NULL AND demand_start >= ?) OR
-            (listing_date IS NOT NULL AND listing_date >= ?)
-        ORDER BY
-            CASE
-                WHEN sub_start IS NOT NULL THEN sub_start
-                WHEN demand_start IS NOT NULL THEN demand_start
-                WHEN listing_date IS NOT NULL THEN listing_date
-            END
-        """
-
-        cur.execute(query, (today, today, today))
-        rows = cur.fetchall()
-        conn.close()
-
         self.log("")
         self.log(f"=== 오늘({today}) 기준 예정 공모주 ===")
 
@@ -350,42 +346,30 @@ class IPOApp:
             self.log("예정 공모주가 없습니다.")
             return
 
-        for stock, status, ss, se, ds, de, ld, source in rows:
+        # 회사당 한 줄 (수요예측 / 청약 / 상장 일정을 함께 표시)
+        for stock, market, stage, lead, ds, de, ss, se, ld, sources in rows:
+            parts = []
+            if ds:
+                parts.append(f"수요예측 {ds} ~ {de or ds}")
             if ss:
-                date_str = f"{ss} ~ {se}"
-            elif ds:
-                date_str = f"{ds} ~ {de}"
-            elif ld:
-                date_str = ld
-            else:
-                date_str = "-"
+                parts.append(f"청약 {ss} ~ {se or ss}")
+            if ld:
+                parts.append(f"상장 {ld}")
+            date_str = " / ".join(parts) or "-"
+            name = f"{stock}({market})" if market else stock
 
-            self.log(f"- {stock} [{status}] {date_str} (출처: {source})")
+            self.log(f"- {name} [{stage}] {date_str} (출처: {sources})")
 
     # ----------------------- 기능 4: 증권사별 보기 -----------------------
 
     def _get_all_brokers(self):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT DISTINCT brokers FROM ipo_schedules")
-        rows = cur.fetchall()
-        conn.close()
-
-        broker_set = set()
-        for (b,) in rows:
-            if not b:
-                continue
-            parts = b.split(",")
-            for p in parts:
-                p = p.strip()
-                if not p:
-                    continue
-                if any(key in p for key in ["증권", "투자", "스팩"]):
-                    broker_set.add(p)
-
-        return sorted(broker_set)
+        if not self._ensure_db():
+            return []
+        return get_all_brokers()
 
     def _show_broker_result(self, broker_name: str):
+        if not self._ensure_db():
+            return
         rows = get_upcoming_by_broker(broker_name)
 
         today = datetime.now().strftime("%Y-%m-%d")
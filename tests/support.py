@@ -0,0 +1,27 @@
+# tests/support.py
+"""
+테스트 공통: 임시 폴더의 ipo.db로 바꿔 init_db() → 끝나면 원래 DB_PATH로 되돌림
+(db/ipo.db는 건드리지 않음)
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from crawler import base
+
+
+class TempDBTestCase(unittest.TestCase):
+    """setUp에서 self.tmp 아래 새 DB를 만들고 tearDown에서 지움"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = base.DB_PATH
+        base.close_write_conn()
+        base.DB_PATH = os.path.join(self.tmp, "ipo.db")
+        base.init_db()
+
+    def tearDown(self):
+        base.close_write_conn()
+        base.DB_PATH = self.db_path
+        shutil.rmtree(self.tmp, ignore_errors=True)
@@ -0,0 +1,136 @@
+# tests/test_archive_reparse.py
+"""
+보관소 다시 파싱 (crawler.archive.reparse)
+- 같은 URL의 두 버전(값만 다름)을 순서대로 다시 저장해도 오류 없이 갱신
+- 지난 일정은 과거 데이터 수집으로 받은 페이지만 포함
+- --rebuild 뒤 지운 일정을 가리키는 ipo_changes가 남지 않음
+- --rebuild가 중단/오류로 끝나면 원래 표 그대로 (중간 commit 없음), 끝나면 page_marks 삭제
+
+실행: python -m unittest discover tests
+"""
+import os
+import unittest
+from datetime import date, timedelta
+
+from bench.synth import CHARSET, make_page
+from crawler import archive as ar
+from crawler import base
+from crawler.ipo38 import URLS
+from support import TempDBTestCase
+
+ROWS = 20
+CURRENT_ROWS = 7  # 시작일이 오늘+5일, 하루씩 과거로 → 청약 종료일이 오늘 이후인 행
+
+
+class ReparseTest(TempDBTestCase):
+    def setUp(self):
+        super().setUp()
+        self.archive = ar.PageArchive(os.path.join(self.tmp, "archive.db"))
+        start = date.today() + timedelta(days=5)
+        base_url = URLS["bidding"]["base"]
+        # 평소 크롤링: 같은 페이지를 두 번 (공모가 / 증권사만 다름)
+        for seed in (0, 1):
+            body = make_page("bidding", 1, ROWS, start=start, seed=seed)
+            self.archive.store(base_url + "1", body, CHARSET, "bidding", 1)
+        # 과거 데이터 수집: 지난 일정만 있는 페이지
+        body = make_page("bidding", 2, ROWS, start=start)
+        self.archive.store(base_url + "2", body, CHARSET, "bidding", 2, keep_past=True)
+
+    def tearDown(self):
+        self.archive.close()
+        super().tearDown()
+
+    def reparse(self, **kwargs):
+        return ar.reparse(rebuild=True, workers=1, archive=self.archive, **kwargs)
+
+    def count(self, query):
+        return base.get_write_conn().execute(query).fetchone()[0]
+
+    def test_second_version_updates_rows(self):
+        summary = self.reparse()
+        self.assertEqual(summary["inserted"], CURRENT_ROWS + ROWS)
+        self.assertEqual(summary["updated"], CURRENT_ROWS)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM ipo_merge_queue"), 0)
+
+    def test_keep_past_follows_fetch(self):
+        self.reparse()
+        today = date.today().isoformat()
+        past = self.count(
+            f"SELECT COUNT(*) FROM ipo_schedules WHERE sub_end < '{today}'"
+        )
+        self.assertEqual(past, ROWS)  # 2페이지(과거 수집) 행만
+
+        self.reparse(keep_past=True)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM ipo_schedules"), 2 * ROWS)
+
+    def store_more(self, pages):
+        """3페이지부터 pages개 더 보관 (중간 commit이 여러 번 일어날 만큼)"""
+        base_url = URLS["bidding"]["base"]
+        start = date.today() - timedelta(days=365)
+        for page in range(3, 3 + pages):
+            body = make_page("bidding", page, ROWS, start=start)
+            self.archive.store(base_url + str(page), body, CHARSET, "bidding", page, True)
+
+    def test_stopped_rebuild_keeps_table(self):
+        self.reparse()
+        before = self.count("SELECT COUNT(*) FROM ipo_schedules")
+        self.store_more(6)
+
+        calls = []
+        batch_size, base.WRITE_BATCH_SIZE = base.WRITE_BATCH_SIZE, 5
+        try:
+            summary = self.reparse(stop_checker=lambda: calls.append(1) or len(calls) > 5)
+        finally:
+            base.WRITE_BATCH_SIZE = batch_size
+        self.assertEqual(summary["status"], "stopped")
+        self.assertEqual(summary["inserted"], 0)
+
+        base.close_write_conn()  # 다른 커넥션에서도 원래 표가 보이는지
+        self.assertEqual(self.count("SELECT COUNT(*) FROM ipo_schedules"), before)
+        self.assertGreater(self.count("SELECT COUNT(*) FROM ipos"), 0)
+
+    def test_failed_rebuild_keeps_table(self):
+        self.reparse()
+        before = self.count("SELECT COUNT(*) FROM ipo_schedules")
+        self.store_more(6)
+        # 마지막 페이지를 읽을 수 없는 형식으로 (zstandard 없이 zstd 본문과 같은 상황)
+        self.archive.conn.execute(
+            "UPDATE blobs SET codec = 'broken' WHERE hash = "
+            "(SELECT hash FROM fetches ORDER BY id DESC LIMIT 1)"
+        )
+        self.archive.conn.commit()
+
+        batch_size, base.WRITE_BATCH_SIZE = base.WRITE_BATCH_SIZE, 5
+        try:
+            with self.assertRaises(ValueError):
+                self.reparse()
+        finally:
+            base.WRITE_BATCH_SIZE = batch_size
+
+        base.close_write_conn()
+        self.assertEqual(self.count("SELECT COUNT(*) FROM ipo_schedules"), before)
+
+    def test_rebuild_clears_page_marks(self):
+        base.set_page_marks([(URLS["bidding"]["base"] + "1", "hash", ROWS)])
+        base.commit_writes()
+
+        self.reparse()
+        self.assertEqual(self.count("SELECT COUNT(*) FROM page_marks"), 0)
+
+    def test_rebuild_clears_changes(self):
+        self.reparse()
+        self.assertGreater(self.count("SELECT COUNT(*) FROM ipo_changes"), 0)
+
+        self.reparse()
+        orphans = self.count(
+            """
+            SELECT COUNT(*) FROM ipo_changes c
+            LEFT JOIN ipo_schedules s ON s.id = c.schedule_id
+            WHERE s.id IS NULL
+            """
+        )
+        self.assertEqual(orphans, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
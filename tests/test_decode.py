@@ -0,0 +1,57 @@
+# tests/test_decode.py
+"""
+EUC-KR로 선언했지만 CP949 확장 글자(똠 등)가 섞인 페이지
+- resolve_charset이 EUC-KR 계열 이름을 cp949로 → 두 추출 엔진 모두 표를 그대로 읽음
+
+실행: python -m unittest discover tests
+"""
+import unittest
+
+from crawler.decode import charset_from_content_type, decode_text, resolve_charset
+from crawler.extract import ENGINES, extract_table
+
+SUMMARY = "공모주 청약일정"
+
+
+def page(label):
+    html = (
+        "<html><head>"
+        f'<meta http-equiv="Content-Type" content="text/html; charset={label}">'
+        "</head><body>"
+        f'<table summary="{SUMMARY}">'
+        "<tr><td>종목명</td><td>주간사</td></tr>"
+        '<tr><td colspan="2"></td></tr>'
+        "<tr><td>똠방각하</td><td>A증권</td></tr>"
+        "<tr><td>가나다</td><td>B증권</td></tr>"
+        "</table></body></html>"
+    )
+    return html.encode("cp949")
+
+
+class DecodeTest(unittest.TestCase):
+    def test_euc_kr_labels_map_to_cp949(self):
+        for label in ("euc-kr", "EUC-KR", "ks_c_5601-1987", "korean"):
+            self.assertEqual(resolve_charset(page(label), None, "utf-8"), "cp949")
+            self.assertEqual(resolve_charset(b"", label), "cp949")
+        self.assertEqual(resolve_charset(b"", None, "euc-kr"), "cp949")
+        self.assertEqual(resolve_charset(b"", "utf-8"), "utf-8")
+        self.assertEqual(
+            charset_from_content_type("text/html; charset=windows-949"), "cp949"
+        )
+
+    def test_cp949_only_character_keeps_table(self):
+        for label in ("euc-kr", "ks_c_5601-1987"):
+            content = page(label)
+            charset = resolve_charset(content, None, "euc-kr")
+            for engine in ENGINES:
+                rows = extract_table(content, charset, SUMMARY, engine)
+                self.assertEqual(
+                    rows, [("똠방각하", "A증권"), ("가나다", "B증권")], (label, engine)
+                )
+
+    def test_decode_text(self):
+        self.assertIn("똠방각하", decode_text(page("euc-kr"), "euc-kr"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# tests/test_export_mark.py
+"""
+크롤링 중(쓰기 커넥션에 commit 안 한 INSERT가 있는 동안)에도 증분 내보내기 기준이 저장되는지
+- 조회용 커넥션으로 쓰면 busy_timeout만큼 기다린 뒤 'database is locked'
+- 다른 프로세스가 잠가 기준을 못 남겨도 파일은 저장하고 log_func로 알림
+
+실행: python -m unittest discover tests
+"""
+import os
+import time
+import sqlite3
+import unittest
+
+from crawler import base, export
+from support import TempDBTestCase
+
+
+def _record(name):
+    return base.IPORecord(
+        stock_name=name,
+        status="공모청약",
+        sub_start="2030-01-01",
+        sub_end="2030-01-02",
+        source="공모청약일정",
+    )
+
+
+class ExportMarkTest(TempDBTestCase):
+    def setUp(self):
+        super().setUp()
+        base.insert_many([_record("가나다"), _record("라마바")])
+        base.commit_writes()
+
+    def export(self, name):
+        path = os.path.join(self.tmp, name)
+        return export.export("csv", path, incremental=True, name="csv")
+
+    def mark(self):
+        conn = base.get_connection()
+        try:
+            return export.get_export_mark(conn, "csv")
+        finally:
+            conn.close()
+
+    def test_mark_saved_during_open_write(self):
+        # 크롤링 중간: 쓰기 커넥션에 commit 안 한 행이 있는 채로 내보내기
+        base.insert_many([_record("사아자")])
+        t0 = time.perf_counter()
+        self.assertEqual(self.export("first.csv"), 2)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+
+        first = self.mark()
+        self.assertGreater(first, 0)
+        self.assertEqual(self.export("second.csv"), 1)  # 그동안 commit된 사아자만
+        self.assertGreater(self.mark(), first)
+        self.assertEqual(self.export("third.csv"), 0)
+
+    def test_locked_by_other_process_logs(self):
+        base.close_write_conn()
+        timeout, base.PRAGMAS["busy_timeout"] = base.PRAGMAS["busy_timeout"], 50
+        other = sqlite3.connect(base.DB_PATH)
+        try:
+            other.execute("BEGIN IMMEDIATE")  # 다른 프로세스의 쓰기 트랜잭션
+            logs = []
+            path = os.path.join(self.tmp, "locked.csv")
+            count = export.export("csv", path, incremental=True, log_func=logs.append)
+        finally:
+            other.rollback()
+            other.close()
+            base.close_write_conn()
+            base.PRAGMAS["busy_timeout"] = timeout
+
+        self.assertEqual(count, 2)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(self.mark(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_extract_engines.py
+"""
+두 표 추출 엔진(lxml / bs4)이 같은 행을 돌려주는지 (crawler.extract.compare_engines)
+- 합성 페이지(bench.synth.make_page): 세 카테고리, 여러 페이지/시드, 빈 표
+- 38커뮤니케이션에서 볼 수 있는 경우: 주석, 표 안의 표, script/style, &nbsp;, 행 중간의 <th>
+
+실행: python -m unittest discover tests
+"""
+import unittest
+
+from bench.synth import CHARSET, make_page
+from crawler.decode import resolve_charset
+from crawler.extract import compare_engines, extract_table
+from crawler.ipo38 import URLS
+
+SUMMARY = URLS["bidding"]["summary"]
+
+EDGE_ROWS = [
+    # 주석 (셀 안 / 행 사이)
+    "<tr><td>가<!-- 숨김 -->나</td><td><!--x-->2024.01.02~01.03</td></tr>",
+    "<!-- <tr><td>주석 처리된 행</td></tr> -->",
+    # 셀 안의 표 (바깥 셀 텍스트 + 안쪽 행/셀 모두)
+    "<tr><td><table><tr><td>안쪽</td><td>표</td></tr></table>바깥</td><td>끝</td></tr>",
+    # script / style / template
+    "<tr><td>다<script>var s = '<td>가짜</td>';</script>라</td>"
+    "<td><style>td { color: red }</style>마</td></tr>",
+    "<tr><td>바<template><b>템플릿</b></template></td><td>사</td></tr>",
+    # &nbsp; / 공백 / 엔티티
+    "<tr><td>&nbsp;아&nbsp;</td><td> 1,000원&nbsp;&amp; </td></tr>",
+    # 행 중간의 <th>, 셀 없는 행
+    "<tr><th>제목</th><td>자</td><th>칸</th><td>차</td></tr>",
+    "<tr></tr>",
+    # 닫는 태그 빠진 셀 / 행
+    "<tr><td>카<td>타</tr>",
+    "<tr><td>파</td><td><a href='#'>하<b>굵게</b></a><br>줄</td>",
+]
+
+
+def edge_page(rows):
+    html = (
+        "<html><head>"
+        f'<meta http-equiv="Content-Type" content="text/html; charset={CHARSET}">'
+        "<style>table { width: 100% }</style>"
+        "</head><body>"
+        '<table summary="광고"><tr><td>다른 표</td></tr></table>'
+        f'<table summary="{SUMMARY}">'
+        "<tr><td>종목명</td><td>일정</td></tr>"
+        '<tr><td colspan="2"></td></tr>'
+        + "".join(rows)
+        + "</table>"
+        f'<table summary="{SUMMARY}"><tr><td>두 번째 표</td></tr></table>'
+        "</body></html>"
+    )
+    return html.encode(CHARSET)
+
+
+class CompareEnginesTest(unittest.TestCase):
+    def assertSameRows(self, content, summary):
+        charset = resolve_charset(content, None, CHARSET)
+        self.assertEqual(compare_engines(content, charset, summary), [])
+        return extract_table(content, charset, summary)
+
+    def test_synthetic_pages(self):
+        for key, info in URLS.items():
+            for page in (1, 2, 50):
+                for seed in (0, 1, 2):
+                    with self.subTest(key=key, page=page, seed=seed):
+                        content = make_page(key, page, seed=seed)
+                        rows = self.assertSameRows(content, info["summary"])
+                        self.assertEqual(len(rows), 20)
+
+    def test_empty_table(self):
+        for key, info in URLS.items():
+            with self.subTest(key=key):
+                rows = self.assertSameRows(make_page(key, 9, 0), info["summary"])
+                self.assertEqual(rows, [])
+
+    def test_edge_cases(self):
+        for i, row in enumerate(EDGE_ROWS):
+            with self.subTest(row=i):
+                self.assertSameRows(edge_page([row]), SUMMARY)
+        rows = self.assertSameRows(edge_page(EDGE_ROWS), SUMMARY)
+        self.assertIn(("가나", "2024.01.02~01.03"), rows)
+        self.assertIn(("아", "1,000원\xa0&"), rows)  # 가운데 &nbsp;는 strip되지 않음
+        self.assertIn(("안쪽표바깥", "안쪽", "표", "끝"), rows)  # 안쪽 셀도 같은 행에
+
+    def test_missing_table(self):
+        content = make_page("bidding", 1)
+        self.assertSameRows(content, "없는 표")
+        self.assertIsNone(extract_table(content, CHARSET, "없는 표"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+# tests/test_normalize_parity.py
+"""
+날짜/가격 정규화가 원래 구현(strptime / replace)과 결과가 같은지 (무작위 입력)
+- 예외가 나는 입력(~가 두 개, '²' 같은 isdigit 숫자 등)은 같은 예외 종류인지
+- 열 단위 함수(normalize_dates / parse_ranges / to_floats)도 한 건씩과 같은지
+
+실행: python -m unittest discover tests
+"""
+import random
+import unittest
+from datetime import datetime
+
+from crawler import ipo38
+
+SEED = 20240105
+CASES = 20000
+
+
+# ---------------------- 원래 구현 (기준) ----------------------
+
+
+def ref_normalize_date(text):
+    if not text:
+        return None
+    try:
+        dt = datetime.strptime(text.strip(), "%Y.%m.%d")
+        return dt.strftime("%Y-%m-%d")
+    except Exception:
+        return None
+
+
+def ref_parse_range(text):
+    if not text:
+        return None, None
+    text = text.replace(" ", "")
+
+    if "~" not in text:
+        return ref_normalize_date(text), None
+
+    start_raw, end_raw = text.split("~")
+    year = start_raw.split(".")[0]
+
+    if end_raw.count(".") == 1:
+        end_raw = f"{year}.{end_raw}"
+
+    return ref_normalize_date(start_raw), ref_normalize_date(end_raw)
+
+
+def ref_to_float(v):
+    if not v:
+        return None
+    v = v.replace(",", "").replace("원", "").strip()
+    return float(v) if v.isdigit() else None
+
+
+PAIRS = (
+    (ref_normalize_date, ipo38.normalize_date),
+    (ref_parse_range, ipo38.parse_range),
+    (ref_to_float, ipo38.to_float),
+)
+
+# 숫자처럼 보이지만 ASCII가 아닌 문자, 공백 변형 등
+ODD_CHARS = list("0123456789.~ ,원-/") + ["\xa0", "　", "٣", "²", "１", "\t", "a", "년"]
+
+
+def call(func, value):
+    """(결과) 또는 (예외 종류) → 비교용"""
+    try:
+        return "ok", func(value)
+    except Exception as e:
+        return "error", type(e).__name__
+
+
+def random_text(rng):
+    kind = rng.random()
+    if kind < 0.4:
+        year = rng.choice([rng.randint(1990, 2035), rng.randint(0, 9999)])
+        month, day = rng.randint(0, 13), rng.randint(0, 32)
+        text = ".".join(
+            (
+                rng.choice([f"{year:04d}", str(year)]),
+                rng.choice([str(month), f"{month:02d}", f" {month}"]),
+                rng.choice([str(day), f"{day:02d}", f" {day}", f"{day:03d}"]),
+            )
+        )
+        if rng.random() < 0.5:
+            month2, day2 = rng.randint(0, 13), rng.randint(0, 32)
+            text += rng.choice(["~", " ~ ", "~~"]) + rng.choice(
+                [f"{month2:02d}.{day2:02d}", f"{year}.{month2}.{day2}", str(day2)]
+            )
+        if rng.random() < 0.2:
+            text = rng.choice([" ", "\xa0", "\t"]) + text + rng.choice(["", " ", "\n"])
+        return text
+    if kind < 0.7:
+        n = rng.randint(0, 10**7)
+        text = f"{n:,}" if rng.random() < 0.5 else str(n)
+        return rng.choice(["", " "]) + text + rng.choice(["", "원", " 원", "원 ", "-"])
+    return "".join(rng.choice(ODD_CHARS) for _ in range(rng.randint(0, 14)))
+
+
+class NormalizeParityTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(SEED)
+        self.values = [random_text(rng) for _ in range(CASES)]
+        self.values += [None, "", " ", "0", "2024.02.30", "0999.01.01", "٢٠٢٤.١.٥"]
+
+    def test_scalar_parity(self):
+        for ref, new in PAIRS:
+            for value in self.values:
+                self.assertEqual(
+                    call(new, value), call(ref, value), f"{new.__name__}({value!r})"
+                )
+
+    def test_error_cases(self):
+        # 원래 구현도 예외를 내는 입력 → 같은 예외
+        self.assertEqual(call(ipo38.parse_range, "2024.01.01~01.02~01.03")[0], "error")
+        self.assertEqual(call(ipo38.to_float, "²"), call(ref_to_float, "²"))
+        errors = [v for ref, _ in PAIRS for v in self.values if call(ref, v)[0] == "error"]
+        self.assertTrue(errors)  # 무작위 입력에도 예외 경우가 섞여 있는지
+
+    def test_batch_matches_scalar(self):
+        ranges = [v for v in self.values if call(ref_parse_range, v)[0] == "ok"]
+        self.assertEqual(ipo38.parse_ranges(ranges), [ref_parse_range(v) for v in ranges])
+        self.assertEqual(
+            ipo38.normalize_dates(self.values),
+            [ref_normalize_date(v) for v in self.values],
+        )
+        prices = [v for v in self.values if call(ref_to_float, v)[0] == "ok"]
+        self.assertEqual(ipo38.to_floats(prices), [ref_to_float(v) for v in prices])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# tests/test_page_marks.py
+"""
+'파싱/저장 끝난 본문' 기록(page_marks)이 ipo.db를 따라가는지 (로컬 스텁 서버, 임시 DB)
+- 같은 본문을 다시 받으면 변경 없음으로 건너뜀
+- ipo.db를 새 파일로 바꾸거나 ipo_schedules를 비우면 응답 캐시가 그대로여도 다시 저장
+
+실행: python -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from bench.stub_server import StubServer, point_crawler_at, restore_crawler
+from bench.synth import write_fixtures
+from crawler import base, ipo38
+from crawler.cache import ResponseCache
+from crawler.fetcher import HttpFetcher
+from crawler.metrics import CrawlMetrics
+from support import TempDBTestCase
+
+PAGES = 2
+ROWS = 3 * PAGES * 20  # 카테고리 3개 × 페이지 × 기본 행 수
+
+
+class PageMarksTest(TempDBTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = tempfile.mkdtemp()
+        write_fixtures(cls.fixtures, pages=PAGES)
+        cls.server = StubServer(cls.fixtures)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        shutil.rmtree(cls.fixtures, ignore_errors=True)
+
+    def setUp(self):
+        super().setUp()
+        self.metrics_path, ipo38.METRICS_PATH = ipo38.METRICS_PATH, None
+        self.saved_urls = point_crawler_at(self.server)
+        self.cache = ResponseCache(os.path.join(self.tmp, "http_cache.db"))
+        self.fetcher = HttpFetcher()
+
+    def tearDown(self):
+        self.fetcher.close()
+        self.cache.close()
+        restore_crawler(self.saved_urls)
+        ipo38.METRICS_PATH = self.metrics_path
+        super().tearDown()
+
+    def crawl(self):
+        metrics = CrawlMetrics()
+        ipo38.crawl_38_all(
+            fetcher=self.fetcher,
+            cache=self.cache,
+            archive=False,
+            incremental=False,
+            metrics=metrics,
+        )
+        return metrics.counters
+
+    def test_same_body_skipped(self):
+        first = self.crawl()
+        self.assertEqual(first.get("rows_inserted"), ROWS)
+        self.assertEqual(first.get("pages_unchanged", 0), 0)
+
+        second = self.crawl()
+        self.assertEqual(second.get("pages_unchanged"), 3 * PAGES)
+        self.assertEqual(second.get("rows_inserted", 0), 0)
+
+    def test_new_db_file_reparses(self):
+        self.crawl()
+        # 응답 캐시는 그대로, ipo.db만 새 파일로
+        base.close_write_conn()
+        base.DB_PATH = os.path.join(self.tmp, "new.db")
+        base.init_db()
+
+        counters = self.crawl()
+        self.assertEqual(counters.get("pages_unchanged", 0), 0)
+        self.assertEqual(counters.get("rows_inserted"), ROWS)
+
+    def test_emptied_schedules_reparse(self):
+        self.crawl()
+        conn = base.get_write_conn()
+        conn.execute("DELETE FROM ipo_schedules")
+        base.merge_ipos()
+        base.commit_writes()
+
+        counters = self.crawl()
+        self.assertEqual(counters.get("pages_unchanged", 0), 0)
+        self.assertEqual(counters.get("rows_inserted"), ROWS)
+
+
+if __name__ == "__main__":
+    unittest.main()
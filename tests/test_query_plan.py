@@ -0,0 +1,32 @@
+# tests/test_query_plan.py
+"""
+예정 일정 조회가 인덱스를 쓰는지 (EXPLAIN QUERY PLAN)
+- get_upcoming_ipos: ix_ipos_upcoming 범위 검색 (ipos 전체 SCAN 아님)
+- get_upcoming_by_broker: ix_ipo_brokers_broker
+
+실행: python -m unittest discover tests
+"""
+import unittest
+
+from crawler import base
+from support import TempDBTestCase
+
+
+class QueryPlanTest(TempDBTestCase):
+    def plan(self, query, params):
+        cur = base.get_write_conn().execute(f"EXPLAIN QUERY PLAN {query}", params)
+        return "\n".join(row[3] for row in cur.fetchall())
+
+    def test_upcoming_ipos_uses_index(self):
+        plan = self.plan(base.UPCOMING_IPOS_SQL, ("2030-01-01",))
+        self.assertIn("USING INDEX ix_ipos_upcoming", plan)
+        self.assertNotIn("SCAN ipos", plan)
+
+    def test_upcoming_by_broker_uses_index(self):
+        plan = self.plan(base.UPCOMING_BY_BROKER_SQL, ("KB증권", "2030-01-01"))
+        self.assertIn("ix_ipo_brokers_broker", plan)
+        self.assertNotIn("SCAN", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# tests/test_source_fetcher.py
+"""
+run_sources가 주입한 페처를 쓰는지 (로컬 스텁 서버, 임시 DB)
+- fetcher.set_fetcher()로 주입 → GUI / CLI / 스케줄러 경로도 그 페처로 요청
+- fetcher_factory(source) → 소스마다 만든 페처 사용 후 닫음
+
+실행: python -m unittest discover tests
+"""
+import shutil
+import tempfile
+import unittest
+
+from bench.stub_server import StubServer, point_crawler_at, restore_crawler
+from bench.synth import write_fixtures
+from crawler import fetcher, ipo38
+from crawler.fetcher import HttpFetcher
+from crawler.sources import run_sources
+from support import TempDBTestCase
+
+PAGES = 2
+
+
+class SourceFetcherTest(TempDBTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = tempfile.mkdtemp()
+        write_fixtures(cls.fixtures, pages=PAGES)
+        cls.server = StubServer(cls.fixtures)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        shutil.rmtree(cls.fixtures, ignore_errors=True)
+
+    def setUp(self):
+        super().setUp()
+
+        # db/ 아래에 지표 / 보관소 / 캐시 파일을 만들지 않게
+        self.settings = (ipo38.METRICS_PATH, ipo38.USE_ARCHIVE, ipo38.USE_CACHE)
+        ipo38.METRICS_PATH, ipo38.USE_ARCHIVE, ipo38.USE_CACHE = None, False, False
+        self.saved_urls = point_crawler_at(self.server)
+
+    def tearDown(self):
+        fetcher.set_fetcher(None)
+        restore_crawler(self.saved_urls)
+        ipo38.METRICS_PATH, ipo38.USE_ARCHIVE, ipo38.USE_CACHE = self.settings
+        super().tearDown()
+
+    def test_set_fetcher_reaches_run_sources(self):
+        injected = HttpFetcher()
+        fetcher.set_fetcher(injected)
+        try:
+            results = run_sources(["38"], incremental=False)
+        finally:
+            injected.close()
+
+        self.assertEqual([r["status"] for r in results], ["ok"])
+        # 카테고리마다 PAGES페이지 + 빈 페이지
+        self.assertEqual(injected.snapshot()["requests"], 3 * (PAGES + 1))
+
+    def test_fetcher_factory(self):
+        made = []
+
+        def factory(source):
+            made.append((source.name, HttpFetcher()))
+            return made[-1][1]
+
+        results = run_sources(["38"], incremental=False, fetcher_factory=factory)
+        self.assertEqual([r["status"] for r in results], ["ok"])
+        self.assertEqual([name for name, _ in made], ["38"])
+        self.assertGreater(made[0][1].snapshot()["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/test_upsert_queues.py
+"""
+트리거 대기열(ipo_merge_queue / ipo_broker_sync)에 이미 있는 행을 UPSERT로 다시 갱신해도
+UNIQUE 오류가 나지 않는지
+
+실행: python -m unittest discover tests
+"""
+import unittest
+
+from crawler import base
+from support import TempDBTestCase
+
+
+def _record(name="가나다", **changes):
+    record = base.IPORecord(
+        stock_name=name,
+        status="공모청약",
+        lead_manager="A증권",
+        brokers="A증권",
+        offer_price=1000.0,
+        sub_start="2030-01-01",
+        sub_end="2030-01-02",
+        source="공모청약일정",
+    )
+    return record._replace(**changes)
+
+
+class UpsertQueueTest(TempDBTestCase):
+    def count(self, table):
+        cur = base.get_write_conn().execute(f"SELECT COUNT(*) FROM {table}")
+        return cur.fetchone()[0]
+
+    def test_update_while_queued_for_merge(self):
+        base.insert_many([_record()])
+        self.assertEqual(self.count("ipo_merge_queue"), 1)
+
+        # 합치기 전 (대기열에 남은 채로) 같은 행 갱신
+        stats = base.insert_many([_record(offer_price=10000.0)])
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(self.count("ipo_merge_queue"), 1)
+
+        base.merge_ipos()
+        cur = base.get_write_conn().execute("SELECT offer_price FROM ipos")
+        self.assertEqual(cur.fetchall(), [(10000.0,)])
+        self.assertEqual(self.count("ipo_merge_queue"), 0)
+
+    def test_same_key_twice_in_one_batch(self):
+        # 한 페이지에 같은 자연키가 brokers만 달리 두 번 → 두 번째 행이 갱신
+        stats = base.insert_many([_record(), _record(brokers="A증권,B증권")])
+        self.assertEqual(stats["inserted"], 1)
+        self.assertEqual(stats["updated"], 1)
+
+        cur = base.get_write_conn().execute(
+            """
+            SELECT b.name FROM ipo_brokers ib JOIN brokers b ON b.id = ib.broker_id
+            ORDER BY b.name
+            """
+        )
+        self.assertEqual(cur.fetchall(), [("A증권",), ("B증권",)])
+        self.assertEqual(self.count("ipo_broker_sync"), 0)
+
+    def test_delete_twice_before_merge(self):
+        base.insert_many([_record(), _record(status="상장", listing_date="2030-02-01")])
+        base.merge_ipos()
+
+        # 같은 회사의 일정 두 개 삭제 → ipo_merge_dirty에는 한 번만
+        base.get_write_conn().execute("DELETE FROM ipo_schedules")
+        self.assertEqual(self.count("ipo_merge_dirty"), 1)
+        base.merge_ipos()
+        self.assertEqual(self.count("ipos"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()